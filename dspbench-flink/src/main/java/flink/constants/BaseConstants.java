@@ -14,6 +14,7 @@ public interface BaseConstants {
         String SOURCE_THREADS     = "%s.source.threads";
         String SOURCE_CLASS       = "%s.source.class";
         String SOURCE_GENERATOR   = "%s.source.generator";
+        String SOURCE_RATE        = "%s.source.rate";
         String SOURCE_SOCKET_PORT = "%s.source.socket.port";
         String SOURCE_SOCKET_HOST = "%s.source.socket.host";
         
@@ -0,0 +1,26 @@
+package flink.source;
+
+import flink.constants.BaseConstants;
+
+import org.apache.flink.configuration.Configuration;
+import org.apache.flink.streaming.api.datastream.DataStream;
+import org.apache.flink.streaming.api.environment.StreamExecutionEnvironment;
+
+/**
+ * Reads the source file over and over for runtime_sec seconds, at most at
+ * source.rate tuples per second when that is set.
+ */
+public class InfSource extends BaseSource {
+    private int sourceThreads;
+
+    @Override
+    public void initialize(Configuration config, StreamExecutionEnvironment env, String prefix) {
+        super.initialize(config, env, prefix);
+        sourceThreads = config.getInteger(String.format(BaseConstants.BaseConf.SOURCE_THREADS, prefix), 1);
+    }
+
+    @Override
+    public DataStream<String> createStream() {
+        return env.addSource(new InfSourceFunction(config, prefix)).setParallelism(sourceThreads);
+    }
+}
@@ -13,10 +13,13 @@ public class InfSourceFunction extends RichParallelSourceFunction<String> {
     private volatile boolean isRunning = true;
     private String sourcePath;
     private long runTimeSec;
+    // tuples per second over all instances, 0 for as fast as the file can be read
+    private double rate;
 
     public InfSourceFunction(Configuration config, String prefix) {
         this.sourcePath = config.getString(String.format(BaseConstants.BaseConf.SOURCE_PATH, prefix),"");
         this.runTimeSec = config.getInteger(String.format(BaseConstants.BaseConf.RUNTIME, prefix), 60);
+        this.rate = config.getDouble(String.format(BaseConstants.BaseConf.SOURCE_RATE, prefix), 0);
     }
 
     @Override
@@ -24,6 +27,8 @@ public class InfSourceFunction extends RichParallelSourceFunction<String> {
         try {
 
             long epoch = System.nanoTime();
+            double instanceRate = rate / getRuntimeContext().getNumberOfParallelSubtasks();
+            long emitted = 0;
             Scanner scanner = new Scanner(new File(sourcePath));
 
             while (isRunning && (System.nanoTime() - epoch < runTimeSec * 1e9)) {
@@ -31,8 +36,17 @@ public class InfSourceFunction extends RichParallelSourceFunction<String> {
                 if(!scanner.hasNextLine()){
                     scanner = new Scanner(new File(sourcePath));
                 }
-                if (!StringUtils.isBlank(line))
+                if (!StringUtils.isBlank(line)) {
                     ctx.collect(line);
+                    emitted++;
+                }
+                if (instanceRate > 0) {
+                    // hold back until the next tuple is due, so the offered load stays at the rate
+                    long wait = epoch + (long) (emitted / instanceRate * 1e9) - System.nanoTime();
+                    if (wait > 0) {
+                        Thread.sleep(wait / 1000000, (int) (wait % 1000000));
+                    }
+                }
             }
 
             scanner.close();
@@ -0,0 +1 @@
+# Lets pytest import the orchestrator package from the tests, as the dspbench script does.
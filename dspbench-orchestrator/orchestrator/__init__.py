@@ -0,0 +1 @@
+"""Sweep orchestration for the DSPBench engine drivers."""
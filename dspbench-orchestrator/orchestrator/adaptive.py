@@ -0,0 +1,106 @@
+"""Adaptive repetition counts.
+
+Instead of a fixed number of repetitions per config, runs are handed out
+in rounds: every config still in play gets one more repetition per round.
+A config leaves the sweep once the 95% confidence interval of its mean
+sink throughput is narrower than the target (relative to the mean), or
+when it reached the maximum repetition count. Repetitions whose
+throughput is an outlier among the others, and repetitions that failed
+or left no throughput behind, are not counted and another one is run in
+their place, up to max_reruns per config.
+"""
+from . import journal, stats, sweep
+
+
+class Config:
+    """The repetitions of one (app, parallelism) config seen so far."""
+
+    def __init__(self, app, values, batch=None):
+        self.app = app
+        self.values = values
+        self.batch = batch
+        self.samples = {}
+        self.failed = set()
+        self.last = 0
+
+    def accepted(self):
+        reps = sorted(self.samples)
+        rejected = {reps[i] for i in stats.outliers([self.samples[r] for r in reps])}
+        return {r: self.samples[r] for r in reps if r not in rejected}
+
+    def reruns(self):
+        return len(self.failed) + len(self.samples) - len(self.accepted())
+
+
+class Plan:
+    def __init__(self, spec, apps=None, target=0.05, min_reps=3, max_reps=10, max_reruns=3):
+        self.spec = spec
+        self.target = target
+        self.min_reps = max(min_reps, 2)
+        self.max_reps = max(max_reps, self.min_reps)
+        self.max_reruns = max_reruns
+        self.configs = {}
+        for app in spec['apps']:
+            if apps is not None and app['name'] not in apps:
+                continue
+            for values, batch in sweep.points(app):
+                self.configs[(app['name'], sweep.conf_label(values) + sweep.batch_label(batch))] = \
+                    Config(app, values, batch)
+
+    def config(self, run):
+        return self.configs.get((run.app, run.conf))
+
+    def add(self, run, throughput):
+        """Account for a finished repetition; throughput None means it failed."""
+        config = self.config(run)
+        if config is None:
+            return
+        config.last = max(config.last, run.repetition)
+        if throughput is None:
+            config.failed.add(run.repetition)
+        else:
+            config.failed.discard(run.repetition)
+            config.samples[run.repetition] = throughput
+
+    def seed(self, sweep_journal):
+        """Pick up the repetitions an earlier, interrupted sweep already ran."""
+        for record in sweep_journal.records():
+            if record.get('engine') != self.spec['engine']:
+                continue
+            config = self.configs.get((record['app'], record['conf']))
+            if config is None:
+                continue
+            config.last = max(config.last, record['repetition'])
+            if record['state'] == journal.COMPLETED and record.get('throughput') is not None:
+                config.samples[record['repetition']] = record['throughput']
+            elif record['state'] != journal.STARTED:
+                config.failed.add(record['repetition'])
+
+    def done(self, config):
+        accepted = list(config.accepted().values())
+        if len(accepted) >= self.max_reps or config.reruns() >= self.max_reruns:
+            return True
+        return len(accepted) >= self.min_reps and stats.relative_ci(accepted) <= self.target
+
+    def next_round(self):
+        """One more repetition of every config that is not done yet."""
+        runs = []
+        for config in self.configs.values():
+            if not self.done(config):
+                config.last += 1
+                runs.append(sweep.make_run(self.spec, config.app, config.values, config.last, config.batch))
+        return runs
+
+    def summary(self):
+        for (app, conf), config in self.configs.items():
+            accepted = list(config.accepted().values())
+            rejected = sorted(set(config.samples) - set(config.accepted()))
+            yield {'app': app, 'conf': conf, 'repetitions': len(accepted),
+                   'mean': stats.mean(accepted), 'relative_ci': stats.relative_ci(accepted),
+                   'outliers': rejected, 'failed': sorted(config.failed)}
+
+    def report(self):
+        for row in self.summary():
+            yield '%s %s: %d reps, %.1f tuples/s +- %.1f%%, outliers %s, failed %s' % (
+                row['app'], row['conf'], row['repetitions'], row['mean'], 100 * row['relative_ci'],
+                row['outliers'], row['failed'])
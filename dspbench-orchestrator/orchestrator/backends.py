@@ -0,0 +1,456 @@
+"""Engine backends of the dspbench command.
+
+A backend knows where an engine's module lives in the repository, how
+its applications and stages are named, how to launch a run and how to
+stop it. Stages are addressed by logical names so one sweep spec can
+drive every engine: the *.threads keys of an app are read from its
+.properties file and from the engine's own sweep.json, the app prefix
+and ".threads" are stripped and the engine's aliases applied, so Storm's
+wc.spout.threads and Flink's wc.parser.threads are both "parser".
+"""
+import contextlib
+import json
+import os
+import subprocess
+
+from . import (flink, gclog, metrics, profiling, properties, resources, runner, spark, storm, sweep, trace,
+               watchdog)
+from .rest import UNAVAILABLE
+
+REPO_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+BACKENDS = {}
+
+
+def register(cls):
+    BACKENDS[cls.name] = cls
+    return cls
+
+
+def get(name, **options):
+    if name not in BACKENDS:
+        raise sweep.SpecError('unknown engine "%s" (known: %s)' % (name, ', '.join(sorted(BACKENDS))))
+    return BACKENDS[name](**options)
+
+
+class Backend:
+    name = None
+    # engine stage names that mean the same as a logical one
+    stage_aliases = {}
+    # logical app names spelled differently by this engine
+    app_aliases = {}
+    # config keys every run of this engine needs
+    defaults = {}
+    # {logical batch setting: key after the app prefix} of micro-batch engines
+    batch_keys = {}
+    # what a failed setup or run control raises, besides a failed job
+    errors = ()
+    # whether a run can be cut short at its runtime, which the parallelism search relies on
+    bounded = True
+    # whether isolated() can pack runs onto private instances for a parallel sweep
+    supports_parallel = False
+
+    def __init__(self, repo_dir=REPO_DIR, grace=watchdog.GRACE, profile=None, gc_dir=None, **options):
+        self.home = os.path.join(repo_dir, 'dspbench-' + self.name)
+        self.grace = grace
+        # profiling.Profiler arguments besides the engine and directory, None to not profile
+        self.profile = profile
+        # where the workers write their GC logs, None to not log
+        self.gc_dir = gc_dir
+        self.options = options
+        self.tracer = trace.NULL
+        # the exporter.Exporter serving the sweep, if any
+        self.exporter = None
+        self.errors = self.errors + (watchdog.JobFailed,)
+
+    @property
+    def config_dir(self):
+        return os.path.join(self.home, 'src', 'main', 'resources', 'config')
+
+    @property
+    def jar(self):
+        return os.path.join(self.home, 'build', 'libs', 'dspbench-%s-uber-1.0.jar' % self.name)
+
+    @property
+    def serializer(self):
+        return os.path.join(self.home, 'bin', 'lib', 'properties-serializer.jar')
+
+    def app_name(self, app):
+        return self.app_aliases.get(app, app)
+
+    def config_file(self, app):
+        return self.app_name(app) + '.properties'
+
+    def logical(self, key):
+        """wc.click.spout.threads -> click.parser for an engine aliasing spout."""
+        parts = key[:-len('.threads')].split('.')[1:]
+        return '.'.join(self.stage_aliases.get(p, p) for p in parts)
+
+    def stage_keys(self, app):
+        """{logical stage: *.threads key} of an app on this engine."""
+        keys = []
+        path = os.path.join(self.config_dir, self.config_file(app))
+        if os.path.exists(path):
+            keys.extend(k for k in properties.load(path) if k.endswith('.threads'))
+        spec_path = os.path.join(self.home, 'sweep.json')
+        if os.path.exists(spec_path):
+            with open(spec_path) as f:
+                for entry in json.load(f)['apps']:
+                    if entry['name'] == self.app_name(app):
+                        keys.extend(entry['stages'])
+        return {self.logical(k): k for k in keys}
+
+    def resolve(self, app, stages, keys=None):
+        """The engine keys of the given logical stages, in order."""
+        known = self.stage_keys(app)
+        known.update(keys or {})
+        missing = [s for s in stages if s not in known]
+        if missing:
+            raise sweep.SpecError('%s has no stage %s in %s (it has: %s)'
+                                  % (self.name, ', '.join(missing), app, ', '.join(sorted(known))))
+        return [known[s] for s in stages]
+
+    def batches(self, stages, points):
+        """The logical batch points of an app as this engine's keys; none if it has no micro-batches."""
+        if not self.batch_keys or not stages:
+            return []
+        prefix = stages[0].split('.')[0]
+        return [{'%s.%s' % (prefix, self.batch_keys[k]): v for k, v in point.items() if k in self.batch_keys}
+                for point in points]
+
+    def setup(self):
+        pass
+
+    def before_run(self, run):
+        pass
+
+    def teardown(self):
+        pass
+
+    def command(self, run, snap):
+        raise NotImplementedError
+
+    def supervise(self, run, snap):
+        """Keyword arguments of runner.run besides the command and files."""
+        return {}
+
+    def sampler(self, run, jvms=None, scope=None):
+        """The resources.Sampler of the host and this engine's JVMs (or jvms) during a run."""
+        return resources.Sampler(run.metrics_output, jvms or resources.JVMS.get(self.name), scope=scope)
+
+    def gc_properties(self):
+        """Run properties that turn on the GC logs of this engine's workers."""
+        return gclog.properties(self.name, self.gc_dir) if self.gc_dir else {}
+
+    def collect_gc(self, run, record, gc_dir=None):
+        gc_dir = gc_dir or self.gc_dir
+        if gc_dir:
+            gclog.collect(gc_dir, record, run.metrics_output)
+
+    def isolated_gc_dir(self, snap):
+        """Where the JVMs of an isolated run log their collections, apart from the runs beside it; None to not log."""
+        if not self.gc_dir:
+            return None
+        path = os.path.join(snap.path, 'gc')
+        gclog.prepare(path)
+        return path
+
+    def profiler(self, snap, jvms=None, scope=None):
+        """The profiling.Profiler of this engine's workers (or jvms) during a run, or None."""
+        if not self.profile:
+            return None
+        return profiling.Profiler(self.name, snap.path, jvms=jvms, scope=scope, **self.profile)
+
+    def live(self, run):
+        """The runner.run hook that lets the exporter follow a run, or None."""
+        return self.exporter.follow(run) if self.exporter is not None else None
+
+    def isolated(self, run, snap, slot):
+        """A context manager for a private instance of the engine pinned to the slot's CPUs.
+
+        It yields the keyword arguments of launch() for the run on that
+        instance: its command and how to supervise it.
+        """
+        raise NotImplementedError('%s runs cannot be packed onto CPU slots (supports_parallel is False)' % self.name)
+
+    def launch(self, run, snap, cmd, timeout=None, limit=None, gc_dir=None, jvms=None, scope=None, **supervise):
+        """Run cmd as the launcher of the run under runner.run and return its exit code once it is over.
+
+        A launcher still running after timeout seconds reached the end of
+        the run's runtime, which is a normal end. One still running after
+        limit seconds should have ended by itself by then; it hung and the
+        run fails. jvms and scope pick the JVMs to sample and profile (see
+        resources.Sampler) and gc_dir is where they log their collections,
+        the backend's own by default. supervise holds the other runner.run
+        arguments.
+        """
+        record = runner.run(cmd, snap.file('job.log'), snap.file('record.json'), metrics_output=run.metrics_output,
+                            timeout=timeout if timeout is not None else limit, grace=self.grace,
+                            sampler=self.sampler(run, jvms, scope), profiler=self.profiler(snap, jvms, scope),
+                            live=self.live(run), **supervise)
+        self.tracer.launch(run, record)
+        self.collect_gc(run, record, gc_dir)
+        if record['failure']:
+            raise watchdog.JobFailed(record['failure'])
+        if record.get('timed_out') and timeout is None:
+            raise watchdog.JobFailed({'cause': 'hung', 'detail': 'launcher still running after %d s' % limit})
+        # a run cut short at its runtime, such as a rung of the parallelism search, ended normally
+        return 0 if record.get('timed_out') else record['exit_code']
+
+    def run(self, run, snap):
+        """Launch the run and return its exit code once it is over."""
+        return self.launch(run, snap, self.command(run, snap), timeout=run.runtime, **self.supervise(run, snap))
+
+    def throughput(self, run):
+        return metrics.sink_throughput(run.metrics_output)
+
+    def measured(self, run):
+        """Seconds of the run its throughput covers."""
+        return metrics.sink_measured(run.metrics_output)
+
+    def version(self):
+        """The engine version results are cached under; None when it ships in the jar."""
+        return None
+
+    def config_str(self, snap):
+        return properties.serialize(snap.config)
+
+
+@register
+class FlinkBackend(Backend):
+    name = 'flink'
+    errors = (flink.ClusterError,)
+    supports_parallel = True
+
+    def __init__(self, repo_dir=REPO_DIR, flink_home=None, flink_url=flink.DEFAULT_URL, reuse_cluster=False,
+                 **options):
+        super().__init__(repo_dir, **options)
+        self.flink_home = flink_home or os.environ.get('FLINK_HOME') or os.path.expanduser('~/maven/flink-1.18.1')
+        self.client = flink.RestClient(flink_url)
+        # keep the cluster between runs as long as flink-conf.yaml stays the same
+        self.reuse_cluster = reuse_cluster
+        self.settings = None
+
+    def _env(self, gc_dir):
+        # start-cluster.sh passes it on to the TaskManagers
+        return gclog.flink_env(self.flink_home, gc_dir) if gc_dir else {}
+
+    def _cancel(self, client):
+        def cancel(record):
+            if 'job_id' in record['ids']:
+                try:
+                    client.cancel(record['ids']['job_id'])
+                except UNAVAILABLE as e:
+                    print("cannot cancel job %s: %s" % (record['ids']['job_id'], e))
+        return cancel
+
+    def _restart(self):
+        print("restart cluster")
+        with self.tracer.span('cluster-stop'):
+            subprocess.run([os.path.join(self.flink_home, 'bin', 'stop-cluster.sh')])
+            flink.wait_until_stopped(self.client, timeout=60)
+        with self.tracer.span('cluster-start'):
+            subprocess.run([os.path.join(self.flink_home, 'bin', 'start-cluster.sh')], check=True,
+                           env=dict(os.environ, **self._env(self.gc_dir)))
+        with self.tracer.span('ready-wait'):
+            flink.wait_until_ready(self.client, flink.expected_slots(self.flink_home), timeout=120)
+
+    def before_run(self, run):
+        # a running cluster only has to be restarted when slots or JVM options changed
+        settings = flink.cluster_settings(self.flink_home)
+        if self.reuse_cluster and settings == self.settings:
+            print("reuse cluster")
+            try:
+                with self.tracer.span('ready-wait'):
+                    flink.release(self.client, flink.expected_slots(self.flink_home), timeout=60)
+                return
+            except flink.ClusterError as e:
+                print("cannot reuse cluster: " + str(e))
+        self._restart()
+        self.settings = settings
+
+    def teardown(self):
+        with self.tracer.span('teardown'):
+            subprocess.run([os.path.join(self.flink_home, 'bin', 'stop-cluster.sh')])
+        self.settings = None
+
+    @contextlib.contextmanager
+    def isolated(self, run, snap, slot):
+        # one private cluster per run, whose JVMs are the ones with its conf dir on their command line
+        gc_dir = self.isolated_gc_dir(snap)
+        cluster = flink.LocalCluster(self.flink_home, snap.path, slot, max(len(slot.cpus), max(run.values)),
+                                     env=self._env(gc_dir))
+        with self.tracer.span('cluster-start', run):
+            cluster.start()
+        try:
+            yield {'cmd': cluster.command(self.jar, run.app, self.config_str(snap)), 'env': cluster.env(),
+                   'timeout': run.runtime, 'gc_dir': gc_dir, 'scope': cluster.conf_dir,
+                   'patterns': {'job_id': flink.JOB_ID}, 'on_cancel': self._cancel(cluster.client),
+                   'probe': lambda record: flink.probe(cluster.client, record)}
+        finally:
+            with self.tracer.span('teardown', run):
+                cluster.stop()
+
+    def version(self):
+        return flink.version(self.flink_home)
+
+    def command(self, run, snap):
+        return [os.path.join(self.flink_home, 'bin', 'flink'), 'run', '-c', 'flink.FlinkRunner', self.jar,
+                '--app', run.app, '--config', self.config_str(snap)]
+
+    def supervise(self, run, snap):
+        return {'patterns': {'job_id': flink.JOB_ID}, 'on_cancel': self._cancel(self.client),
+                'probe': lambda record: flink.probe(self.client, record)}
+
+
+@register
+class SparkBackend(Backend):
+    name = 'spark'
+    stage_aliases = {'pair_counter': 'counter'}
+    batch_keys = {'interval': 'batch.interval', 'size': 'batch.size'}
+    # the YARN application killed at a runtime takes the metrics its sinks keep in memory with it
+    bounded = False
+    supports_parallel = True
+
+    def __init__(self, repo_dir=REPO_DIR, yarn_url=spark.DEFAULT_RM, **options):
+        super().__init__(repo_dir, **options)
+        self.yarn = spark.YarnClient(yarn_url)
+
+    def command(self, run, snap):
+        return [os.path.join(self.home, 'bin', 'dspbench-spark-cluster.sh'), self.jar, run.app, snap.config]
+
+    def supervise(self, run, snap):
+        def cancel(record):
+            if 'app_id' in record['ids']:
+                spark.kill(record['ids']['app_id'])
+        return {'patterns': {'app_id': spark.APP_ID}, 'on_cancel': cancel,
+                'probe': lambda record: spark.probe(self.yarn, record)}
+
+    @contextlib.contextmanager
+    def isolated(self, run, snap, slot):
+        # a local[N] driver, whose executors run in its JVM; the run's metrics output in its config tells it
+        # apart from the drivers beside it
+        gc_dir = self.isolated_gc_dir(snap)
+        ui = spark.local_ui(slot)
+        yield {'cmd': spark.local_command(self.jar, run.app, self.config_str(snap), slot,
+                                          gclog.option(gc_dir) if gc_dir else None),
+               'timeout': run.runtime, 'gc_dir': gc_dir, 'jvms': {'driver': resources.JVMS['spark']['driver']},
+               'scope': run.metrics_output, 'probe': lambda record: spark.local_probe(ui, record)}
+
+    def version(self):
+        return spark.version()
+
+
+@register
+class StormBackend(Backend):
+    name = 'storm'
+    stage_aliases = {'spout': 'parser'}
+    app_aliases = {'adanalytics': 'adsanalytics'}
+    errors = (storm.TopologyError,)
+    supports_parallel = True
+
+    def __init__(self, repo_dir=REPO_DIR, storm_ui=storm.DEFAULT_URL, steady_window=60, max_duration=300,
+                 **options):
+        super().__init__(repo_dir, **options)
+        self.ui = storm.UiClient(storm_ui)
+        self.steady_window = steady_window
+        self.max_duration = max_duration
+
+    def command(self, run, snap):
+        # named after the run, so its topology is told apart from any other on the cluster by name alone
+        return ['storm', 'jar', self.jar, storm.RUNNER_CLASS, '--app', run.app, '--topology-name', snap.run_id,
+                '--config-str', self.config_str(snap), '--mode', 'remote']
+
+    def supervise(self, run, snap):
+        def watch(record):
+            topology = storm.find_submitted(self.ui, snap.run_id)
+            record['topology'] = topology
+            reason, samples = storm.watch(self.ui, topology['id'], self.steady_window,
+                                          run.runtime or self.max_duration,
+                                          stop=lambda: record['state'] != 'running')
+            record['counters'] = samples
+            print("run ended: " + reason)
+            if reason != 'stopped':
+                storm.kill(self.ui, topology)
+            return reason
+
+        def cancel(record):
+            if 'topology' in record:
+                try:
+                    storm.kill(self.ui, record['topology'], timeout=30)
+                except storm.TopologyError as e:
+                    print("cannot kill topology: " + str(e))
+        return {'after': watch, 'on_cancel': cancel,
+                'probe': lambda record: storm.probe(self.ui, record)}
+
+    @contextlib.contextmanager
+    def isolated(self, run, snap, slot):
+        # a LocalCluster in its own JVM, which stops the topology at the runtime and exits; there is no UI to
+        # probe, so a JVM still there a grace period later hung
+        gc_dir = self.isolated_gc_dir(snap)
+        runtime = run.runtime or self.max_duration
+        yield {'cmd': storm.local_command(self.jar, run.app, self.config_str(snap), slot, runtime,
+                                          [gclog.option(gc_dir)] if gc_dir else []),
+               'limit': runtime + self.grace, 'gc_dir': gc_dir, 'scope': run.metrics_output}
+
+    def version(self):
+        return storm.version()
+
+
+@register
+class ThreadsBackend(Backend):
+    """The local multi-threaded engine, which runs until it is stopped."""
+
+    name = 'threads'
+    stage_aliases = {'source': 'parser'}
+    RUNNER_CLASS = 'org.dspbench.topology.impl.LocalTaskRunner'
+    JVM_OPTS = ['-server', '-XX:+UseG1GC', '-Xms4g', '-Xmx6g', '-XX:+UseCompressedOops']
+    # logical app -> (config file, task class, topology name), as in the Makefile
+    TASKS = {
+        'adanalytics': ('ads-analytics', 'adsanalytics.AdsAnalyticsTask', 'AdsAnalytics'),
+        'clickanalytics': ('click-analytics', 'clickanalytics.ClickAnalyticsTask', 'ClickAnalytics'),
+        'frauddetection': ('fraud-detection', 'frauddetection.FraudDetectionTask', 'FraudDetection'),
+        'logprocessing': ('log-processing', 'logprocessing.LogProcessingTask', 'LogProcessing'),
+        'machineoutlier': ('machine-outlier', 'machineoutlier.MachineOutlierTask', 'MachineOutlier'),
+        'reinforcementlearner': ('reinforcement-learner', 'reinforcementlearner.ReinforcementLearnerTask',
+                                 'ReinforcementLearner'),
+        'sentimentanalysis': ('sentiment-analysis', 'sentimentanalysis.SentimentAnalysisTask',
+                              'SentimentAnalysis'),
+        'spamfilter': ('spam-filter', 'spamfilter.SpamFilterTask', 'SpamFilter'),
+        'spikedetection': ('spike-detection', 'spikedetection.SpikeDetectionTask', 'SpikeDetection'),
+        'trafficmonitoring': ('traffic-monitoring', 'trafficmonitoring.TrafficMonitoringTask',
+                              'TrafficMonitoring'),
+        'trendingtopics': ('trending-topics', 'trendingtopics.TrendingTopicsTask', 'TrendingTopics'),
+        'wordcount': ('word-count', 'wordcount.WordCountTask', 'WordCount'),
+        'smartgrid': ('smart-grid', 'smartgrid.SmartGridTask', 'SmartGrid'),
+        'voipstream': ('voip-stream', 'voipstream.VoIPSTREAMTask', 'VoIPSTREAM'),
+    }
+    defaults = {'metrics.enabled': 'true', 'metrics.reporter': 'csv',
+                'metrics.enabled.metrics': 'throughput,tuple-counter'}
+
+    def __init__(self, repo_dir=REPO_DIR, max_duration=300, **options):
+        super().__init__(repo_dir, **options)
+        self.max_duration = max_duration
+
+    def config_file(self, app):
+        if app not in self.TASKS:
+            raise sweep.SpecError('threads has no application %s' % app)
+        return self.TASKS[app][0] + '.properties'
+
+    def command(self, run, snap):
+        _, task, topology = self.TASKS[run.app]
+        gc = [gclog.option(self.gc_dir)] if self.gc_dir else []
+        return (['java'] + self.JVM_OPTS + gc +
+                ['-cp', self.jar, self.RUNNER_CLASS, '-task', 'org.dspbench.applications.' + task,
+                 '-name', topology, '-config', self.config_str(snap)])
+
+    def run(self, run, snap):
+        # the engine does not stop on its own; reaching the runtime is the normal end
+        return self.launch(run, snap, self.command(run, snap), timeout=run.runtime or self.max_duration,
+                           probe=lambda record: (metrics.counter_total(run.metrics_output), None))
+
+    def throughput(self, run):
+        return metrics.counter_throughput(run.metrics_output)
+
+    def measured(self, run):
+        return metrics.counter_measured(run.metrics_output)
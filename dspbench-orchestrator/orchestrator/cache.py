@@ -0,0 +1,124 @@
+"""Content-addressed cache of run results.
+
+A run's key is the SHA-256 of everything that decides what it measures:
+the engine and its version, the uber-jar's digest, the fully resolved
+properties (minus metrics.output, which only says where results go), the
+digest of every input file those properties point to, and the repetition.
+A result stored under a key is reused by any later sweep that produces
+the same key, so re-running a sweep after changing one app only runs
+that app again.
+
+Input paths are resolved like the datasets module does, relative to the
+engine's module and walking directories. A run whose *.source.path or
+*.spout.path points at nothing on this host is neither looked up nor
+stored, since its key would not change with the data it reads.
+
+Entries live in <root>/<key[:2]>/<key>.json. File digests are remembered
+in <root>/digests.json by path, size and mtime so multi-GB jars and
+datasets are hashed once, not once per run.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+from . import datasets, properties, sweep
+
+# keys that do not change what a run measures
+IGNORED = ('metrics.output',)
+
+
+def file_digest(path, chunk=1 << 20):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, root, jar, engine_version=None, base_dir=None):
+        self.root = root
+        self.jar = jar
+        self.engine_version = engine_version
+        # what relative input paths are relative to, the engine's module
+        self.base_dir = base_dir or os.getcwd()
+        self.lock = threading.Lock()
+        self.digests_path = os.path.join(root, 'digests.json')
+        self.digests = {}
+        if os.path.exists(self.digests_path):
+            with open(self.digests_path) as f:
+                self.digests = json.load(f)
+
+    def digest(self, path):
+        """Digest of a file, rehashed only when its size or mtime changed."""
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        with self.lock:
+            known = self.digests.get(path)
+            if known and known['size'] == st.st_size and known['mtime_ns'] == st.st_mtime_ns:
+                return known['sha256']
+        value = file_digest(path)
+        with self.lock:
+            self.digests[path] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': value}
+            os.makedirs(self.root, exist_ok=True)
+            properties.atomic_write(self.digests_path, json.dumps(self.digests, indent=1, sort_keys=True) + '\n')
+        return value
+
+    def inputs(self, run):
+        """Everything the key of a run is computed from, or None if an input path cannot be resolved."""
+        if datasets.unresolved(run, self.base_dir):
+            return None
+        props = {k: v for k, v in sweep.resolved(run).items() if k not in IGNORED}
+        data = {}
+        for value in props.values():
+            if value.startswith('/') and os.path.isfile(value):
+                data[value] = self.digest(value)
+        for path in datasets.input_files(run, self.base_dir):
+            data[path] = self.digest(path)
+        return {
+            'engine': run.engine,
+            'engine_version': self.engine_version,
+            'app': run.app,
+            'jar': self.digest(self.jar) if os.path.exists(self.jar) else None,
+            'properties': props,
+            'data': data,
+            'repetition': run.repetition,
+        }
+
+    def key(self, run):
+        """(key, inputs) of a run, (None, None) for runs that cannot be cached."""
+        inputs = self.inputs(run)
+        if inputs is None:
+            return None, None
+        blob = json.dumps(inputs, sort_keys=True, separators=(',', ':')).encode()
+        return hashlib.sha256(blob).hexdigest(), inputs
+
+    def path(self, key):
+        return os.path.join(self.root, key[:2], key + '.json')
+
+    def lookup(self, run):
+        """The stored result of an identical run, or None."""
+        key, _ = self.key(run)
+        if key is None:
+            return None
+        try:
+            with open(self.path(key)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def store(self, run, record):
+        """Remember the journal record of a completed run under its key; None if it cannot be cached."""
+        key, inputs = self.key(run)
+        if key is None:
+            print("not caching %s %s/%d: %s not found" % (run.app, run.conf, run.repetition,
+                                                          ', '.join(datasets.unresolved(run, self.base_dir))))
+            return None
+        entry = {'key': key, 'run_id': record.get('run_id'), 'throughput': record.get('throughput'),
+                 'metrics_output': run.metrics_output, 'time': time.time(), 'inputs': inputs}
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        properties.atomic_write(path, json.dumps(entry, indent=2) + '\n')
+        return entry
@@ -0,0 +1,424 @@
+"""The dspbench command: one benchmark spec, every engine.
+
+A benchmark spec looks like a sweep.json but names stages logically and
+lists the engines to run it on::
+
+    {
+      "engines": ["flink", "spark", "storm", "threads"],
+      "metrics_dir": "metrics",
+      "repetitions": 3,
+      "apps": [
+        {"name": "wordcount", "prefix": "WC",
+         "stages": ["parser", "splitter", "counter", "sink"],
+         "grid": [[1, 1, 1, 1], [1, 2, 2, 2]]}
+      ]
+    }
+
+Each engine's backend maps the logical stages to its own *.threads keys
+(an app may pin a mapping with "keys": {"<engine>": {"<stage>": "<key>"}}).
+Batch points are given logically too, "batches": [{"interval": 500,
+"size": 2000}], and only swept on engines with micro-batches (Spark).
+Engines run one after the other with identical grids and repetitions, and
+the throughput of every config is printed side by side at the end.
+"""
+import argparse
+import datetime
+import glob
+import json
+import os
+import time
+
+from . import (backends, cache, datasets, exporter, fake, flink, gclog, journal, microbatch, parallel, planner,
+               profiling, properties, quiesce, resources, snapshots, spark, stats, storm, sweep, trace, watchdog)
+
+ORCHESTRATOR_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load(path):
+    with open(path) as f:
+        bench = json.load(f)
+    bench.setdefault('exec', 'stream')
+    bench.setdefault('repetitions', 1)
+    for key in ('engines', 'metrics_dir', 'apps'):
+        if key not in bench:
+            raise sweep.SpecError('%s: missing "%s"' % (path, key))
+    bench['metrics_dir'] = os.path.join(os.path.dirname(os.path.abspath(path)), bench['metrics_dir'])
+    for app in bench['apps']:
+        sweep._check_app(path, app)
+    return bench
+
+
+def engine_spec(bench, backend):
+    """The sweep spec of one engine, with the logical stages resolved to its keys."""
+    apps = []
+    for app in bench['apps']:
+        entry = dict(app)
+        entry['name'] = backend.app_name(app['name'])
+        entry['config'] = backend.config_file(app['name'])
+        entry['stages'] = backend.resolve(app['name'], app['stages'], app.get('keys', {}).get(backend.name))
+        entry['properties'] = dict(backend.defaults, **app.get('properties', {}))
+        entry['batches'] = backend.batches(entry['stages'], app.get('batches', []))
+        apps.append(entry)
+    return {'engine': backend.name,
+            'exec': bench['exec'],
+            'config_dir': backend.config_dir,
+            'metrics_dir': os.path.join(bench['metrics_dir'], backend.name),
+            'repetitions': bench['repetitions'],
+            'apps': apps}
+
+
+def expand(bench, backend, apps=None):
+    names = None if apps is None else [backend.app_name(a) for a in apps]
+    return sweep.expand(engine_spec(bench, backend), names)
+
+
+def run_engine(backend, rounds, runs_dir, sweep_journal, result_cache=None, force=False, gate=None, plan=None,
+               cpus=None):
+    """Run every run of the rounds on one engine and journal its result.
+
+    rounds is a list of run lists, or an iterator of them when the plan
+    picks each round from the results of the ones before; every result
+    goes to plan.add(). With cpus the runs of a round are packed onto
+    private engine instances pinned to disjoint CPUs instead of running
+    one after another on the engine's cluster.
+    """
+    if cpus is not None and not backend.supports_parallel:
+        raise sweep.SpecError('%s runs cannot be packed onto CPUs for a parallel sweep' % backend.name)
+    txts_dir = os.path.join(backend.home, 'txts')
+    # 'io' or 'cpu' per run key of the parallel runs, from warming their inputs until they are journaled
+    bounds = {}
+
+    def prepare(run):
+        run.overrides.update(backend.gc_properties())
+        with backend.tracer.span('render', run):
+            snap = snapshots.create(run, runs_dir)
+        sweep_journal.started(run, snap.run_id)
+        return snap
+
+    def finish(run, result, bound=None):
+        # result is the launcher's exit status or the exception that ended the run
+        throughput = None
+        if result == 0:
+            with backend.tracer.span('metrics', run) as span:
+                throughput = backend.throughput(run)
+                span['measured'] = backend.measured(run)
+            batches = microbatch.summary(run) if run.batch else {}
+            record = sweep_journal.completed(run, throughput=throughput, bound=bound,
+                                             resources=resources.summary(run.metrics_output),
+                                             gc=gclog.summary(run.metrics_output), **batches)
+            if result_cache is not None:
+                result_cache.store(run, record)
+        elif isinstance(result, Exception):
+            sweep_journal.failed(run, str(result), cause=getattr(result, 'cause', None))
+        else:
+            sweep_journal.failed(run, 'launcher exited with status %d' % result)
+        if plan is not None:
+            plan.add(run, throughput)
+        print("finished %s %s %s/%d: %s%s" % (run.engine, run.app, run.conf, run.repetition,
+                                               sweep_journal.state(run), ', %s-bound' % bound if bound else ''))
+
+    def isolated(run, slot):
+        snap = prepare(run)
+        with backend.isolated(run, snap, slot) as launcher:
+            inputs = datasets.warm(run, backend.home, backend.tracer)
+            start = datetime.datetime.now()
+            # supervised like a run on the engine's cluster: watchdog, samplers, profiler and GC log included
+            code = backend.launch(run, snap, **launcher)
+            planner.log_time(txts_dir, run, start, datetime.datetime.now())
+        bounds[journal.key(run)] = datasets.bound(inputs, _record(snap))
+        return code
+
+    started = False
+    try:
+        for runs in rounds:
+            if result_cache is not None and not force:
+                runs = cached(runs, result_cache, sweep_journal, plan)
+            if cpus is not None:
+                parallel.run_all(runs, cpus, isolated,
+                                 lambda run, result: finish(run, result, bounds.pop(journal.key(run), None)))
+                continue
+            for run in runs:
+                if not started:
+                    backend.setup()
+                    started = True
+                snap = prepare(run)
+                inputs = None
+                try:
+                    backend.before_run(run)
+                    if gate is not None:
+                        gate.wait(backend.tracer, run)
+                    inputs = datasets.warm(run, backend.home, backend.tracer)
+                    start = datetime.datetime.now()
+                    code = backend.run(run, snap)
+                    planner.log_time(txts_dir, run, start, datetime.datetime.now())
+                except backend.errors as e:
+                    code = e
+                finish(run, code, datasets.bound(inputs, _record(snap)))
+    finally:
+        if started:
+            backend.teardown()
+
+
+def _record(snap):
+    # what runner.run saved of the run, if it got that far
+    try:
+        with open(snap.file('record.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def cached(runs, result_cache, sweep_journal, plan=None):
+    """Journal the runs an identical earlier run already measured; return the others."""
+    todo = []
+    for run in runs:
+        entry = result_cache.lookup(run)
+        if entry is None:
+            todo.append(run)
+            continue
+        print("cached %s %s %s/%d: %s" % (run.engine, run.app, run.conf, run.repetition, entry['run_id']))
+        sweep_journal.completed(run, throughput=entry['throughput'], cached=entry['key'],
+                                run_id=entry['run_id'], metrics_output=entry['metrics_output'],
+                                **(microbatch.summary(run, entry['metrics_output']) if run.batch else {}))
+        if plan is not None:
+            plan.add(run, entry['throughput'])
+    return todo
+
+
+def compare(bench, engines, sweep_journal, apps=None):
+    """Mean sink throughput per config and engine, from the journal."""
+    table = {}
+    for backend in engines:
+        for app in bench['apps']:
+            if apps is not None and app['name'] not in apps:
+                continue
+            for run in expand(bench, backend, [app['name']]):
+                record = sweep_journal.last.get(journal.key(run))
+                if record and record['state'] == journal.COMPLETED and record.get('throughput') is not None:
+                    cell = table.setdefault((app['name'], run.conf), {})
+                    cell.setdefault(backend.name, []).append(record['throughput'])
+    names = [b.name for b in engines]
+    yield '%-22s %-14s' % ('app', 'conf') + ''.join('%14s' % n for n in names)
+    for (app, conf), by_engine in sorted(table.items()):
+        cells = ['%14.1f' % stats.mean(by_engine[n]) if n in by_engine else '%14s' % '-' for n in names]
+        yield '%-22s %-14s' % (app, conf) + ''.join(cells)
+
+
+def cmd_run(args):
+    bench = load(args.spec)
+    options = {'flink_home': args.flink_home, 'flink_url': args.flink_url, 'storm_ui': args.storm_ui,
+               'steady_window': args.steady_window, 'max_duration': args.max_duration, 'yarn_url': args.yarn_url,
+               'grace': args.grace,
+               'profile': dict(event=args.profile, tool=args.profiler, delay=args.profile_delay,
+                               duration=args.profile_duration) if args.profile else None,
+               'gc_dir': os.path.join(args.runs_dir, 'gc') if args.gc_log else None}
+    if args.gc_log:
+        gclog.prepare(options['gc_dir'])
+    engines = [backends.get(name, **options) for name in (args.engines or bench['engines'])]
+    apps = args.apps or None
+    sweep_journal = journal.Journal(args.journal or os.path.join(args.runs_dir, 'journal.jsonl'))
+    if args.fresh:
+        sweep_journal.rotate()
+    # resolve every engine's stages up front so a bad spec fails before anything runs
+    plans = [(backend, expand(bench, backend, apps)) for backend in engines]
+    if args.metrics_port is not None:
+        progress = exporter.Exporter(sweep_journal, args.metrics_port).start()
+        progress.plan(sum(len(sweep_journal.pending(runs)) for _, runs in plans))
+        for backend in engines:
+            backend.exporter = progress
+    trace_path = args.trace or os.path.join(args.runs_dir, 'traces', time.strftime('%Y%m%d-%H%M%S.jsonl'))
+    for backend, runs in plans:
+        backend.tracer = trace.Tracer(trace_path, backend.name)
+        start = time.monotonic()
+        pending = sweep_journal.pending(runs)
+        print("%s: %d runs to go, %d already completed" % (backend.name, len(pending), len(runs) - len(pending)))
+        if pending:
+            result_cache = cache.ResultCache(os.path.join(args.runs_dir, 'cache'), backend.jar, backend.version(),
+                                              backend.home)
+            gate = quiesce.Gate(backend.name, args.quiesce_limits, args.quiesce_timeout)
+            # cached results have no profile or GC log to show
+            run_engine(backend, [pending], args.runs_dir, sweep_journal, result_cache,
+                       args.force or args.profile is not None or args.gc_log, gate)
+        backend.tracer.add('sweep', start, time.monotonic())
+    for line in compare(bench, engines, sweep_journal, apps):
+        print(line)
+    for line in microbatch.report(sweep_journal.records()):
+        print(line)
+    if args.profile:
+        for line in profiling.report(profiling.aggregate(args.runs_dir)):
+            print(line)
+    return 0
+
+
+def cmd_plan(args):
+    with open(args.spec) as f:
+        is_bench = 'engines' in json.load(f)
+    if is_bench:
+        bench = load(args.spec)
+        specs = [(engine_spec(bench, backend), os.path.join(backend.home, 'txts'), backend)
+                 for backend in (backends.get(name) for name in (args.engines or bench['engines']))]
+    else:
+        spec = sweep.load_spec(args.spec)
+        specs = [(spec, os.path.join(os.path.dirname(os.path.abspath(args.spec)), 'txts'), None)]
+    done = journal.Journal(args.journal) if args.journal else None
+    for spec, txts_dir, backend in specs:
+        apps = args.apps or None
+        if backend is not None and apps is not None:
+            apps = [backend.app_name(a) for a in apps]
+        estimates = planner.estimate(spec, apps, args.txts or txts_dir, args.overhead, done)
+        print('%s (history from %s):' % (spec['engine'], args.txts or txts_dir))
+        for line in planner.report(estimates, args.window):
+            print('  ' + line)
+    return 0
+
+
+def cmd_trace_report(args):
+    for line in trace.report(trace.load(args.traces), args.top):
+        print(line)
+    return 0
+
+
+def cmd_profile(args):
+    groups = profiling.aggregate(args.runs_dir)
+    if not groups:
+        print('no profiled runs under %s' % args.runs_dir)
+        return 1
+    for line in profiling.report(groups, args.focus or (), args.top):
+        print(line)
+    print('flame graphs in %s' % os.path.join(args.runs_dir, profiling.PROFILES_DIR))
+    return 0
+
+
+def cmd_stages(args):
+    backend = backends.get(args.engine)
+    for logical, key in sorted(backend.stage_keys(args.app).items()):
+        print('%-24s %s' % (logical, key))
+    return 0
+
+
+def cmd_check_serializer(args):
+    """Compare the native serializer with properties-serializer.jar on every app config."""
+    java = properties.java_release()
+    mismatches = 0
+    for name in args.engines or sorted(backends.BACKENDS):
+        backend = backends.get(name)
+        for path in sorted(glob.glob(os.path.join(backend.config_dir, '*.properties'))):
+            expected = properties.serialize_with_jar(path, backend.serializer)
+            if properties.serialize(path, java) != expected:
+                mismatches += 1
+                print('MISMATCH %s' % path)
+                print('  jar:    %s' % expected)
+                print('  native: %s' % properties.serialize(path, java))
+            elif args.verbose:
+                print('ok %s' % path)
+    print('%d mismatches (Java %d key order)' % (mismatches, java))
+    return 1 if mismatches else 0
+
+
+def cmd_fake_engines(args):
+    for line in fake.install(args.dir, args.slots):
+        print(line)
+    return 0
+
+
+def cmd_fake_serve(args):
+    fake.serve(args.storm_ui, args.yarn_url)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='dspbench')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='run a benchmark spec on one or more engines')
+    run.add_argument('spec', help='benchmark spec (JSON)')
+    run.add_argument('apps', nargs='*', help='apps to run (default: all apps in the spec)')
+    run.add_argument('--engines', type=lambda s: s.split(','), help='comma-separated engines (default: the spec\'s)')
+    run.add_argument('--runs-dir', default=os.path.join(ORCHESTRATOR_DIR, 'runs'),
+                     help='where run directories and the journal go')
+    run.add_argument('--journal', help='sweep journal (default: <runs-dir>/journal.jsonl)')
+    run.add_argument('--fresh', action='store_true', help='set the journal aside and run everything again')
+    run.add_argument('--force', action='store_true',
+                     help='run configs again even when an identical run is in the result cache')
+    run.add_argument('--flink-home', help='Flink installation (default: $FLINK_HOME or ~/maven/flink-1.18.1)')
+    run.add_argument('--flink-url', default=flink.DEFAULT_URL, help='Flink REST address')
+    run.add_argument('--storm-ui', default=storm.DEFAULT_URL, help='Storm UI address')
+    run.add_argument('--steady-window', type=int, default=60,
+                     help='seconds of stable throughput to capture before stopping a Storm run')
+    run.add_argument('--max-duration', type=int, default=300,
+                     help='hard limit in seconds for runs that do not end on their own (Storm, threads)')
+    run.add_argument('--trace', help='file the phase spans go to (default: <runs-dir>/traces/<time>.jsonl)')
+    run.add_argument('--yarn-url', default=spark.DEFAULT_RM, help='YARN ResourceManager address')
+    run.add_argument('--grace', type=int, default=watchdog.GRACE,
+                     help='seconds a job may go without receiving a tuple before it is aborted')
+    run.add_argument('--quiesce-limits', type=quiesce.parse_limits, default={},
+                     help='load per CPU, busy CPU share and dirty MB to wait for before each run '
+                          '(default: load=0.5,cpu=0.1,dirty=64)')
+    run.add_argument('--quiesce-timeout', type=int, default=quiesce.MAX_WAIT,
+                     help='seconds to wait for the host to settle before starting a run anyway (0: no wait)')
+    run.add_argument('--profile', choices=profiling.EVENTS,
+                     help='profile the worker JVMs of every run in the steady state (skips the result cache)')
+    run.add_argument('--profiler', choices=profiling.TOOLS, default='async',
+                     help='async-profiler or a JFR recording through jcmd')
+    run.add_argument('--profile-delay', type=int, default=profiling.DELAY,
+                     help='seconds after the job was accepted to start profiling')
+    run.add_argument('--profile-duration', type=int, default=profiling.DURATION, help='seconds to profile for')
+    run.add_argument('--gc-log', action='store_true',
+                     help='log the collections of the worker JVMs and journal their pauses (skips the result cache)')
+    run.add_argument('--metrics-port', type=int, metavar='PORT',
+                     help='serve the sweep progress and the operator rates of the running jobs for Prometheus '
+                          'on localhost:PORT')
+    run.set_defaults(func=cmd_run)
+
+    plan = commands.add_parser('plan', help='estimate how long a sweep or benchmark spec will take')
+    plan.add_argument('spec', help='benchmark spec or an engine\'s sweep.json')
+    plan.add_argument('apps', nargs='*', help='apps to plan (default: all apps in the spec)')
+    plan.add_argument('--engines', type=lambda s: s.split(','), help='comma-separated engines (default: the spec\'s)')
+    plan.add_argument('--txts', help='directory of timing logs (default: the engine\'s txts/)')
+    plan.add_argument('--overhead', type=float,
+                      help='seconds between runs besides the run itself (default: per engine)')
+    plan.add_argument('--window', type=planner.parse_duration, help='time available, e.g. 8h or 90m, to budget the apps against')
+    plan.add_argument('--journal', help='leave out the runs this sweep journal has completed')
+    plan.set_defaults(func=cmd_plan)
+
+    report = commands.add_parser('trace-report', help='break the wall time of traced sweeps down by phase')
+    report.add_argument('traces', nargs='+', help='trace files written by the drivers or dspbench run')
+    report.add_argument('--top', type=int, default=3, help='overhead sources to single out per engine')
+    report.set_defaults(func=cmd_trace_report)
+
+    profile = commands.add_parser('profile', help='sum the profiles of every config into (differential) flame graphs')
+    profile.add_argument('runs_dir', nargs='?', default=os.path.join(ORCHESTRATOR_DIR, 'runs'),
+                         help='directory of the profiled run directories (default: the dspbench run one)')
+    profile.add_argument('--focus', action='append', metavar='REGEX',
+                         help='report the share of samples in frames matching REGEX, e.g. BloomFilter (repeatable)')
+    profile.add_argument('--top', type=int, default=3, help='hottest frames per config without --focus')
+    profile.set_defaults(func=cmd_profile)
+
+    stages = commands.add_parser('stages', help='show how an engine names the stages of an app')
+    stages.add_argument('engine', choices=sorted(backends.BACKENDS))
+    stages.add_argument('app')
+    stages.set_defaults(func=cmd_stages)
+
+    check = commands.add_parser('check-serializer',
+                                help='check the native config serializer against properties-serializer.jar')
+    check.add_argument('--engines', type=lambda s: s.split(','), help='comma-separated engines (default: all)')
+    check.add_argument('-v', '--verbose', action='store_true', help='list the configs that match too')
+    check.set_defaults(func=cmd_check_serializer)
+
+    engines = commands.add_parser('fake-engines', help='write stand-ins for the engine commands into a directory')
+    engines.add_argument('dir', help='where bin/ and a fake FLINK_HOME go')
+    engines.add_argument('--slots', type=int, default=4, help='task slots of the fake Flink TaskManager')
+    engines.set_defaults(func=cmd_fake_engines)
+
+    serve = commands.add_parser('fake-serve', help='serve the Storm UI and YARN APIs the fake engines report to')
+    serve.add_argument('--storm-ui', default=storm.DEFAULT_URL, help='Storm UI address to listen on')
+    serve.add_argument('--yarn-url', default=spark.DEFAULT_RM, help='YARN ResourceManager address to listen on')
+    serve.set_defaults(func=cmd_fake_serve)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args)
+    except sweep.SpecError as e:
+        parser.exit(2, 'dspbench: %s\n' % e)
+    except KeyboardInterrupt:
+        return 130
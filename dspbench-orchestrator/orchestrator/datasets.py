@@ -0,0 +1,159 @@
+"""Getting a run's input files into the page cache before it starts.
+
+The file sources read their dataset once per run, so the first
+repetition of an app used to read it from disk while later ones found it
+cached, and source I/O ended up in the operator throughput. warm() maps
+every input file of a run and touches each page, then checks with
+mincore(2) how much of it is resident. A run whose inputs could not be
+made resident, or whose CPUs spent a good share of the run waiting on
+I/O, is reported as I/O-bound; all others as CPU-bound.
+
+Inputs are the files (or the files under directories) that the
+*.source.path and *.spout.path properties of the run point to, relative
+paths being taken from the engine's module directory.
+"""
+import ctypes
+import ctypes.util
+import mmap
+import os
+import time
+
+from . import sweep, trace
+
+PATH_KEYS = ('.source.path', '.spout.path')
+# share of the input pages that must be cached for a run to start warm
+RESIDENT = 0.99
+# iowait against busy CPU time during a run above which it was held up by I/O
+IOWAIT_RATIO = 0.1
+
+_libc = None
+
+
+def _mincore():
+    """libc with mmap, mincore and munmap typed for ctypes, or None where there is none."""
+    global _libc
+    if _libc is None:
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            libc.mmap.restype = ctypes.c_void_p
+            libc.mmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+                                  ctypes.c_long]
+            libc.mincore.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.POINTER(ctypes.c_ubyte)]
+            libc.munmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+        except (OSError, AttributeError):
+            libc = False
+        _libc = libc
+    return _libc or None
+
+
+def _input_paths(run, base_dir):
+    # (value, path on this host) of every input path property of the run
+    for key, value in sorted(sweep.resolved(run).items()):
+        value = value.strip()
+        if key.endswith(PATH_KEYS) and value:
+            yield value, value if os.path.isabs(value) else os.path.join(base_dir, value)
+
+
+def input_files(run, base_dir):
+    """The input files of a run that exist on this host."""
+    files = []
+    for _, path in _input_paths(run, base_dir):
+        if os.path.isfile(path):
+            files.append(path)
+        elif os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, n) for n in sorted(names))
+    return sorted(set(files))
+
+
+def unresolved(run, base_dir):
+    """The input paths of a run that point at nothing on this host."""
+    return [value for value, path in _input_paths(run, base_dir) if not os.path.exists(path)]
+
+
+def residency(path):
+    """(resident pages, pages) of a file in the page cache, or None without mincore."""
+    libc = _mincore()
+    size = os.path.getsize(path)
+    if libc is None:
+        return None
+    if size == 0:
+        return 0, 0
+    pages = (size + mmap.PAGESIZE - 1) // mmap.PAGESIZE
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        addr = libc.mmap(None, size, mmap.PROT_READ, mmap.MAP_SHARED, fd, 0)
+        if addr is None or addr == ctypes.c_void_p(-1).value:
+            return None
+        try:
+            vec = (ctypes.c_ubyte * pages)()
+            if libc.mincore(addr, size, vec) != 0:
+                return None
+            return sum(v & 1 for v in vec), pages
+        finally:
+            libc.munmap(addr, size)
+    finally:
+        os.close(fd)
+
+
+def touch(path):
+    """Fault every page of a file into the page cache through a read-only mapping."""
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        if hasattr(m, 'madvise'):
+            m.madvise(mmap.MADV_WILLNEED)
+        for offset in range(0, len(m), mmap.PAGESIZE):
+            m[offset]
+
+
+def _share(files):
+    counts = [residency(p) for p in files]
+    if not files or any(c is None for c in counts):
+        return None
+    pages = sum(c[1] for c in counts)
+    return round(sum(c[0] for c in counts) / pages, 4) if pages else 1.0
+
+
+def warm(run, base_dir, tracer=trace.NULL):
+    """Touch the run's inputs and return what was and is now cached.
+
+    {'files', 'bytes', 'cached': share resident before, 'resident': share
+    resident after, 'seconds'}; the shares are None without mincore.
+    """
+    files = input_files(run, base_dir)
+    with tracer.span('warm', run) as span:
+        start = time.monotonic()
+        before = _share(files)
+        for path in files:
+            touch(path)
+        after = _share(files)
+        inputs = {'files': files, 'bytes': sum(os.path.getsize(p) for p in files), 'cached': before,
+                  'resident': after, 'seconds': round(time.monotonic() - start, 3)}
+        span.update({k: v for k, v in inputs.items() if k != 'files'})
+    if files:
+        print("inputs: %d files, %.1f MB, %s cached before, %s now" % (
+            len(files), inputs['bytes'] / 1e6, _percent(before), _percent(after)))
+        if after is not None and after < RESIDENT:
+            print("inputs do not fit in the page cache; the run will read from disk")
+    return inputs
+
+
+def _percent(share):
+    return '?' if share is None else '%.0f%%' % (100 * share)
+
+
+def bound(inputs, record=None):
+    """'io' if the run was held up reading its inputs, 'cpu' if not, None for runs without inputs.
+
+    record is the runner's record of the run; its system samples tell how
+    much the CPUs waited on I/O while it ran.
+    """
+    if not inputs or not inputs['files']:
+        return None
+    if inputs['resident'] is not None and inputs['resident'] < RESIDENT:
+        return 'io'
+    samples = (record or {}).get('system', [])
+    busy = sum(s.get('cpu', 0) for s in samples)
+    iowait = sum(s.get('iowait', 0) for s in samples)
+    return 'io' if samples and iowait > IOWAIT_RATIO * busy else 'cpu'
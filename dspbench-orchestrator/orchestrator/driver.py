@@ -0,0 +1,195 @@
+"""The experiment.py driver of each engine module.
+
+dspbench-flink, dspbench-spark and dspbench-storm keep their sweep in a
+sweep.json next to an experiment.py that only calls main() with the
+engine's name. The runs go through the engine's backend and
+cli.run_engine, the same code as `dspbench run`, with the run
+directories, journals, traces, result cache and timing logs under the
+engine's own module. Besides the plain sweep a driver replays past runs,
+repeats configs until their throughput is known well enough, searches
+the parallelism of one app and, on engines with a rate-limited source,
+the highest input rate each config sustains.
+"""
+import argparse
+import os
+import time
+
+from . import (adaptive, backends, cache, cli, exporter, gclog, journal, microbatch, parallel, profiling, quiesce,
+               saturation, search, snapshots, spark, storm, sweep, trace, watchdog)
+
+# what --parallel packs the runs of each engine onto
+ISOLATED = {'flink': 'private local clusters', 'spark': 'local[N] drivers', 'storm': 'local-mode topologies'}
+
+
+def parser(engine):
+    p = argparse.ArgumentParser(prog='experiment.py')
+    p.add_argument('apps', nargs='*', help='apps to run (default: all apps in sweep.json)')
+    if engine == 'flink':
+        p.add_argument('--reuse-cluster', action='store_true',
+                       help='keep the cluster between runs, restarting only when flink-conf.yaml changes')
+    elif engine == 'spark':
+        p.add_argument('--yarn', default=spark.DEFAULT_RM, help='YARN ResourceManager address')
+    elif engine == 'storm':
+        p.add_argument('--ui', default=storm.DEFAULT_URL, help='Storm UI address')
+        p.add_argument('--steady-window', type=int, default=60,
+                       help='seconds of stable throughput to capture before stopping a run')
+        p.add_argument('--max-duration', type=int, default=300, help='hard limit for a run in seconds')
+    if backends.BACKENDS[engine].supports_parallel:
+        p.add_argument('--parallel', nargs='?', const='all', metavar='CPUS',
+                       help='pack runs onto %s pinned to disjoint CPUs (e.g. 0-31)' % ISOLATED[engine])
+    p.add_argument('--replay', nargs='+', metavar='RUN_DIR', help='run past runs again with their exact config')
+    p.add_argument('--journal',
+                   help='sweep journal; completed runs in it are skipped (default: runs/journal.jsonl, '
+                        'runs/search.jsonl with --search%s)'
+                        % (', runs/saturation.jsonl with --saturate' if engine in saturation.RATE_SOURCES else ''))
+    p.add_argument('--fresh', action='store_true', help='set the journal aside and run the whole sweep again')
+    p.add_argument('--force', action='store_true',
+                   help='run configs again even when an identical run is in the result cache')
+    p.add_argument('--trace', help='file the phase spans of this sweep go to (default: runs/traces/<time>.jsonl)')
+    p.add_argument('--grace', type=int, default=watchdog.GRACE,
+                   help='seconds a job may go without receiving a tuple before it is aborted')
+    p.add_argument('--quiesce-limits', type=quiesce.parse_limits, default={},
+                   help='load per CPU, busy CPU share and dirty MB to wait for before each run '
+                        '(default: load=0.5,cpu=0.1,dirty=64)')
+    p.add_argument('--quiesce-timeout', type=int, default=quiesce.MAX_WAIT,
+                   help='seconds to wait for the host to settle before starting a run anyway (0: no wait)')
+    p.add_argument('--profile', choices=profiling.EVENTS,
+                   help='profile the worker JVMs of every run in the steady state (skips the result cache)')
+    p.add_argument('--profiler', choices=profiling.TOOLS, default='async',
+                   help='async-profiler or a JFR recording through jcmd')
+    p.add_argument('--profile-delay', type=int, default=profiling.DELAY,
+                   help='seconds after the job was accepted to start profiling')
+    p.add_argument('--profile-duration', type=int, default=profiling.DURATION, help='seconds to profile for')
+    p.add_argument('--gc-log', action='store_true',
+                   help='log the collections of the worker JVMs and journal their pauses (skips the result cache)')
+    p.add_argument('--metrics-port', type=int, metavar='PORT',
+                   help='serve the sweep progress and the operator rates of the running jobs for Prometheus '
+                        'on localhost:PORT')
+    p.add_argument('--adaptive', action='store_true',
+                   help='repeat each config until its throughput CI is narrow enough instead of a fixed count')
+    p.add_argument('--ci-target', type=float, default=0.05,
+                   help='relative half-width of the 95%% throughput CI at which a config is done')
+    p.add_argument('--min-reps', type=int, default=3, help='repetitions before the CI is checked')
+    p.add_argument('--max-reps', type=int, default=10, help='repetitions after which a config is done regardless')
+    p.add_argument('--search', action='store_true',
+                   help='search the parallelism of every stage of one app by successive halving')
+    p.add_argument('--cores', type=int, default=len(parallel.available_cpus()),
+                   help='most threads a searched config may use in total')
+    p.add_argument('--time-budget', type=int, default=4 * 3600, help='seconds the search may take')
+    p.add_argument('--min-runtime', type=int, default=30, help='seconds of the shortest search runs')
+    p.add_argument('--max-runtime', type=int, default=270, help='seconds of the longest search runs')
+    if engine in saturation.RATE_SOURCES:
+        p.add_argument('--saturate', action='store_true',
+                       help='search the highest input rate each config sustains instead of running it flat out')
+        p.add_argument('--start-rate', type=int, default=1000,
+                       help='tuples/s of the first probe of a config; it must be a rate the config sustains')
+        p.add_argument('--probe-runtime', type=int, default=60, help='seconds each saturation probe runs')
+        p.add_argument('--rate-precision', type=float, default=0.05,
+                       help='relative width of the rate range at which the saturation search of a config stops')
+    return p
+
+
+def engine_options(engine, args):
+    """The backend options of the engine's own arguments."""
+    if engine == 'flink':
+        return {'reuse_cluster': args.reuse_cluster}
+    if engine == 'spark':
+        return {'yarn_url': args.yarn}
+    if engine == 'storm':
+        return {'storm_ui': args.ui, 'steady_window': args.steady_window, 'max_duration': args.max_duration}
+    return {}
+
+
+def main(engine, argv=None):
+    p = parser(engine)
+    args = p.parse_args(argv)
+    saturate = getattr(args, 'saturate', False)
+    if args.search and (len(args.apps) != 1 or args.replay):
+        p.error('--search takes exactly one app and no --replay')
+    if saturate and (args.search or args.adaptive or args.replay):
+        p.error('--saturate takes no --search, --adaptive or --replay')
+
+    backend = backends.get(engine, grace=args.grace, **engine_options(engine, args))
+    if args.search and not backend.bounded:
+        p.error('--search needs runs cut short at their runtime, which %s cannot do' % engine)
+    runs_dir = os.path.join(backend.home, 'runs')
+    if args.profile:
+        backend.profile = dict(event=args.profile, tool=args.profiler, delay=args.profile_delay,
+                               duration=args.profile_duration)
+    if args.gc_log:
+        backend.gc_dir = os.path.join(runs_dir, 'gc')
+        gclog.prepare(backend.gc_dir)
+    if args.journal is None:
+        args.journal = os.path.join(runs_dir, 'search.jsonl' if args.search else
+                                    'saturation.jsonl' if saturate else 'journal.jsonl')
+    sweep_journal = journal.Journal(args.journal)
+    if args.fresh:
+        sweep_journal.rotate()
+
+    plan = None
+    try:
+        if args.replay:
+            rounds = [[snapshots.replay(path) for path in args.replay]]
+        else:
+            spec = sweep.load_spec(os.path.join(backend.home, 'sweep.json'))
+            if args.search:
+                app = next((a for a in spec['apps'] if a['name'] == args.apps[0]), None)
+                if app is None:
+                    p.error('%s is not in sweep.json' % args.apps[0])
+                try:
+                    plan = search.Plan(spec, app, args.cores, args.time_budget, args.min_runtime,
+                                       args.max_runtime)
+                except ValueError as e:
+                    # fewer --cores than the app has stages
+                    p.error(str(e))
+            elif saturate:
+                plan = saturation.Plan(spec, args.apps or None, args.start_rate, args.probe_runtime,
+                                       args.rate_precision)
+            elif args.adaptive:
+                plan = adaptive.Plan(spec, args.apps or None, args.ci_target, args.min_reps, args.max_reps)
+                plan.seed(sweep_journal)
+            else:
+                runs = sweep.expand(spec, args.apps or None)
+                pending = sweep_journal.pending(runs)
+                print("%d runs to go, %d already completed in %s" % (len(pending), len(runs) - len(pending),
+                                                                       args.journal))
+                rounds = [pending]
+            if plan is not None:
+                rounds = iter(plan.next_round, [])
+    except sweep.SpecError as e:
+        p.exit(2, '%s: %s\n' % (p.prog, e))
+
+    trace_path = args.trace or os.path.join(runs_dir, 'traces', time.strftime('%Y%m%d-%H%M%S.jsonl'))
+    backend.tracer = trace.Tracer(trace_path, engine)
+    if args.metrics_port is not None:
+        backend.exporter = exporter.Exporter(sweep_journal, args.metrics_port).start()
+        if plan is None:
+            backend.exporter.plan(len(rounds[0]))
+    result_cache = cache.ResultCache(os.path.join(runs_dir, 'cache'), backend.jar, backend.version(), backend.home)
+    gate = quiesce.Gate(engine, args.quiesce_limits, args.quiesce_timeout)
+    cpus = None
+    # engines without private instances to pack runs onto take no --parallel
+    packed = getattr(args, 'parallel', None)
+    if packed:
+        cpus = parallel.available_cpus() if packed == 'all' else parallel.parse_cpus(packed)
+    # replays run their exact config again, saturation probes are judged by their per-operator metrics,
+    # and profiles and GC logs are taken from runs, none of which the cache keeps
+    force = args.force or bool(args.replay) or saturate or args.profile is not None or args.gc_log
+    start = time.monotonic()
+    try:
+        cli.run_engine(backend, rounds, runs_dir, sweep_journal, result_cache, force, gate, plan, cpus)
+    except KeyboardInterrupt:
+        return 130
+    backend.tracer.add('sweep', start, time.monotonic())
+
+    # what the adaptive sweep, the parallelism or the saturation search ended with
+    if plan is not None:
+        for line in plan.report():
+            print(line)
+    if backend.batch_keys:
+        for line in microbatch.report(sweep_journal.records()):
+            print(line)
+    if args.profile:
+        for line in profiling.report(profiling.aggregate(runs_dir)):
+            print(line)
+    return 0
@@ -0,0 +1,264 @@
+"""Live sweep progress in the Prometheus text format.
+
+An Exporter serves http://127.0.0.1:<port>/metrics from a daemon thread
+while a sweep goes on, so a local Prometheus or a curl loop can tell a
+stalled or degraded run from a healthy one while it is still running.
+It follows the sweep through the journal, whose every record it sees,
+and reads the metrics files of the runs in flight on every scrape:
+
+    dspbench_sweep_runs_planned          runs the sweep set out to do, when known
+    dspbench_sweep_runs_total            runs finished so far, by state (completed, failed, cached)
+    dspbench_sweep_elapsed_seconds       since the sweep started
+    dspbench_sweep_remaining_seconds     runs left times the seconds per run so far
+    dspbench_run_info                    app, conf, repetition and run id of each run in flight
+    dspbench_run_elapsed_seconds         since the run started
+    dspbench_job_received_tuples_total   what the engine reported to the last watchdog probe of the run
+    dspbench_operator_received_tuples_per_second
+    dspbench_operator_emitted_tuples_per_second
+                                         per operator, over the last RATE_WINDOW seconds reported
+    dspbench_operator_received_tuples_total
+    dspbench_operator_emitted_tuples_total
+    dspbench_operator_last_report_timestamp_seconds
+                                         the newest second an operator reported
+
+The operator figures come from the <Operator>-received.csv and -emitted.csv
+files (the threads engine's cumulative <component>.tuples-*.csv counters)
+as far as they have been written. Most operators of Flink, Spark and
+Storm only write theirs when they shut down, so for a run of those the
+job's received tuples, which the watchdog asks the engine for every 5 s
+through the record runner.run hands to follow(), are what moves. A last
+report falling behind the clock, or a received count that stops
+growing, is what a stalled run looks like.
+
+Prometheus asking for OpenMetrics gets it, anything else the 0.0.4 text
+format.
+"""
+import csv
+import glob
+import http.server
+import os
+import threading
+import time
+
+from . import journal, metrics
+
+HOST = '127.0.0.1'
+# seconds of reported buckets an operator rate is averaged over
+RATE_WINDOW = 5
+OPENMETRICS = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+TEXT = 'text/plain; version=0.0.4; charset=utf-8'
+CACHED = 'cached'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{%s}' % ','.join('%s="%s"' % (k, _escape(v)) for k, v in labels.items())
+
+
+def _number(value):
+    return repr(round(value, 3)) if isinstance(value, float) else str(value)
+
+
+def rates(paths, window=RATE_WINDOW):
+    """(tuples per second over the last window reported seconds, tuples, newest second) of bucket files, or None.
+
+    The newest second may still be filling up and is left out of the rate.
+    """
+    totals = metrics.per_second(metrics.buckets(paths))
+    if not totals:
+        return None
+    seconds = sorted(totals)
+    recent = seconds[:-1][-window:]
+    rate = sum(totals[t] for t in recent) / float(recent[-1] - recent[0] + 1) if recent else None
+    return rate, sum(totals.values()), seconds[-1]
+
+
+def counter_rates(path, window=RATE_WINDOW):
+    """rates() of a cumulative "t,count" counter file of the threads engine; its rate spans the last window seconds."""
+    samples = []
+    with open(path, newline='') as f:
+        for row in csv.reader(f):
+            try:
+                samples.append((int(row[0]), int(row[1])))
+            except (IndexError, ValueError):
+                continue
+    if not samples:
+        return None
+    recent = [s for s in samples if s[0] >= samples[-1][0] - window]
+    first, last = recent[0], recent[-1]
+    rate = (last[1] - first[1]) / float(last[0] - first[0]) if last[0] > first[0] else None
+    return rate, last[1], last[0]
+
+
+def operators(metrics_output):
+    """{(operator, 'received' or 'emitted'): rates()} of what a run's operators wrote so far."""
+    found = {}
+    for direction in ('received', 'emitted'):
+        counters = '.tuples-%s.csv' % direction
+        suffix = '-%s.csv' % direction
+        by_operator = {}
+        for path in glob.glob(os.path.join(metrics_output, '*' + suffix)):
+            if path.endswith(counters):
+                continue
+            by_operator.setdefault(os.path.basename(path)[:-len(suffix)], []).append(path)
+        for operator, paths in by_operator.items():
+            found[(operator, direction)] = rates(paths)
+        for path in glob.glob(os.path.join(metrics_output, '*' + counters)):
+            found[(os.path.basename(path)[:-len(counters)], direction)] = counter_rates(path)
+    return {k: v for k, v in found.items() if v is not None}
+
+
+class _Family:
+    def __init__(self, name, kind, help):
+        self.name = name
+        self.kind = kind
+        self.help = help
+        self.samples = []
+
+    def add(self, labels, value, suffix=''):
+        if value is not None:
+            self.samples.append((suffix, labels, value))
+
+    def lines(self, openmetrics):
+        if not self.samples:
+            return []
+        kind = self.kind if openmetrics or self.kind != 'info' else 'gauge'
+        # the 0.0.4 format names a counter by its sample, OpenMetrics by the family
+        name = self.name + ('_total' if self.kind == 'counter' and not openmetrics else '')
+        name += '_info' if self.kind == 'info' and not openmetrics else ''
+        out = ['# HELP %s %s' % (name, self.help), '# TYPE %s %s' % (name, kind)]
+        for suffix, labels, value in self.samples:
+            out.append('%s%s%s %s' % (self.name, suffix, _labels(labels), _number(value)))
+        return out
+
+
+class Exporter:
+    """The progress of the sweep sweep_journal records, served on HOST:port once start() was called."""
+
+    def __init__(self, sweep_journal, port, host=HOST):
+        self.port = port
+        self.host = host
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.planned = None
+        self.running = {}
+        # the runner.run records of the runs in flight, by key
+        self.records = {}
+        self.finished = {}
+        # first start and count of the runs that took time, for the estimate of what is left
+        self.first = None
+        self.measured = 0
+        self.server = None
+        sweep_journal.listeners.append(self.observe)
+
+    def plan(self, runs):
+        """Count runs towards the planned ones; sweeps whose rounds are not known up front leave it unset."""
+        with self.lock:
+            self.planned = (self.planned or 0) + runs
+
+    def follow(self, run):
+        """The live hook of runner.run for a run, to read the watchdog's probes of it."""
+        def attach(record):
+            with self.lock:
+                self.records[journal.key(run)] = record
+        return attach
+
+    def observe(self, run, record):
+        with self.lock:
+            key = journal.key(run)
+            if record['state'] == journal.STARTED:
+                self.running[key] = (run, record['time'], record.get('run_id'))
+                if self.first is None:
+                    self.first = record['time']
+                return
+            self.running.pop(key, None)
+            self.records.pop(key, None)
+            state = CACHED if record.get('cached') else record['state']
+            self.finished[(run.engine, state)] = self.finished.get((run.engine, state), 0) + 1
+            if state != CACHED:
+                self.measured += 1
+
+    def remaining(self, now):
+        """Seconds until the planned runs are done at the pace of the runs so far, or None."""
+        done = sum(self.finished.values())
+        if self.planned is None or not self.measured:
+            return None
+        # the pace counts parallel runs in, and the time between runs
+        return max(0.0, (self.planned - done) * (now - self.first) / self.measured)
+
+    def families(self):
+        now = time.time()
+        with self.lock:
+            running = sorted(self.running.values(), key=lambda r: r[1])
+            records = dict(self.records)
+            finished = dict(self.finished)
+            planned = self.planned
+            remaining = self.remaining(now)
+        sweep = [_Family('dspbench_sweep_runs_planned', 'gauge', 'Runs the sweep set out to do.'),
+                 _Family('dspbench_sweep_runs', 'counter', 'Runs finished, by engine and state.'),
+                 _Family('dspbench_sweep_elapsed_seconds', 'gauge', 'Seconds since the sweep started.'),
+                 _Family('dspbench_sweep_remaining_seconds', 'gauge',
+                         'Estimated seconds until the planned runs are done.')]
+        sweep[0].add({}, planned)
+        for (engine, state), count in sorted(finished.items()):
+            sweep[1].add({'engine': engine, 'state': state}, count, '_total')
+        sweep[2].add({}, now - self.started)
+        sweep[3].add({}, remaining)
+        runs = [_Family('dspbench_run', 'info', 'The runs in flight.'),
+                _Family('dspbench_run_elapsed_seconds', 'gauge', 'Seconds since the run started.'),
+                _Family('dspbench_job_received_tuples', 'counter',
+                        'Tuples the job received, as the engine reported them to the last watchdog probe.')]
+        ops = {name: _Family('dspbench_operator_' + name, kind, help) for name, kind, help in (
+            ('received_tuples_per_second', 'gauge', 'Tuples received per second over the last seconds reported.'),
+            ('emitted_tuples_per_second', 'gauge', 'Tuples emitted per second over the last seconds reported.'),
+            ('received_tuples', 'counter', 'Tuples received so far, as far as reported.'),
+            ('emitted_tuples', 'counter', 'Tuples emitted so far, as far as reported.'),
+            ('last_report_timestamp_seconds', 'gauge', 'The newest second an operator reported tuples for.'))}
+        for run, started, run_id in running:
+            labels = {'engine': run.engine, 'app': run.app, 'conf': run.conf, 'repetition': run.repetition}
+            runs[0].add(dict(labels, run_id=run_id or ''), 1, '_info')
+            runs[1].add(labels, now - started)
+            runs[2].add(labels, records.get(journal.key(run), {}).get('tuples'), '_total')
+            for (operator, direction), (rate, tuples, newest) in sorted(operators(run.metrics_output).items()):
+                op = dict(labels, operator=operator)
+                ops[direction + '_tuples_per_second'].add(op, rate)
+                ops[direction + '_tuples'].add(op, tuples, '_total')
+                if direction == 'received':
+                    ops['last_report_timestamp_seconds'].add(op, newest)
+        return sweep + runs + list(ops.values())
+
+    def render(self, openmetrics=True):
+        lines = [line for family in self.families() for line in family.lines(openmetrics)]
+        if openmetrics:
+            lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+    def start(self):
+        exporter = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                openmetrics = 'application/openmetrics-text' in self.headers.get('Accept', '')
+                payload = exporter.render(openmetrics).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', OPENMETRICS if openmetrics else TEXT)
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = http.server.ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        print('sweep metrics on http://%s:%d/metrics' % (self.host, self.server.server_address[1]))
+        return self
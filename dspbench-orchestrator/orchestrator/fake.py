@@ -0,0 +1,975 @@
+"""Stand-ins for the engines, to run sweeps without Flink, Spark or Storm.
+
+`dspbench fake-engines DIR` writes executables that behave like the
+engine commands the drivers and backends call, as far as the
+orchestrator can tell:
+
+    DIR/flink               a FLINK_HOME whose bin/flink run, start-cluster.sh
+                            and stop-cluster.sh start fake JobManager and
+                            TaskManager daemons serving the Flink REST API
+    DIR/bin/storm           storm jar, list, kill and version
+    DIR/bin/spark-submit    YARN and local[N] masters (serving the driver's Spark
+                            UI on spark.ui.port), --version
+    DIR/bin/yarn            yarn application -kill
+    DIR/bin/java            properties-serializer.jar, StormRunner in local
+                            mode and the threads engine's LocalTaskRunner
+
+and `dspbench fake-serve` runs the Storm UI and the YARN ResourceManager
+(with the Spark UI behind its proxy), which Nimbus and YARN would serve.
+
+A fake job does no work. It reports live counters through the REST APIs
+and, when it ends, appends "<time>,<count>" lines to the
+<Operator>-received.csv and -emitted.csv files under metrics.output like
+the real operators do, one line per second and instance (the threads
+engine's cumulative <stage>.tuples-received.csv is written as it goes).
+Spark jobs with a *.batch.interval run micro-batches of *.batch.size
+records, each taking 50 ms plus the records at the rate below, and write
+their batches.csv too. Knobs are read from the job's config as fake.<knob>, else from the
+environment as DSPBENCH_FAKE_<KNOB>:
+
+    rate        tuples per second with one thread per stage (10000), or the
+                sum of the *.source.rate keys if that is lower
+    scaling     exponent of the bottleneck stage's threads on the rate (0.8)
+    jitter      relative noise of each second's count (0.05)
+    runtime     seconds a job runs (its *.runtime_sec, else 10)
+    speed       seconds of metrics written per second of wall time (1)
+    startup     seconds from submission to the first tuple (1)
+    cluster     seconds a Flink daemon takes to come up (1)
+    fail        probability that a job fails (0)
+    fail_after  seconds of tuples a failing job gets through before it fails (0)
+    error       the exception a failing job logs
+    seed        seed of the random numbers, for repeatable sweeps
+
+Jobs, topologies, applications and TaskManagers register themselves as
+JSON files under $DSPBENCH_FAKE_STATE (default: dspbench-fake in the temp
+dir), which is all the REST servers read, so any number of fake
+processes find each other without a broker.
+"""
+import hashlib
+import http.server
+import json
+import os
+import random
+import re
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import uuid
+
+from . import flink, properties, spark, storm
+from .rest import UNAVAILABLE
+
+KNOBS = {
+    'rate': 10000.0,
+    'scaling': 0.8,
+    'jitter': 0.05,
+    'runtime': None,
+    'speed': 1.0,
+    'startup': 1.0,
+    'cluster': 1.0,
+    'fail': 0.0,
+    'fail_after': 0.0,
+    'error': 'java.io.FileNotFoundException: /data/input.dat (No such file or directory)',
+    'seed': None,
+}
+DEFAULT_RUNTIME = 10
+# milliseconds a Spark micro-batch takes besides its records, and its records without a batch.size
+BATCH_OVERHEAD = 50
+BATCH_SIZE = 1000
+VERSIONS = {'flink': '1.18.1', 'storm': '2.4.0', 'spark': '3.3.1', 'java': '11.0.20'}
+# wall seconds between two updates of a job's counters
+TICK = 0.5
+TOOLS = ('flink', 'start-cluster.sh', 'stop-cluster.sh', 'storm', 'spark-submit', 'yarn', 'java')
+SERIALIZER = 'properties-serializer.jar'
+THREADS_RUNNER = 'org.dspbench.topology.impl.LocalTaskRunner'
+MODULE = 'orchestrator.fake'
+
+
+def state_dir(*parts):
+    path = os.path.join(os.environ.get('DSPBENCH_FAKE_STATE') or os.path.join(tempfile.gettempdir(),
+                                                                               'dspbench-fake'), *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _publish(path, doc):
+    # not properties.atomic_write: these change every tick and need no fsync
+    tmp = '%s.%d.tmp' % (path, os.getpid())
+    with open(tmp, 'w') as f:
+        json.dump(doc, f)
+    os.replace(tmp, path)
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def registered(directory):
+    """The documents of the processes registered in directory, newest last.
+
+    A process that died without saying goodbye (SIGKILL, a crash) is
+    reported as FAILED rather than running forever.
+    """
+    docs = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(directory, name)) as f:
+                doc = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if doc.get('state') in ('CREATED', 'RUNNING') and not _alive(doc['pid']):
+            doc['state'] = 'FAILED'
+            doc['error'] = doc.get('error') or 'process %d is gone' % doc['pid']
+        docs.append(doc)
+    return sorted(docs, key=lambda d: d.get('start', 0))
+
+
+def parse_config(config_str):
+    """The properties of a config string as properties-serializer.jar writes it."""
+    props = {}
+    for pair in config_str.split(','):
+        key, sep, value = pair.partition('=')
+        if sep:
+            props[key.strip()] = value
+    return props
+
+
+def knobs(props):
+    found = {}
+    for name, default in KNOBS.items():
+        value = props.get('fake.' + name, os.environ.get('DSPBENCH_FAKE_' + name.upper()))
+        if value is None or isinstance(default, str):
+            found[name] = default if value is None else value
+        else:
+            found[name] = float(value)
+    return found
+
+
+def operator_name(stage):
+    """wc.splitter -> Splitter, aa.click.parser -> ClickParser."""
+    parts = stage.split('.')[1:] or stage.split('.')
+    return ''.join(p.title().replace('_', '') for p in parts)
+
+
+class Job:
+    """One fake job: operators sized by the *.threads keys of its config."""
+
+    def __init__(self, engine, app, props, path, job_id, name=None):
+        self.engine = engine
+        self.app = app
+        self.props = props
+        self.path = path
+        self.id = job_id
+        self.name = name or app
+        self.knobs = knobs(props)
+        self.random = random.Random(self.knobs['seed'])
+        stages = {}
+        for key, value in props.items():
+            if key.endswith('.threads') and value.strip().isdigit():
+                stages[key[:-len('.threads')]] = max(1, int(value))
+        self.stages = stages or {app + '.sink': 1}
+        bottleneck = min(self.stages.values())
+        self.rate = self.knobs['rate'] * bottleneck ** self.knobs['scaling']
+        # rate-limited sources offer no more than their *.source.rate
+        offered = sum(float(v) for k, v in props.items() if k.endswith('.source.rate') and float(v) > 0)
+        if offered:
+            self.rate = min(self.rate, offered)
+        # Spark with a batch interval: a batch of batch.size records every interval, or right after the last when late
+        self.batch = None
+        interval = next((float(v) for k, v in props.items() if k.endswith('.batch.interval')), 0)
+        if engine == 'spark' and interval > 0:
+            size = next((float(v) for k, v in props.items() if k.endswith('.batch.size')), BATCH_SIZE)
+            busy = BATCH_OVERHEAD + 1000.0 * size / self.rate
+            self.batch = (interval, busy)
+            self.rate = 1000.0 * size / max(interval, busy)
+        runtime = self.knobs['runtime']
+        if runtime is None:
+            runtime = next((v for k, v in props.items() if k.endswith('.runtime_sec')), DEFAULT_RUNTIME)
+        self.runtime = int(float(runtime))
+        self.output = props.get('metrics.output')
+        self.fails = self.random.random() < self.knobs['fail']
+        self.counts = []
+        self.first = None
+        self.start = time.time()
+        self.state = 'CREATED'
+        self.error = None
+        self.stopped = threading.Event()
+
+    def is_source(self, stage):
+        return any(s in stage.split('.')[-1] for s in ('source', 'spout'))
+
+    def is_sink(self, stage):
+        return stage.split('.')[-1] == 'sink'
+
+    def received(self, stage):
+        return 0 if self.is_source(stage) else sum(self.counts)
+
+    def emitted(self, stage):
+        return 0 if self.is_sink(stage) else sum(self.counts)
+
+    def doc(self):
+        return {'id': self.id, 'name': self.name, 'engine': self.engine, 'app': self.app, 'pid': os.getpid(),
+                'state': self.state, 'error': self.error, 'start': self.start, 'end': getattr(self, 'end', None),
+                'operators': [{'name': operator_name(s), 'parallelism': n, 'source': self.is_source(s),
+                               'sink': self.is_sink(s), 'received': self.received(s), 'emitted': self.emitted(s)}
+                              for s, n in sorted(self.stages.items())]}
+
+    def publish(self):
+        _publish(self.path, self.doc())
+
+    def _count(self):
+        return max(0, int(round(self.random.gauss(self.rate, self.rate * self.knobs['jitter']))))
+
+    def run(self, until_stopped=False, on_tick=None):
+        """Count tuples until the runtime is over, or until stopped; returns the final state.
+
+        SIGTERM stops the job like a cancel. A topology that fails stays
+        registered with its error until it is killed.
+        """
+        signal.signal(signal.SIGTERM, lambda *_: self.stopped.set())
+        self.state = 'RUNNING'
+        self.publish()
+        self.stopped.wait(self.knobs['startup'])
+        begin = time.time()
+        self.first = int(begin)
+        while not self.stopped.is_set():
+            elapsed = time.time() - begin
+            due = int(elapsed * self.knobs['speed'])
+            if not until_stopped:
+                due = min(due, self.runtime)
+            while len(self.counts) < due:
+                self.counts.append(self._count())
+            if on_tick is not None:
+                on_tick(self)
+            # a job due to fail does so before it could finish
+            fail_at = self.knobs['fail_after'] if until_stopped else min(self.knobs['fail_after'], self.runtime)
+            if self.fails and len(self.counts) >= fail_at:
+                self.state = 'FAILED'
+                self.error = self.knobs['error']
+                print('Caused by: ' + self.error, flush=True)
+                self.publish()
+                if self.engine == 'storm' and until_stopped:
+                    # Storm restarts the failing worker instead of giving up on the topology
+                    self.stopped.wait()
+                break
+            if not until_stopped and len(self.counts) >= self.runtime:
+                self.state = 'FINISHED'
+                break
+            self.publish()
+            self.stopped.wait(TICK)
+        else:
+            self.state = 'CANCELED'
+        self.end = time.time()
+        if self.engine != 'threads':
+            try:
+                self.write_metrics()
+            except OSError as e:
+                print('java.io.IOException: %s' % e, flush=True)
+                self.state = 'FAILED'
+                self.error = self.error or 'java.io.IOException: %s' % e
+        self.publish()
+        return self.state
+
+    def metrics_enabled(self):
+        return self.output and self.props.get('metrics.enabled', 'false').strip().lower() == 'true'
+
+    def write_metrics(self):
+        """Append every instance's per-second counts like the operators do when they close."""
+        if not self.metrics_enabled():
+            return
+        os.makedirs(self.output, exist_ok=True)
+        only_sink = self.props.get('metrics.onlySink', 'false').strip().lower() == 'true'
+        for stage, instances in sorted(self.stages.items()):
+            sink = self.is_sink(stage)
+            if only_sink and not sink:
+                continue
+            files = []
+            if not self.is_source(stage):
+                files.append('received')
+            if not sink:
+                files.append('emitted')
+            for kind in files:
+                with open(os.path.join(self.output, '%s-%s.csv' % (operator_name(stage), kind)), 'a') as f:
+                    for instance in range(instances):
+                        for second, count in enumerate(self.counts):
+                            share = count // instances + (1 if instance < count % instances else 0)
+                            f.write('%d,%d\n' % (self.first + second, share))
+        if self.batch is not None:
+            self.write_batches()
+
+    def write_batches(self):
+        """batches.csv as the listener of the Spark runner writes it."""
+        interval, busy = self.batch
+        rows = int(self.rate * max(interval, busy) / 1000)
+        path = os.path.join(self.output, 'batches.csv')
+        new = not os.path.exists(path)
+        with open(path, 'a') as f:
+            if new:
+                f.write('query,batch,time,rows,duration\n')
+            elapsed, batch = 0.0, 0
+            while elapsed < 1000 * len(self.counts):
+                duration = max(1, int(self.random.gauss(busy, busy * self.knobs['jitter'])))
+                f.write('%s,%d,%d,%d,%d\n' % (self.id, batch, 1000 * self.first + elapsed, rows, duration))
+                elapsed += max(interval, duration)
+                batch += 1
+
+    def write_counters(self):
+        """The codahale CSV reporter's rows: cumulative counts of every stage so far."""
+        if not self.metrics_enabled() or self.first is None:
+            return
+        os.makedirs(self.output, exist_ok=True)
+        now = self.first + len(self.counts)
+        for stage in self.stages:
+            path = os.path.join(self.output, '%s.tuples-received.csv' % stage.split('.', 1)[-1])
+            new = not os.path.exists(path)
+            with open(path, 'a') as f:
+                if new:
+                    f.write('t,count\n')
+                f.write('%d,%d\n' % (now, self.received(stage)))
+
+
+def _program_args(args):
+    """{--app, --config, ...} of the arguments after the main class or jar."""
+    found = {}
+    for i, arg in enumerate(args):
+        if arg.startswith('-') and i + 1 < len(args):
+            found[arg.lstrip('-')] = args[i + 1]
+    return found
+
+
+def _die(*lines):
+    for line in lines:
+        print(line, flush=True)
+    return 1
+
+
+def _spawn(*args, log=None):
+    """Start a detached `python -m orchestrator.fake` process that outlives its caller."""
+    out = open(log, 'a') if log else subprocess.DEVNULL
+    try:
+        return subprocess.Popen([sys.executable, '-m', MODULE] + list(args), stdin=subprocess.DEVNULL,
+                                stdout=out, stderr=subprocess.STDOUT, start_new_session=True).pid
+    finally:
+        if log:
+            out.close()
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    """Dispatches to routes: [(method, regex, function(match, query) -> (status, body))]."""
+
+    routes = []
+
+    def _dispatch(self, method):
+        url = urllib.parse.urlsplit(self.path)
+        query = dict(urllib.parse.parse_qsl(url.query))
+        for route_method, pattern, fn in self.routes:
+            m = re.fullmatch(pattern, url.path)
+            if route_method == method and m:
+                status, body = fn(m, query)
+                break
+        else:
+            status, body = 404, {'errors': ['Not found: %s' % url.path]}
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PATCH(self):
+        self._dispatch('PATCH')
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_routes(port, routes):
+    """Serve routes on port from a daemon thread; returns the server."""
+    handler = type('Handler', (_Handler,), {'routes': routes})
+    server = http.server.ThreadingHTTPServer(('', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _find(docs, key, value):
+    return next((d for d in docs if d.get(key) == value), None)
+
+
+def _terminate(doc, delay=0):
+    if doc.get('state') in ('CREATED', 'RUNNING') or doc['engine'] == 'storm':
+        if delay:
+            threading.Timer(delay, _terminate, (doc,)).start()
+            return
+        try:
+            os.kill(doc['pid'], signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+
+# Flink
+
+def conf_dir():
+    return os.environ.get('FLINK_CONF_DIR') or os.path.join(os.environ['FLINK_HOME'], 'conf')
+
+
+def read_flink_conf(directory):
+    conf = {}
+    for name in ('flink-conf.yaml', 'config.yaml'):
+        path = os.path.join(directory, name)
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    m = re.match(r'^([\w.\-]+)\s*:\s*(.*?)\s*$', line)
+                    if m:
+                        conf[m.group(1)] = m.group(2)
+            break
+    return conf
+
+
+def workers(directory):
+    path = os.path.join(directory, 'workers')
+    if not os.path.exists(path):
+        return ['localhost']
+    with open(path) as f:
+        return [l.strip() for l in f if l.strip() and not l.lstrip().startswith('#')] or ['localhost']
+
+
+def rest_port(directory):
+    conf = read_flink_conf(directory)
+    return int(conf.get('rest.bind-port') or conf.get('rest.port') or 8081)
+
+
+def flink_routes(port):
+    """The part of the JobManager REST API the orchestrator uses, for the cluster on port."""
+    tms_dir = state_dir('flink', str(port), 'taskmanagers')
+    jobs_dir = state_dir('flink', str(port), 'jobs')
+
+    def jobs():
+        return registered(jobs_dir)
+
+    def vertex_id(jid, name):
+        return hashlib.md5((jid + name).encode()).hexdigest()
+
+    def overview(m, query):
+        tms = [d for d in registered(tms_dir) if d['state'] == 'RUNNING']
+        running = [j for j in jobs() if j['state'] == 'RUNNING']
+        total = sum(d['slots'] for d in tms)
+        used = sum(max(o['parallelism'] for o in j['operators']) for j in running)
+        return 200, {'taskmanagers': len(tms), 'slots-total': total, 'slots-available': max(0, total - used),
+                     'jobs-running': len(running), 'flink-version': VERSIONS['flink'],
+                     'jobs-finished': sum(1 for j in jobs() if j['state'] == 'FINISHED'),
+                     'jobs-cancelled': sum(1 for j in jobs() if j['state'] == 'CANCELED'),
+                     'jobs-failed': sum(1 for j in jobs() if j['state'] == 'FAILED')}
+
+    def overview_jobs(m, query):
+        return 200, {'jobs': [{'jid': j['id'], 'name': j['name'], 'state': j['state'],
+                               'start-time': int(j['start'] * 1000)} for j in jobs()]}
+
+    def job(m, query):
+        found = _find(jobs(), 'id', m.group(1))
+        if found is None:
+            return 404, {'errors': ['Job %s not found' % m.group(1)]}
+        return 200, {'jid': found['id'], 'name': found['name'], 'state': found['state'],
+                     'start-time': int(found['start'] * 1000),
+                     'vertices': [{'id': vertex_id(found['id'], o['name']), 'name': o['name'],
+                                   'parallelism': o['parallelism'], 'status': found['state']}
+                                  for o in found['operators']]}
+
+    def exceptions(m, query):
+        found = _find(jobs(), 'id', m.group(1))
+        if found is None:
+            return 404, {'errors': ['Job %s not found' % m.group(1)]}
+        return 200, {'root-exception': found.get('error'), 'all-exceptions': []}
+
+    def metrics(m, query):
+        found = _find(jobs(), 'id', m.group(1))
+        operator = found and next((o for o in found['operators'] if vertex_id(found['id'], o['name']) == m.group(2)),
+                                  None)
+        if operator is None:
+            return 404, {'errors': ['Vertex %s not found' % m.group(2)]}
+        values = {'numRecordsIn': operator['received'], 'numRecordsOut': operator['emitted'],
+                  operator['name'] + '.numRecordsIn': operator['received'],
+                  operator['name'] + '.numRecordsOut': operator['emitted']}
+        if 'get' not in query:
+            return 200, [{'id': name} for name in values]
+        names = [n for n in query['get'].split(',') if n in values]
+        return 200, [{'id': n, 'min': values[n] // operator['parallelism'], 'max': values[n],
+                      'avg': values[n] / operator['parallelism'], 'sum': values[n]} for n in names]
+
+    def cancel(m, query):
+        found = _find(jobs(), 'id', m.group(1))
+        if found is None:
+            return 404, {'errors': ['Job %s not found' % m.group(1)]}
+        _terminate(found)
+        return 202, {}
+
+    return [('GET', r'/overview', overview),
+            ('GET', r'/jobs/overview', overview_jobs),
+            ('GET', r'/jobs/([0-9a-f]{32})', job),
+            ('GET', r'/jobs/([0-9a-f]{32})/exceptions', exceptions),
+            ('GET', r'/jobs/([0-9a-f]{32})/vertices/([0-9a-f]{32})/subtasks/metrics', metrics),
+            ('PATCH', r'/jobs/([0-9a-f]{32})', cancel)]
+
+
+def _daemon(register=None):
+    """Sleep until SIGTERM, registered as a TaskManager while register is given."""
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    if register is not None:
+        path, doc = register
+        _publish(path, doc)
+    stop.wait()
+    if register is not None:
+        os.remove(register[0])
+
+
+def jobmanager(args):
+    directory = args[args.index('--configDir') + 1]
+    time.sleep(knobs({})['cluster'])
+    port = rest_port(directory)
+    serve_routes(port, flink_routes(port))
+    print('Rest endpoint listening at localhost:%d' % port, flush=True)
+    _daemon()
+    return 0
+
+
+def taskmanager(args):
+    directory = args[args.index('--configDir') + 1]
+    time.sleep(knobs({})['cluster'])
+    conf = read_flink_conf(directory)
+    path = os.path.join(state_dir('flink', str(rest_port(directory)), 'taskmanagers'), '%d.json' % os.getpid())
+    _daemon((path, {'pid': os.getpid(), 'state': 'RUNNING', 'start': time.time(), 'engine': 'flink',
+                    'slots': int(conf.get('taskmanager.numberOfTaskSlots', 1))}))
+    return 0
+
+
+def start_cluster(args):
+    directory = conf_dir()
+    conf = read_flink_conf(directory)
+    log_dir = conf.get('env.log.dir') or os.path.join(os.environ['FLINK_HOME'], 'log')
+    os.makedirs(log_dir, exist_ok=True)
+    host = socket.gethostname()
+    print('Starting cluster.')
+    print('Starting standalonesession daemon on host %s.' % host)
+    _spawn('jobmanager', flink.JOBMANAGER_CLASS, '--configDir', directory,
+           log=os.path.join(log_dir, 'flink-standalonesession-%s.log' % host))
+    for _ in workers(directory):
+        print('Starting taskexecutor daemon on host %s.' % host)
+        _spawn('taskmanager', flink.TASKMANAGER_CLASS, '--configDir', directory,
+               log=os.path.join(log_dir, 'flink-taskexecutor-%s.log' % host))
+    return 0
+
+
+def stop_cluster(args):
+    directory = conf_dir()
+    found = flink.cluster_processes(directory)
+    if not found:
+        print('No taskexecutor daemon to stop on host %s.' % socket.gethostname())
+        print('No standalonesession daemon to stop on host %s.' % socket.gethostname())
+    for pid, line in sorted(found.items()):
+        role = 'taskexecutor' if flink.TASKMANAGER_CLASS in line else 'standalonesession'
+        print('Stopping %s daemon (pid: %d) on host %s.' % (role, pid, socket.gethostname()))
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+    for job in registered(state_dir('flink', str(rest_port(directory)), 'jobs')):
+        _terminate(job)
+    return 0
+
+
+def flink_run(args):
+    """`flink run [-m host:port] [-c class] jar program-args`, attached."""
+    if not args or args[0] != 'run':
+        if args and args[0] in ('-v', '--version'):
+            print('Version: %s, Commit ID: fake' % VERSIONS['flink'])
+            return 0
+        return _die('"%s" is not a valid action.' % (args[0] if args else ''))
+    opts = _program_args(args[1:])
+    url = 'http://%s' % opts['m'] if 'm' in opts else 'http://localhost:%d' % rest_port(conf_dir())
+    props = parse_config(opts.get('config', ''))
+    jobs_dir = state_dir('flink', str(urllib.parse.urlsplit(url).port), 'jobs')
+    client = flink.RestClient(url)
+    overview = client.overview()
+    if overview is None:
+        return _die('org.apache.flink.client.program.ProgramInvocationException: Could not submit job',
+                    'Caused by: java.net.ConnectException: Connection refused: %s' % url[len('http://'):])
+    jid = uuid.uuid4().hex
+    job = Job('flink', opts.get('app', 'job'), props, os.path.join(jobs_dir, jid + '.json'), jid)
+    needed = max(job.stages.values())
+    if overview.get('slots-available', 0) < needed:
+        return _die('org.apache.flink.client.program.ProgramInvocationException: The main method caused an error',
+                    'Caused by: org.apache.flink.runtime.jobmanager.scheduler.NoResourceAvailableException: '
+                    'Could not acquire the minimum required resources (%d slots, %d available).'
+                    % (needed, overview.get('slots-available', 0)))
+    print('Job has been submitted with JobID %s' % jid, flush=True)
+    state = job.run()
+    if state == 'FINISHED':
+        print('Program execution finished')
+        print('Job with JobID %s has finished.' % jid)
+        print('Job Runtime: %d ms' % ((job.end - job.start) * 1000))
+        return 0
+    print('------------------------------------------------------------')
+    print(' The program finished with the following exception:')
+    print()
+    print('org.apache.flink.client.program.ProgramInvocationException: The main method caused an error: '
+          'org.apache.flink.client.program.ProgramInvocationException: Job failed (JobID: %s)' % jid)
+    if state == 'CANCELED':
+        print('Caused by: org.apache.flink.runtime.client.JobCancellationException: Job was cancelled.')
+    else:
+        print('Caused by: ' + job.error)
+    return 1
+
+
+# Storm
+
+def topologies():
+    return [t for t in registered(state_dir('storm')) if t['state'] != 'CANCELED']
+
+
+def storm_routes():
+    def summary(m, query):
+        return 200, {'topologies': [{'id': t['id'], 'name': t['name'], 'status': 'ACTIVE',
+                                     'uptimeSeconds': int(time.time() - t['start']),
+                                     'tasksTotal': sum(o['parallelism'] for o in t['operators']),
+                                     'workersTotal': 1} for t in topologies()]}
+
+    def topology(m, query):
+        found = _find(topologies(), 'id', m.group(1))
+        if found is None:
+            return 500, {'error': 'NotAliveException', 'errorMessage': '%s is not alive' % m.group(1)}
+        error = found.get('error') or ''
+        spouts = [o for o in found['operators'] if o['source']]
+        bolts = [o for o in found['operators'] if not o['source']]
+        emitted = sum(o['emitted'] for o in found['operators'])
+        acked = sum(o['received'] for o in bolts if o['sink'])
+        return 200, {'id': found['id'], 'name': found['name'], 'status': 'ACTIVE',
+                     'topologyStats': [{'window': ':all-time', 'emitted': emitted, 'acked': acked}],
+                     'spouts': [{'spoutId': o['name'], 'emitted': o['emitted'], 'lastError': error} for o in spouts],
+                     'bolts': [{'boltId': o['name'], 'executed': o['received'], 'emitted': o['emitted'],
+                                'lastError': error} for o in bolts]}
+
+    def kill(m, query):
+        found = _find(topologies(), 'id', m.group(1))
+        if found is None:
+            return 500, {'error': 'NotAliveException', 'errorMessage': '%s is not alive' % m.group(1)}
+        _terminate(found, int(m.group(2)))
+        return 200, {'topologyOperation': 'kill', 'topologyId': found['id'], 'status': 'success'}
+
+    return [('GET', r'/api/v1/topology/summary', summary),
+            ('GET', r'/api/v1/topology/([^/]+)', topology),
+            ('POST', r'/api/v1/topology/([^/]+)/kill/(\d+)', kill)]
+
+
+def topology(args):
+    """The worker of a submitted topology: runs until killed, then leaves the listing."""
+    topology_id, name, app, config_str = args
+    path = os.path.join(state_dir('storm'), topology_id + '.json')
+    job = Job('storm', app, parse_config(config_str), path, topology_id, name)
+    job.run(until_stopped=True)
+    os.remove(path)
+    return 0
+
+
+def storm_cmd(args):
+    command = args[0] if args else ''
+    if command == 'version':
+        print('Storm %s' % VERSIONS['storm'])
+        return 0
+    if command in ('list', 'kill'):
+        try:
+            storm.UiClient(os.environ.get('DSPBENCH_FAKE_STORM_UI', storm.DEFAULT_URL)).topologies()
+        except UNAVAILABLE:
+            return _die('org.apache.storm.thrift.transport.TTransportException: java.net.ConnectException: '
+                        'Connection refused')
+    if command == 'list':
+        print('%-32s %-10s %-10s %-12s %-10s' % ('Topology_name', 'Status', 'Num_tasks', 'Num_workers',
+                                                  'Uptime_secs'))
+        print('-' * 78)
+        for t in topologies():
+            print('%-32s %-10s %-10d %-12d %-10d' % (t['name'], 'ACTIVE', sum(o['parallelism'] for o in t['operators']),
+                                                     1, time.time() - t['start']))
+        return 0
+    if command == 'kill':
+        wait = int(args[args.index('-w') + 1]) if '-w' in args else 30
+        found = _find(topologies(), 'name', args[1] if len(args) > 1 else None)
+        if found is None:
+            return _die('org.apache.storm.generated.NotAliveException: %s' % (args[1:2] or [''])[0])
+        _terminate(found, wait)
+        print('Killed topology: %s' % found['name'])
+        return 0
+    if command == 'jar':
+        opts = _program_args(args[3:])
+        if opts.get('mode') == 'local':
+            return local_job('storm', opts['app'], opts.get('config-str', ''), opts.get('runtime'))
+        try:
+            storm.UiClient(os.environ.get('DSPBENCH_FAKE_STORM_UI', storm.DEFAULT_URL)).topologies()
+        except UNAVAILABLE:
+            return _die('org.apache.storm.thrift.transport.TTransportException: java.net.ConnectException: '
+                        'Connection refused')
+        # StormRunner's own name unless given one
+        name = opts.get('topology-name') or '%s-%d' % (opts.get('app', 'topology'), random.randint(0, 2 ** 31))
+        if _find(topologies(), 'name', name):
+            return _die('org.apache.storm.generated.AlreadyAliveException: Topology with name `%s` already exists '
+                        'on cluster' % name)
+        topology_id = '%s-%d-%d' % (name, len(os.listdir(state_dir('storm'))) + 1, time.time())
+        _spawn('topology', topology_id, name, opts['app'], opts.get('config-str', ''))
+        path = os.path.join(state_dir('storm'), topology_id + '.json')
+        while not os.path.exists(path):
+            time.sleep(0.05)
+        print('Finished submitting topology: %s' % name)
+        return 0
+    return _die('Unknown command: [storm %s]' % command)
+
+
+# Spark on YARN
+
+def applications():
+    return registered(state_dir('yarn'))
+
+
+YARN_STATES = {'CREATED': ('ACCEPTED', 'UNDEFINED'), 'RUNNING': ('RUNNING', 'UNDEFINED'),
+               'FINISHED': ('FINISHED', 'SUCCEEDED'), 'FAILED': ('FAILED', 'FAILED'),
+               'CANCELED': ('KILLED', 'KILLED')}
+
+
+def yarn_routes():
+    started = int(time.time() * 1000)
+
+    def info(m, query):
+        return 200, {'clusterInfo': {'state': 'STARTED', 'startedOn': started, 'resourceManagerVersion': '3.3.4'}}
+
+    def app(m, query):
+        found = _find(applications(), 'id', m.group(1))
+        if found is None:
+            return 404, {'RemoteException': {'message': 'app with id: %s not found' % m.group(1)}}
+        state, final = YARN_STATES[found['state']]
+        return 200, {'app': {'id': found['id'], 'name': found['name'], 'state': state, 'finalStatus': final,
+                             'diagnostics': 'User class threw exception: ' + found['error']
+                             if found.get('error') else ''}}
+
+    def stages(m, query):
+        found = _find(applications(), 'id', m.group(1))
+        if found is None or found['state'] != 'RUNNING':
+            return 404, {'message': 'no such app: %s' % m.group(1)}
+        return 200, [{'stageId': i, 'name': o['name'], 'status': 'ACTIVE', 'numTasks': o['parallelism'],
+                      'inputRecords': o['received'], 'outputRecords': o['emitted']}
+                     for i, o in enumerate(found['operators'])]
+
+    return [('GET', r'/ws/v1/cluster/info', info),
+            ('GET', r'/ws/v1/cluster/apps/([\w]+)', app),
+            ('GET', r'/proxy/([\w]+)/api/v1/applications/[\w]+/stages', stages)]
+
+
+def spark_submit(args):
+    if '--version' in args:
+        print('Welcome to Spark version %s' % VERSIONS['spark'])
+        return 0
+    i = 0
+    opts = {}
+    conf = {}
+    while i < len(args) and args[i].startswith('--'):
+        if args[i] == '--conf':
+            key, _, value = args[i + 1].partition('=')
+            conf[key] = value
+        else:
+            opts[args[i][2:]] = args[i + 1]
+        i += 2
+    program = _program_args(args[i + 1:])
+    master = opts.get('master', 'local[*]')
+    if master.startswith('local'):
+        return local_job('spark', program.get('a', 'app'), program.get('config', ''),
+                         ui_port=int(conf.get('spark.ui.port', spark.UI_PORT_BASE)))
+    yarn = spark.YarnClient(os.environ.get('DSPBENCH_FAKE_YARN', spark.DEFAULT_RM))
+    try:
+        cluster = yarn.get('/ws/v1/cluster/info')
+    except UNAVAILABLE:
+        return _die('java.net.ConnectException: Call From %s to 0.0.0.0:8032 failed on connection exception: '
+                    'java.net.ConnectException: Connection refused' % socket.gethostname())
+    app_id = 'application_%d_%04d' % (cluster.get('clusterInfo', {}).get('startedOn', 1700000000000) // 1000,
+                                      len(os.listdir(state_dir('yarn'))) + 1)
+    job = Job('spark', program.get('a', 'app'), parse_config(program.get('config', '')),
+              os.path.join(state_dir('yarn'), app_id + '.json'), app_id)
+    print('INFO Client: Submitted application %s' % app_id, flush=True)
+    print('INFO Client: Application report for %s (state: RUNNING)' % app_id, flush=True)
+    state = job.run()
+    print('INFO Client: Application report for %s (state: %s)' % (app_id, YARN_STATES[state][0]))
+    if state == 'FINISHED':
+        return 0
+    if job.error:
+        print('diagnostics: User class threw exception: ' + job.error)
+    print('Exception in thread "main" org.apache.spark.SparkException: Application %s finished with failed status'
+          % app_id)
+    return 1
+
+
+def yarn_cmd(args):
+    if args[:2] != ['application', '-kill'] or len(args) < 3:
+        return _die('Usage: yarn application -kill <Application ID>')
+    found = _find(applications(), 'id', args[2])
+    if found is None:
+        return _die("Application with id '%s' doesn't exist in RM." % args[2])
+    print('Killing application %s' % args[2])
+    _terminate(found)
+    return 0
+
+
+# java
+
+def spark_ui_routes(job):
+    """The part of the Spark UI REST API of a local driver the orchestrator uses."""
+    def applications(m, query):
+        return 200, [{'id': job.id, 'name': job.app}]
+
+    def stages(m, query):
+        if m.group(1) != job.id:
+            return 404, {'message': 'no such app: %s' % m.group(1)}
+        return 200, [{'stageId': i, 'name': o['name'], 'status': 'ACTIVE', 'numTasks': o['parallelism'],
+                      'inputRecords': o['received'], 'outputRecords': o['emitted']}
+                     for i, o in enumerate(job.doc()['operators'])]
+
+    return [('GET', r'/api/v1/applications', applications),
+            ('GET', r'/api/v1/applications/([\w-]+)/stages', stages)]
+
+
+def local_job(engine, app, config_str, runtime=None, ui_port=None):
+    """A job run in the foreground: Storm local mode, Spark local[N] or the threads engine.
+
+    A Spark driver serves its UI on ui_port while it runs.
+    """
+    props = parse_config(config_str)
+    if runtime is not None:
+        props.setdefault('fake.runtime', runtime)
+    job_id = '%s-%d' % (app, os.getpid())
+    job = Job(engine, app, props, os.path.join(state_dir('local'), job_id + '.json'), job_id)
+    if ui_port is not None:
+        serve_routes(ui_port, spark_ui_routes(job))
+    print('Running %s locally' % app, flush=True)
+    if engine == 'threads':
+        state = job.run(until_stopped=True, on_tick=Job.write_counters)
+    else:
+        state = job.run(until_stopped=engine == 'storm' and runtime is None)
+    return 0 if state in ('FINISHED', 'CANCELED') and not job.error else 1
+
+
+def java(args):
+    if args[:1] in (['-version'], ['--version']):
+        print('openjdk version "%s"' % VERSIONS['java'], file=sys.stderr)
+        return 0
+    i = 0
+    while i < len(args) and args[i].startswith('-') and args[i] not in ('-jar', '-cp', '-classpath'):
+        i += 1
+    if args[i:i + 1] == ['-jar']:
+        if not args[i + 1].endswith(SERIALIZER):
+            return _die('no main manifest attribute, in %s' % args[i + 1])
+        print(properties.serialize(args[i + 2]))
+        return 0
+    main_class, program = args[i + 2], args[i + 3:]
+    if main_class == storm.RUNNER_CLASS:
+        opts = _program_args(program)
+        return local_job('storm', opts['app'], opts.get('config-str', ''), opts.get('runtime'))
+    if main_class == THREADS_RUNNER:
+        opts = _program_args(program)
+        return local_job('threads', opts.get('name', 'task'), opts.get('config', ''))
+    return _die('Error: Could not find or load main class %s' % main_class)
+
+
+# setup
+
+WRAPPER = '''#!/bin/sh
+# fake %(tool)s, written by `dspbench fake-engines`
+export FLINK_HOME="%(flink_home)s"
+PYTHONPATH="%(path)s${PYTHONPATH:+:$PYTHONPATH}" exec "%(python)s" -m %(module)s %(tool)s "$@"
+'''
+FLINK_CONF = '''jobmanager.rpc.address: localhost
+jobmanager.rpc.port: 6123
+rest.port: 8081
+taskmanager.numberOfTaskSlots: %d
+parallelism.default: 1
+'''
+
+
+def install(directory, slots=4):
+    """Write the fake commands into directory; returns the lines to put them in use."""
+    directory = os.path.abspath(directory)
+    flink_home = os.path.join(directory, 'flink')
+    for sub in ('bin', os.path.join('flink', 'bin'), os.path.join('flink', 'conf'),
+                os.path.join('flink', 'lib'), os.path.join('flink', 'log')):
+        os.makedirs(os.path.join(directory, sub), exist_ok=True)
+    for tool in TOOLS:
+        bin_dir = os.path.join(flink_home if tool in ('flink', 'start-cluster.sh', 'stop-cluster.sh') else directory,
+                               'bin')
+        path = os.path.join(bin_dir, tool)
+        with open(path, 'w') as f:
+            f.write(WRAPPER % {'tool': tool, 'module': MODULE, 'flink_home': flink_home,
+                               'path': os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               'python': sys.executable})
+        os.chmod(path, 0o755)
+    with open(os.path.join(flink_home, 'conf', 'flink-conf.yaml'), 'w') as f:
+        f.write(FLINK_CONF % slots)
+    with open(os.path.join(flink_home, 'conf', 'workers'), 'w') as f:
+        f.write('localhost\n')
+    # what flink.version() and properties.java_release() look at
+    open(os.path.join(flink_home, 'lib', 'flink-dist-%s.jar' % VERSIONS['flink']), 'w').close()
+    with open(os.path.join(directory, 'release'), 'w') as f:
+        f.write('JAVA_VERSION="%s"\n' % VERSIONS['java'])
+    return ['export PATH=%s:$PATH' % os.path.join(directory, 'bin'),
+            'export FLINK_HOME=%s' % flink_home]
+
+
+def serve(storm_ui=storm.DEFAULT_URL, yarn_url=spark.DEFAULT_RM):
+    """Serve the Storm UI and YARN ResourceManager APIs until interrupted."""
+    servers = [serve_routes(urllib.parse.urlsplit(storm_ui).port, storm_routes()),
+               serve_routes(urllib.parse.urlsplit(yarn_url).port, yarn_routes())]
+    print('fake Storm UI on %s, YARN ResourceManager on %s, state in %s' % (storm_ui, yarn_url, state_dir()),
+          flush=True)
+    try:
+        threading.Event().wait()
+    finally:
+        for server in servers:
+            server.shutdown()
+
+
+COMMANDS = {
+    'flink': flink_run,
+    'start-cluster.sh': start_cluster,
+    'stop-cluster.sh': stop_cluster,
+    'jobmanager': jobmanager,
+    'taskmanager': taskmanager,
+    'storm': storm_cmd,
+    'topology': topology,
+    'spark-submit': spark_submit,
+    'yarn': yarn_cmd,
+    'java': java,
+}
+
+
+def main(argv):
+    if not argv or argv[0] not in COMMANDS:
+        print('usage: python -m orchestrator.fake {%s} ...' % ','.join(COMMANDS), file=sys.stderr)
+        return 2
+    return COMMANDS[argv[0]](argv[1:])
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
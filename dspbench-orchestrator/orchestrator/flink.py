@@ -0,0 +1,292 @@
+"""Flink standalone cluster control through the JobManager REST API."""
+import glob
+import os
+import re
+import shutil
+import subprocess
+import urllib.error
+import urllib.parse
+
+from . import procs, properties
+from .rest import UNAVAILABLE, JsonClient
+from .wait import WaitTimeout, poll
+
+DEFAULT_URL = 'http://localhost:8081'
+JOBMANAGER_CLASS = 'org.apache.flink.runtime.entrypoint.StandaloneSessionClusterEntrypoint'
+TASKMANAGER_CLASS = 'org.apache.flink.runtime.taskexecutor.TaskManagerRunner'
+TERMINAL_STATES = ('FINISHED', 'CANCELED', 'FAILED', 'SUSPENDED')
+# printed by `flink run` once the job is accepted
+JOB_ID = re.compile(r'Job has been submitted with JobID ([0-9a-f]{32})')
+
+
+class ClusterError(RuntimeError):
+    pass
+
+
+class RestClient(JsonClient):
+    def __init__(self, url=DEFAULT_URL, timeout=2.0):
+        super().__init__(url, timeout)
+
+    def jobs(self):
+        return self.get('/jobs/overview').get('jobs', [])
+
+    def job(self, jid):
+        return self.get('/jobs/%s' % jid)
+
+    def root_exception(self, jid):
+        """The first line of the exception that failed a job, or None."""
+        text = self.get('/jobs/%s/exceptions' % jid).get('root-exception')
+        return text.strip().splitlines()[0] if text else None
+
+    def records_in(self, jid, job):
+        """Records received by all operators of a job so far, chained ones included."""
+        total = 0
+        for vertex in job.get('vertices', []):
+            path = '/jobs/%s/vertices/%s/subtasks/metrics' % (jid, vertex['id'])
+            names = [m['id'] for m in self.get(path) if m['id'].endswith('.numRecordsIn')]
+            if names:
+                values = self.get('%s?agg=sum&get=%s' % (path, urllib.parse.quote(','.join(names))))
+                total += sum(int(float(m.get('sum') or 0)) for m in values)
+        return total
+
+    def cancel(self, jid):
+        return self.request('PATCH', '/jobs/%s?mode=cancel' % jid)
+
+    def overview(self):
+        """The /overview document, or None while the REST endpoint is down."""
+        try:
+            return self.get('/overview')
+        except UNAVAILABLE:
+            return None
+
+
+def cluster_processes(conf_dir=None):
+    """Flink daemons on this host, optionally only those of one conf dir."""
+    found = procs.find(JOBMANAGER_CLASS, TASKMANAGER_CLASS)
+    if conf_dir is None:
+        return found
+    return {pid: line for pid, line in found.items() if '--configDir %s' % conf_dir in line}
+
+
+def read_conf(flink_home):
+    """Flat key: value pairs of conf/flink-conf.yaml."""
+    conf = {}
+    for name in ('flink-conf.yaml', 'config.yaml'):
+        path = os.path.join(flink_home, 'conf', name)
+        if not os.path.exists(path):
+            continue
+        with open(path) as f:
+            for line in f:
+                m = re.match(r'^([\w.\-]+)\s*:\s*(.*?)\s*$', line)
+                if m:
+                    conf[m.group(1)] = m.group(2)
+        break
+    return conf
+
+
+def workers(flink_home):
+    path = os.path.join(flink_home, 'conf', 'workers')
+    if not os.path.exists(path):
+        return ['localhost']
+    with open(path) as f:
+        return [l.strip() for l in f if l.strip() and not l.lstrip().startswith('#')] or ['localhost']
+
+
+def cluster_settings(flink_home):
+    """The settings that only take effect on a cluster restart.
+
+    Slot count, worker list, memory sizes and JVM options; a job submitted
+    to a running cluster can change everything else.
+    """
+    conf = read_conf(flink_home)
+    settings = {k: v for k, v in conf.items()
+                if k.startswith(('env.java.opts', 'taskmanager.', 'jobmanager.'))}
+    settings['workers'] = workers(flink_home)
+    return settings
+
+
+def version(flink_home):
+    """The Flink version of an installation, from the name of its flink-dist jar."""
+    for path in glob.glob(os.path.join(flink_home, 'lib', 'flink-dist*.jar')):
+        m = re.search(r'-(\d[\w.\-]*)\.jar$', os.path.basename(path))
+        if m:
+            return m.group(1)
+    return None
+
+
+def expected_slots(flink_home):
+    """Slots a full cluster offers: numberOfTaskSlots times the workers listed."""
+    slots = int(read_conf(flink_home).get('taskmanager.numberOfTaskSlots', 1))
+    return slots * len(workers(flink_home))
+
+
+def probe(client, record):
+    """(records received so far, error) of the job a run submitted, for the watchdog."""
+    jid = record['ids'].get('job_id')
+    if jid is None:
+        return None, None
+    try:
+        job = client.job(jid)
+        if job.get('state') in ('FAILING', 'FAILED'):
+            return None, client.root_exception(jid) or 'job %s failed' % jid
+        if job.get('state') != 'RUNNING':
+            return None, None
+        return client.records_in(jid, job), None
+    except UNAVAILABLE:
+        return None, None
+
+
+def wait_until_stopped(client, timeout=60, interval=0.5, check_processes=True, conf_dir=None):
+    """Block until no Flink JVM is left and the REST endpoint stops answering."""
+    def check():
+        left = cluster_processes(conf_dir) if check_processes else {}
+        up = client.overview() is not None
+        return not left and not up, {'processes': sorted(left), 'rest_up': up}
+    try:
+        poll(check, timeout, interval, 'Flink cluster to stop')
+    except WaitTimeout as e:
+        raise ClusterError(str(e)) from None
+
+
+def wait_until_ready(client, slots, timeout=120, interval=0.5, check_processes=True, conf_dir=None):
+    """Block until the cluster has registered TaskManagers offering slots free slots.
+
+    Fails early if the JobManager or every TaskManager process disappears
+    while waiting, which is what a crash at startup looks like.
+    """
+    seen = {'jm': False, 'tm': False}
+
+    def check():
+        if check_processes:
+            lines = cluster_processes(conf_dir).values()
+            jm = any(JOBMANAGER_CLASS in l for l in lines)
+            tm = any(TASKMANAGER_CLASS in l for l in lines)
+            for role, alive in (('jm', jm), ('tm', tm)):
+                if seen[role] and not alive:
+                    raise ClusterError('%s process exited while waiting for the cluster'
+                                       % ('JobManager' if role == 'jm' else 'TaskManager'))
+                seen[role] = seen[role] or alive
+        overview = client.overview()
+        if overview is None:
+            return False, 'REST endpoint %s not answering' % client.url
+        state = {k: overview.get(k) for k in ('taskmanagers', 'slots-total', 'slots-available')}
+        return overview.get('taskmanagers', 0) > 0 and overview.get('slots-available', 0) >= slots, state
+    try:
+        poll(check, timeout, interval, '%d free slots' % slots)
+    except WaitTimeout as e:
+        raise ClusterError(str(e)) from None
+
+
+def release(client, slots, timeout=60, interval=0.5):
+    """Cancel leftover jobs and wait until the cluster can take the next one.
+
+    Used between runs when the cluster is reused: no job may be left in a
+    non-terminal state and all slots must be free again. Requests the
+    JobManager answers with an error are tried again on the next check; an
+    unreachable JobManager, or a cluster that is not released within
+    timeout seconds, raises ClusterError.
+    """
+    cancelled = set()
+
+    def check():
+        try:
+            active = [j for j in client.jobs() if j.get('state') not in TERMINAL_STATES]
+        except urllib.error.HTTPError as e:
+            # the JobManager answers, but a job finishing mid-request can fail it
+            return False, 'listing jobs failed: %s' % e
+        except UNAVAILABLE as e:
+            raise ClusterError('JobManager at %s not reachable: %s' % (client.url, e)) from None
+        for job in active:
+            if job['jid'] not in cancelled and job.get('state') != 'CANCELLING':
+                try:
+                    client.cancel(job['jid'])
+                except UNAVAILABLE as e:
+                    # the job may have finished since; the next check tells
+                    print("cannot cancel job %s yet: %s" % (job['jid'], e))
+                    continue
+                cancelled.add(job['jid'])
+        overview = client.overview() or {}
+        free = overview.get('slots-available', 0)
+        state = {'active_jobs': ['%s %s' % (j['jid'], j.get('state')) for j in active],
+                 'slots-available': free}
+        return not active and free >= slots, state
+    try:
+        poll(check, timeout, interval, 'jobs to finish and %d slots to be freed' % slots)
+    except WaitTimeout as e:
+        raise ClusterError(str(e)) from None
+
+
+def write_conf(src_dir, dst_dir, overrides):
+    """Copy a Flink conf dir, replacing or adding the given flink-conf.yaml keys."""
+    if os.path.exists(dst_dir):
+        shutil.rmtree(dst_dir)
+    shutil.copytree(src_dir, dst_dir)
+    path = os.path.join(dst_dir, 'flink-conf.yaml')
+    lines = []
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f.read().splitlines():
+                m = re.match(r'^([\w.\-]+)\s*:', line)
+                if m is None or m.group(1) not in overrides:
+                    lines.append(line)
+    lines.extend('%s: %s' % (k, v) for k, v in overrides.items())
+    properties.atomic_write(path, '\n'.join(lines) + '\n')
+
+
+class LocalCluster:
+    """A private standalone cluster for one run of a parallel sweep.
+
+    It has its own conf dir, ports, pid and log dirs, so several can run
+    side by side on one host and stop-cluster.sh only stops this one. All
+    of its JVMs inherit the CPU affinity of the slot.
+    """
+
+    PORT_BASE = 18000
+    PORT_STRIDE = 10
+
+    def __init__(self, flink_home, workdir, slot, slots, env=None):
+        self.flink_home = flink_home
+        self.workdir = workdir
+        self.slot = slot
+        self.slots = slots
+        # environment variables the cluster's JVMs get besides the driver's own
+        self.extra_env = env or {}
+        self.conf_dir = os.path.join(workdir, 'flink-conf')
+        port = self.PORT_BASE + slot.index * self.PORT_STRIDE
+        self.rest_port = port + 1
+        self.overrides = {
+            'rest.port': self.rest_port,
+            'rest.bind-port': self.rest_port,
+            'jobmanager.rpc.port': port + 2,
+            'blob.server.port': port + 3,
+            'taskmanager.numberOfTaskSlots': slots,
+            'env.pid.dir': workdir,
+            'env.log.dir': os.path.join(workdir, 'log'),
+            'io.tmp.dirs': os.path.join(workdir, 'tmp'),
+        }
+        self.client = RestClient('http://localhost:%d' % self.rest_port)
+
+    def env(self):
+        env = dict(os.environ, **self.extra_env)
+        env['FLINK_CONF_DIR'] = self.conf_dir
+        return env
+
+    def start(self, timeout=120):
+        for d in ('log', 'tmp'):
+            os.makedirs(os.path.join(self.workdir, d), exist_ok=True)
+        write_conf(os.path.join(self.flink_home, 'conf'), self.conf_dir, self.overrides)
+        with open(os.path.join(self.conf_dir, 'workers'), 'w') as f:
+            f.write('localhost\n')
+        subprocess.run(self.slot.taskset() + [os.path.join(self.flink_home, 'bin', 'start-cluster.sh')],
+                       env=self.env(), check=True)
+        wait_until_ready(self.client, self.slots, timeout, conf_dir=self.conf_dir)
+
+    def command(self, jar, app, config_str):
+        """The flink CLI command that runs the job attached on this cluster, to be run with env()."""
+        return self.slot.taskset() + [os.path.join(self.flink_home, 'bin', 'flink'), 'run',
+                                      '-m', 'localhost:%d' % self.rest_port,
+                                      '-c', 'flink.FlinkRunner', jar, '--app', app, '--config', config_str]
+
+    def stop(self, timeout=60):
+        subprocess.run([os.path.join(self.flink_home, 'bin', 'stop-cluster.sh')], env=self.env())
+        wait_until_stopped(self.client, timeout, conf_dir=self.conf_dir)
@@ -0,0 +1,225 @@
+"""GC logs of the worker JVMs, cut per run and lined up with the throughput.
+
+With GC logging on, every worker JVM gets one extra option,
+
+    -Xlog:gc:<gc_dir>/gc-%p.log:timemillis
+
+which makes it log each collection to a file of its own, stamped with
+epoch milliseconds. The option has no spaces, commas or equal signs, so
+it survives the config strings the Spark and Storm launchers pass on
+unquoted. It goes into the JVMs as
+
+    flink    FLINK_ENV_JAVA_OPTS_TM, after env.java.opts.taskmanager
+    spark    spark.executor.extraJavaOptions of the run's properties
+    storm    topology.worker.childopts of the run's properties
+    threads  the runner's command line
+
+After a run, collect() copies the lines its JVMs logged while it ran to
+<metrics.output>/gc.log, prefixed with the pid, and writes gc.csv with
+one row per unix second, like the -received.csv files:
+
+    time,pauses,pause_ms,max_pause_ms,alloc_mb_s,heap_after_mb
+
+alloc_mb_s is what the JVMs allocated between collections (heap before
+a collection minus heap after the previous one) spread over the seconds
+in between; heap_after_mb is the heap all JVMs held after their latest
+collection. summary() boils that down to the journal fields of a run and
+dips() finds the seconds the sink throughput fell while the JVMs were
+paused.
+"""
+import glob
+import os
+import re
+
+from . import flink, metrics, stats
+
+FILES = 'gc-*.log*'
+PROPERTIES = {'spark': 'spark.executor.extraJavaOptions', 'storm': 'topology.worker.childopts'}
+FLINK_ENV = 'FLINK_ENV_JAVA_OPTS_TM'
+# upper bounds in milliseconds of the pause histogram buckets; the last one is open
+BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+# a second whose sink throughput is this far below the median is a dip
+DIP = 0.2
+_LINE = re.compile(r'^\[(\d+)ms\]')
+_PAUSE = re.compile(r'GC\((\d+)\) (Pause .*?) (\d+)([KMG])->(\d+)([KMG])\((\d+)([KMG])\) ([\d.]+)ms')
+_MB = {'K': 1.0 / 1024, 'M': 1.0, 'G': 1024.0}
+
+
+def option(directory):
+    return '-Xlog:gc:%s:timemillis' % os.path.join(os.path.abspath(directory), 'gc-%p.log')
+
+
+def prepare(directory):
+    """Create the GC log directory; executors may run as another user, so anyone may write to it."""
+    os.makedirs(directory, exist_ok=True)
+    os.chmod(directory, 0o1777)
+
+
+def properties(engine, directory):
+    """The run properties that turn GC logging on for an engine's workers; empty for the others."""
+    return {PROPERTIES[engine]: option(directory)} if engine in PROPERTIES else {}
+
+
+def flink_env(flink_home, directory):
+    """The environment that turns GC logging on for the TaskManagers start-cluster.sh starts.
+
+    config.sh only reads env.java.opts.taskmanager when the variable is
+    unset, so the configured options are passed on too.
+    """
+    configured = flink.read_conf(flink_home).get('env.java.opts.taskmanager', '').strip().strip('"')
+    return {FLINK_ENV: (configured + ' ' + option(directory)).strip()}
+
+
+def parse(lines):
+    """[{'time': epoch seconds, 'gc', 'kind', 'before', 'after', 'heap' (MB), 'pause' (ms)}] of the pauses logged."""
+    pauses = []
+    for line in lines:
+        stamp = _LINE.match(line)
+        m = _PAUSE.search(line) if stamp else None
+        if m is None:
+            continue
+        pauses.append({'time': int(stamp.group(1)) / 1000.0, 'gc': int(m.group(1)), 'kind': m.group(2).strip(),
+                       'before': int(m.group(3)) * _MB[m.group(4)], 'after': int(m.group(5)) * _MB[m.group(6)],
+                       'heap': int(m.group(7)) * _MB[m.group(8)], 'pause': float(m.group(9))})
+    return pauses
+
+
+def _stamp(line):
+    m = _LINE.match(line)
+    return int(m.group(1)) / 1000.0 if m else None
+
+
+def collect(directory, record, metrics_output):
+    """Cut the lines logged during a run (record is runner.run's) into gc.log and gc.csv; return its pauses by pid."""
+    start, end = record.get('started'), record.get('ended')
+    if start is None or end is None:
+        return {}
+    kept = []
+    for path in sorted(glob.glob(os.path.join(directory, FILES))):
+        if os.path.getmtime(path) < start:
+            continue
+        pid = re.search(r'gc-(\d+)\.log', os.path.basename(path))
+        with open(path, errors='replace') as f:
+            for line in f:
+                t = _stamp(line)
+                if t is not None and start <= t <= end:
+                    kept.append((pid.group(1) if pid else '?', line.rstrip('\n')))
+    if not kept:
+        return {}
+    os.makedirs(metrics_output, exist_ok=True)
+    with open(os.path.join(metrics_output, 'gc.log'), 'w') as f:
+        for pid, line in kept:
+            f.write('%s %s\n' % (pid, line))
+    pauses = load(metrics_output)
+    with open(os.path.join(metrics_output, 'gc.csv'), 'w') as f:
+        f.write('time,pauses,pause_ms,max_pause_ms,alloc_mb_s,heap_after_mb\n')
+        for row in series(pauses):
+            f.write('%d,%d,%.3f,%.3f,%.1f,%.1f\n' % row)
+    fields = summary(metrics_output)
+    if fields:
+        print("gc: %d pauses, %.0f ms paused (%.1f%%), longest %.0f ms, %.0f MB/s allocated, %d throughput dips" % (
+            fields['gc_pauses'], fields['gc_ms'], 100 * fields['gc_share'], fields['gc_max_ms'],
+            fields['alloc_mb_s'], fields['gc_dips']))
+    return pauses
+
+
+def load(metrics_output):
+    """{pid: pauses} of the gc.log collect() left in a run's metrics folder."""
+    lines = {}
+    path = os.path.join(metrics_output, 'gc.log')
+    if os.path.exists(path):
+        with open(path, errors='replace') as f:
+            for line in f:
+                pid, _, rest = line.partition(' ')
+                lines.setdefault(pid, []).append(rest)
+    return {pid: parse(l) for pid, l in lines.items()}
+
+
+def series(pauses):
+    """(second, pauses, pause ms, longest pause ms, MB/s allocated, MB held after GC) from first to last pause."""
+    seconds = [int(p['time']) for ps in pauses.values() for p in ps]
+    if not seconds:
+        return []
+    first, last = min(seconds), max(seconds)
+    rows = {s: [0, 0.0, 0.0, 0.0] for s in range(first, last + 1)}
+    heaps = {s: {} for s in rows}
+    for pid, ps in pauses.items():
+        ps = sorted(ps, key=lambda p: p['time'])
+        for previous, p in zip([None] + ps[:-1], ps):
+            row = rows[int(p['time'])]
+            row[0] += 1
+            row[1] += p['pause']
+            row[2] = max(row[2], p['pause'])
+            heaps[int(p['time'])][pid] = p['after']
+            if previous is None or p['time'] <= previous['time']:
+                continue
+            # spread what was allocated since the previous collection over the seconds in between
+            rate = max(p['before'] - previous['after'], 0.0) / (p['time'] - previous['time'])
+            for s in range(int(previous['time']), int(p['time']) + 1):
+                overlap = min(s + 1, p['time']) - max(s, previous['time'])
+                if overlap > 0:
+                    rows[s][3] += rate * overlap
+    held = {}
+    result = []
+    for s in sorted(rows):
+        held.update(heaps[s])
+        count, total, longest, alloc = rows[s]
+        result.append((s, count, total, longest, alloc, sum(held.values())))
+    return result
+
+
+def histogram(durations):
+    """[(upper bound in ms or None for the open bucket, count)] of pause durations."""
+    counts = [0] * (len(BUCKETS) + 1)
+    for d in durations:
+        counts[next((i for i, b in enumerate(BUCKETS) if d < b), len(BUCKETS))] += 1
+    return list(zip(BUCKETS + (None,), counts))
+
+
+def summary(metrics_output):
+    """The journal fields of a run's GC within its throughput window (all of it without one), or {}.
+
+    {'gc_pauses', 'gc_ms', 'gc_share': of the window's wall time,
+    'gc_p99_ms', 'gc_max_ms', 'alloc_mb_s', 'heap_after_mb': most held
+    after a collection, 'gc_dips': seconds of dips(), 'gc_histogram':
+    {'<bound>ms': count}}.
+    """
+    pauses = load(metrics_output)
+    span = metrics.span(metrics.buckets(metrics.sink_files(metrics_output)))
+    rows = [r for r in series(pauses) if span is None or span[0] <= r[0] <= span[1]]
+    if not rows:
+        return {}
+    durations = [p['pause'] for ps in pauses.values() for p in ps
+                 if span is None or span[0] <= int(p['time']) <= span[1]]
+    seconds = (span[1] - span[0] + 1) if span else len(rows)
+    return {'gc_pauses': len(durations),
+            'gc_ms': round(sum(durations), 1),
+            'gc_share': round(sum(durations) / 1000.0 / seconds, 4),
+            'gc_p99_ms': round(stats.percentile(durations, 99), 1) if durations else 0.0,
+            'gc_max_ms': round(max(durations), 1) if durations else 0.0,
+            'alloc_mb_s': round(stats.mean([r[4] for r in rows]), 1),
+            'heap_after_mb': round(max(r[5] for r in rows), 1),
+            'gc_dips': len(dips(metrics_output)),
+            'gc_histogram': {('<%dms' % b if b else '>=%dms' % BUCKETS[-1]): n
+                             for b, n in histogram(durations) if n}}
+
+
+def dips(metrics_output, threshold=DIP):
+    """[(second, sink tuples, median tuples, ms paused)] of the seconds the sinks fell behind during a pause.
+
+    A second counts when its sink throughput is threshold below the median
+    of the window and the JVMs were paused in it or the second before.
+    """
+    totals = metrics.per_second(metrics.buckets(metrics.sink_files(metrics_output)))
+    span = metrics.span(totals)
+    if span is None:
+        return []
+    paused = {r[0]: r[2] for r in series(load(metrics_output))}
+    inner = {t: n for t, n in totals.items() if span[0] <= t <= span[1]}
+    median = stats.median(list(inner.values()))
+    found = []
+    for t, n in sorted(inner.items()):
+        ms = paused.get(t, 0.0) + paused.get(t - 1, 0.0)
+        if n < (1 - threshold) * median and ms > 0:
+            found.append((t, n, median, round(ms, 1)))
+    return found
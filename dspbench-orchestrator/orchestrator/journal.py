@@ -0,0 +1,87 @@
+"""Append-only sweep journal.
+
+Every state change of a run is appended as one JSON line, keyed by
+(engine, app, conf, repetition), and synced to disk before the driver
+moves on. When a driver is restarted on the same journal it skips the
+runs whose last state is completed and runs everything else again,
+including runs that were cut off mid-way and left in "started".
+"""
+import json
+import os
+import threading
+import time
+
+STARTED = 'started'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+
+def key(run):
+    return '%s/%s/%s/%d' % (run.engine, run.app, run.conf, run.repetition)
+
+
+class Journal:
+    def __init__(self, path):
+        self.path = path
+        self.last = {}
+        self.lock = threading.Lock()
+        # called with (run, record) after every record, e.g. by an exporter.Exporter
+        self.listeners = []
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # a line cut short by a crash
+                        continue
+                    self.last[record['key']] = record
+
+    def state(self, run):
+        record = self.last.get(key(run))
+        return record['state'] if record else None
+
+    def records(self):
+        """The last record of every run in the journal."""
+        return list(self.last.values())
+
+    def pending(self, runs):
+        """The runs not completed yet, in their original order."""
+        return [r for r in runs if self.state(r) != COMPLETED]
+
+    def record(self, run, state, **fields):
+        with self.lock:
+            now = time.time()
+            record = dict(key=key(run), engine=run.engine, app=run.app, conf=run.conf,
+                          repetition=run.repetition, state=state, time=now)
+            previous = self.last.get(key(run))
+            if state != STARTED and previous and previous['state'] == STARTED:
+                record['run_id'] = previous.get('run_id')
+                record['duration'] = round(now - previous['time'], 3)
+                if 'metrics_output' in previous:
+                    record['metrics_output'] = previous['metrics_output']
+            record.update(fields)
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(record) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            self.last[record['key']] = record
+        for listener in self.listeners:
+            listener(run, record)
+        return record
+
+    def started(self, run, run_id):
+        return self.record(run, STARTED, run_id=run_id, metrics_output=run.metrics_output)
+
+    def completed(self, run, **fields):
+        return self.record(run, COMPLETED, **fields)
+
+    def failed(self, run, error, **fields):
+        return self.record(run, FAILED, error=error, **fields)
+
+    def rotate(self):
+        """Set the current journal aside so the next sweep starts from scratch."""
+        if os.path.exists(self.path):
+            os.rename(self.path, '%s.%s' % (self.path, time.strftime('%Y%m%d-%H%M%S')))
+        self.last = {}
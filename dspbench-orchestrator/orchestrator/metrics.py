@@ -0,0 +1,185 @@
+"""Reading the throughput files the benchmark operators write.
+
+With metrics.enabled every Flink, Spark and Storm operator instance
+appends "<time>,<count>" lines to <metrics.output>/<Operator>-received.csv
+when it shuts down, one line per second (or per millisecond with
+metrics.interval.unit set to anything but seconds). Several instances of
+an operator append to the same file, so a time bucket can appear once per
+instance.
+
+The threads engine instead has the codahale CSV reporter write cumulative
+counters, <component>.tuples-received.csv with a "t,count" header.
+
+Spark also appends a "query,batch,time,rows,duration" line per finished
+micro-batch to batches.csv.
+"""
+import csv
+import glob
+import os
+
+# epoch milliseconds are 13 digits, epoch seconds 10
+_MILLIS = 10 ** 11
+
+
+def sink_files(metrics_output):
+    """The -received.csv files of the sinks of a run."""
+    return sorted(glob.glob(os.path.join(metrics_output, '*Sink*-received.csv')))
+
+
+def received_files(metrics_output):
+    """{operator: its -received.csv file} for every operator of a run that wrote one."""
+    return {os.path.basename(p)[:-len('-received.csv')]: p
+            for p in glob.glob(os.path.join(metrics_output, '*-received.csv'))}
+
+
+def buckets(paths):
+    """Received tuples per time bucket, summed over all instances."""
+    totals = {}
+    for path in paths:
+        with open(path, newline='') as f:
+            for row in csv.reader(f):
+                try:
+                    t, count = int(row[0]), int(row[1])
+                except (IndexError, ValueError):
+                    continue
+                totals[t] = totals.get(t, 0) + count
+    return totals
+
+
+def throughput(totals):
+    """Mean tuples per second between the first and last bucket.
+
+    The first and last buckets only cover part of their interval (the job
+    starting up and shutting down) and are left out. None when fewer than
+    three buckets were recorded.
+    """
+    if len(totals) < 3:
+        return None
+    times = sorted(totals)
+    inner = times[1:-1]
+    span = inner[-1] - inner[0] + 1
+    if times[0] > _MILLIS:
+        span /= 1000.0
+    return sum(totals[t] for t in inner) / span
+
+
+def halves(totals):
+    """Throughput over the first and the second half of the buckets throughput() uses, or None."""
+    if len(totals) < 6:
+        return None
+    times = sorted(totals)[1:-1]
+    scale = 1000.0 if times[0] > _MILLIS else 1.0
+    mid = len(times) // 2
+    return tuple(sum(totals[t] for t in part) * scale / (part[-1] - part[0] + 1)
+                 for part in (times[:mid], times[mid:]))
+
+
+def measured(totals):
+    """Seconds of buckets throughput() computes its figure from, or None."""
+    if len(totals) < 3:
+        return None
+    times = sorted(totals)
+    span = times[-2] - times[1] + 1
+    return span / 1000.0 if times[0] > _MILLIS else float(span)
+
+
+def span(totals):
+    """(first, last) unix second of the buckets throughput() uses, or None."""
+    if len(totals) < 3:
+        return None
+    times = sorted(totals)
+    if times[0] > _MILLIS:
+        return times[1] // 1000, times[-2] // 1000
+    return times[1], times[-2]
+
+
+def per_second(totals):
+    """Buckets by unix second; millisecond buckets are summed into their second."""
+    if not totals or min(totals) <= _MILLIS:
+        return dict(totals)
+    seconds = {}
+    for t, count in totals.items():
+        seconds[t // 1000] = seconds.get(t // 1000, 0) + count
+    return seconds
+
+
+def sink_throughput(metrics_output):
+    """Throughput of a run as seen by its sinks, or None if there is nothing to read."""
+    return throughput(buckets(sink_files(metrics_output)))
+
+
+def batch_durations(metrics_output):
+    """Milliseconds each micro-batch of a Spark run took, in order; batch 0 also plans the query and is left out."""
+    durations = []
+    path = os.path.join(metrics_output, 'batches.csv')
+    if not os.path.exists(path):
+        return durations
+    with open(path, newline='') as f:
+        for row in csv.reader(f):
+            try:
+                batch, duration = int(row[1]), int(row[4])
+            except (IndexError, ValueError):
+                continue
+            if batch > 0:
+                durations.append(duration)
+    return durations
+
+
+def counter_files(metrics_output):
+    """The tuples-received counter files of the sinks of a threads run."""
+    return sorted(p for p in glob.glob(os.path.join(metrics_output, '*.tuples-received.csv'))
+                  if 'sink' in os.path.basename(p).lower())
+
+
+def counter_total(metrics_output):
+    """Tuples the sinks of a threads run received so far, or None before the first report."""
+    total = None
+    for path in counter_files(metrics_output):
+        last = None
+        with open(path, newline='') as f:
+            for row in csv.reader(f):
+                try:
+                    last = int(row[1])
+                except (IndexError, ValueError):
+                    continue
+        if last is not None:
+            total = (total or 0) + last
+    return total
+
+
+def sink_measured(metrics_output):
+    """Seconds of the run covered by its sink throughput, or None."""
+    return measured(buckets(sink_files(metrics_output)))
+
+
+def counter_measured(metrics_output):
+    """Seconds between the first and last counter report of a threads run, or None."""
+    longest = None
+    for path in counter_files(metrics_output):
+        times = []
+        with open(path, newline='') as f:
+            for row in csv.reader(f):
+                try:
+                    times.append(int(row[0]))
+                except (IndexError, ValueError):
+                    continue
+        if len(times) >= 2:
+            longest = max(longest or 0, times[-1] - times[0])
+    return longest
+
+
+def counter_throughput(metrics_output):
+    """Tuples per second from the first to the last report of cumulative counters."""
+    total = None
+    for path in counter_files(metrics_output):
+        samples = []
+        with open(path, newline='') as f:
+            for row in csv.reader(f):
+                try:
+                    samples.append((int(row[0]), int(row[1])))
+                except (IndexError, ValueError):
+                    continue
+        if len(samples) >= 2 and samples[-1][0] > samples[0][0]:
+            (t0, c0), (t1, c1) = samples[0], samples[-1]
+            total = (total or 0.0) + (c1 - c0) / (t1 - t0)
+    return total
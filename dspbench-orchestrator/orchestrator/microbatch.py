@@ -0,0 +1,85 @@
+"""Micro-batch co-tuning: the shortest stable batch interval per parallelism.
+
+Spark starts a micro-batch every <prefix>.batch.interval milliseconds (as
+fast as it can with 0) and its Kafka source reads at most
+<prefix>.batch.size records per batch. Both are swept as batch points
+together with the parallelism grid (see sweep.py). Every completed run of
+a batch point is journaled with the point, the number of batches and the
+95th percentile of their processing milliseconds. A point is stable when
+that percentile stays below the interval in every repetition, that is
+when batches do not queue up behind each other. report() lists the
+points of every parallelism config and the shortest stable interval.
+"""
+from . import metrics, stats, sweep
+
+INTERVAL = '.batch.interval'
+SIZE = '.batch.size'
+PERCENTILE = 95
+
+
+def interval(batch):
+    """The batch interval in milliseconds of a batch point, or None."""
+    return next((v for k, v in batch.items() if k.endswith(INTERVAL)), None)
+
+
+def size(batch):
+    return next((v for k, v in batch.items() if k.endswith(SIZE)), None)
+
+
+def summary(run, metrics_output=None):
+    """The journal fields of a run's micro-batches: its batch point, batches and batch_ms.
+
+    metrics_output is where a cached run of the same config left its metrics.
+    """
+    durations = metrics.batch_durations(metrics_output or run.metrics_output)
+    fields = {'batch': run.batch, 'batches': len(durations)}
+    if durations:
+        fields['batch_ms'] = stats.percentile(durations, PERCENTILE)
+    return fields
+
+
+def stable(record):
+    limit = interval(record['batch'])
+    return bool(limit) and record.get('batch_ms') is not None and record['batch_ms'] < limit
+
+
+def table(records):
+    """{(engine, app, parallelism label): [point]} of the completed runs with a batch point.
+
+    A point is a dict of the batch, the mean throughput and the worst
+    batch_ms over its repetitions, and whether all of them were stable.
+    """
+    points = {}
+    for record in records:
+        if record.get('state') != 'completed' or not record.get('batch'):
+            continue
+        batch = record['batch']
+        parallelism = record['conf'][:len(record['conf']) - len(sweep.batch_label(batch))]
+        point = points.setdefault((record['engine'], record['app'], parallelism), {}).setdefault(
+            sweep.batch_label(batch), {'batch': batch, 'throughputs': [], 'batch_ms': None, 'stable': True})
+        if record.get('throughput') is not None:
+            point['throughputs'].append(record['throughput'])
+        if record.get('batch_ms') is not None:
+            point['batch_ms'] = max(point['batch_ms'] or 0, record['batch_ms'])
+        point['stable'] = point['stable'] and stable(record)
+    rows = {}
+    for key, by_label in points.items():
+        rows[key] = sorted(({'batch': p['batch'], 'throughput': stats.mean(p['throughputs']),
+                             'batch_ms': p['batch_ms'], 'stable': p['stable']} for p in by_label.values()),
+                           key=lambda p: (interval(p['batch']) or 0, size(p['batch']) or 0))
+    return rows
+
+
+def report(records):
+    for (engine, app, parallelism), points in sorted(table(records).items()):
+        yield '%s %s %s:' % (engine, app, parallelism)
+        for p in points:
+            yield '  interval %6s ms, size %7s: %10.1f tuples/s, p%d batch %s ms%s' % (
+                interval(p['batch']), size(p['batch']), p['throughput'], PERCENTILE,
+                '-' if p['batch_ms'] is None else '%.0f' % p['batch_ms'], ', stable' if p['stable'] else '')
+        best = next((p for p in points if p['stable']), None)
+        if best is None:
+            yield '  no stable batch interval'
+        else:
+            yield '  smallest stable interval: %s ms (size %s, %.1f tuples/s)' % (
+                interval(best['batch']), size(best['batch']), best['throughput'])
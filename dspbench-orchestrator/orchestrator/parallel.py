@@ -0,0 +1,107 @@
+"""Packing independent runs onto one machine.
+
+Each run gets its own engine instance pinned to a disjoint set of CPUs.
+Runs are placed first-fit, largest first: a config whose thread count
+covers the whole machine runs alone, small ones fill the gaps left next
+to bigger ones.
+"""
+import concurrent.futures
+import os
+
+
+def available_cpus():
+    return sorted(os.sched_getaffinity(0))
+
+
+def parse_cpus(spec):
+    """Parse a taskset-style CPU list such as '0-3,8,10-11'."""
+    cpus = []
+    for part in spec.split(','):
+        if '-' in part:
+            lo, hi = part.split('-')
+            cpus.extend(range(int(lo), int(hi) + 1))
+        elif part.strip():
+            cpus.append(int(part))
+    return sorted(set(cpus))
+
+
+def format_cpus(cpus):
+    return ','.join(str(c) for c in cpus)
+
+
+def demand(run):
+    """CPUs a run asks for: one per operator thread."""
+    return sum(run.values)
+
+
+class Slot:
+    """A share of the machine handed to one run: its CPUs and an index
+    that keeps ports and scratch directories of concurrent runs apart."""
+
+    def __init__(self, index, cpus):
+        self.index = index
+        self.cpus = cpus
+
+    def taskset(self):
+        return ['taskset', '-c', format_cpus(self.cpus)]
+
+
+class CpuPool:
+    def __init__(self, cpus):
+        self.cpus = list(cpus)
+        self.free = set(self.cpus)
+        self.indexes = set()
+
+    def take(self, n):
+        """Reserve n CPUs, preferring a contiguous block; None if they don't fit."""
+        n = min(n, len(self.cpus))
+        if n > len(self.free):
+            return None
+        ordered = [c for c in self.cpus if c in self.free]
+        chosen = ordered[:n]
+        for i in range(len(ordered) - n + 1):
+            block = ordered[i:i + n]
+            if block[-1] - block[0] == n - 1:
+                chosen = block
+                break
+        self.free.difference_update(chosen)
+        index = min(set(range(len(self.cpus))) - self.indexes)
+        self.indexes.add(index)
+        return Slot(index, chosen)
+
+    def give(self, slot):
+        self.free.update(slot.cpus)
+        self.indexes.discard(slot.index)
+
+
+def run_all(runs, cpus, execute, on_done=None):
+    """Run execute(run, slot) for every run, packing them onto cpus.
+
+    execute blocks until its run is over and returns its result; results
+    come back in the order of runs. Exceptions are returned in place of a
+    result so one broken run does not stop the others. on_done(run, result)
+    is called from the scheduling thread as each run finishes.
+    """
+    pool = CpuPool(cpus)
+    pending = sorted(range(len(runs)), key=lambda i: -min(demand(runs[i]), len(pool.cpus)))
+    results = [None] * len(runs)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(pool.cpus)) as executor:
+        active = {}
+        while pending or active:
+            for i in list(pending):
+                slot = pool.take(demand(runs[i]))
+                if slot is None:
+                    continue
+                pending.remove(i)
+                active[executor.submit(execute, runs[i], slot)] = (i, slot)
+            done, _ = concurrent.futures.wait(active, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                i, slot = active.pop(future)
+                pool.give(slot)
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    results[i] = e
+                if on_done is not None:
+                    on_done(runs[i], results[i])
+    return results
@@ -0,0 +1,192 @@
+"""Estimating how long a sweep will take before it starts.
+
+Every run costs its own length plus the engine's overhead between runs
+(cluster restart, the Spark driver's pause, topology submission and
+kill). The length of a config comes from the timing logs the drivers
+append to txts/<app>-<exec>-<conf>.txt, one "<start> - <end>" line per
+past run: the median of that config's past runs if there are any, else
+the median of all past runs of the app, else the app's configured
+runtime (or the engine's run limit for engines whose jobs never end).
+"""
+import datetime
+import glob
+import math
+import os
+import re
+
+from . import properties, stats, sweep
+
+# seconds spent between two runs besides the run itself
+OVERHEAD = {'flink': 25, 'spark': 30, 'storm': 20, 'threads': 5}
+# engines whose runs last until they are stopped, and for how long
+RUN_LIMIT = {'storm': 300, 'threads': 300}
+DEFAULT_RUNTIME = 60
+
+# a conf label with the values of its batch point, if any: 1244 or 1111-500-2000
+_CONF = re.compile(r'^\d+(?:-[^-]+)*$')
+_DURATION = re.compile(r'^(\d+(?:\.\d+)?)([hms]?)$')
+
+
+def parse_duration(text):
+    """Seconds in '8h', '90m', '600s' or a bare number of hours."""
+    m = _DURATION.match(text.strip())
+    if not m:
+        raise ValueError('not a duration: %r' % text)
+    return float(m.group(1)) * {'h': 3600, 'm': 60, 's': 1, '': 3600}[m.group(2)]
+
+
+def hms(seconds):
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return '%dh%02dm' % (seconds // 3600, seconds % 3600 // 60)
+    return '%dm%02ds' % (seconds // 60, seconds % 60)
+
+
+def history(txts_dir, apps, exec):
+    """{(app, exec, conf): [seconds]} of the runs of apps with exec timed in txts_dir.
+
+    The file names are read against the known app and exec, as app names
+    and the labels of batch configs (1111-500-2000) both contain dashes.
+    """
+    found = {}
+    for app in apps:
+        prefix = '%s-%s-' % (app, exec)
+        for path in glob.glob(os.path.join(txts_dir, glob.escape(prefix) + '*.txt')):
+            conf = os.path.basename(path)[len(prefix):-len('.txt')]
+            if not _CONF.match(conf):
+                continue
+            durations = found.setdefault((app, exec, conf), [])
+            with open(path) as f:
+                for line in f:
+                    start, sep, end = line.strip().partition(' - ')
+                    if not sep:
+                        continue
+                    try:
+                        seconds = (datetime.datetime.fromisoformat(end)
+                                   - datetime.datetime.fromisoformat(start)).total_seconds()
+                    except ValueError:
+                        continue
+                    if seconds > 0:
+                        durations.append(seconds)
+    return found
+
+
+def log_time(txts_dir, run, start, end):
+    """Append a run's start and end datetimes to the timing log history() reads."""
+    os.makedirs(txts_dir, exist_ok=True)
+    with open(os.path.join(txts_dir, '%s-%s-%s.txt' % (run.app, run.exec, run.conf)), 'a') as f:
+        f.write('%s - %s\n' % (start, end))
+
+
+def default_length(spec, app):
+    if spec['engine'] in RUN_LIMIT:
+        return RUN_LIMIT[spec['engine']]
+    path = os.path.join(spec['config_dir'], app.get('config', app['name'] + '.properties'))
+    value = app.get('properties', {}).get(_runtime_key(app))
+    if value is None and os.path.exists(path):
+        value = properties.load(path).get(_runtime_key(app))
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return DEFAULT_RUNTIME
+
+
+def _runtime_key(app):
+    return app.get('runtime_key', app['stages'][0].split('.')[0] + '.runtime_sec')
+
+
+class AppEstimate:
+    def __init__(self, app, configs, duplicates, repetitions, lengths, sources, overhead):
+        self.app = app
+        self.configs = configs
+        self.duplicates = duplicates
+        self.repetitions = repetitions
+        # seconds of one repetition of each config, and where each figure came from
+        self.lengths = lengths
+        self.sources = sources
+        self.overhead = overhead
+
+    @property
+    def runs(self):
+        return len(self.configs) * self.repetitions
+
+    @property
+    def per_repetition(self):
+        return sum(length + self.overhead for length in self.lengths)
+
+    @property
+    def total(self):
+        return self.per_repetition * self.repetitions
+
+
+def estimate(spec, apps=None, txts_dir=None, overhead=None, done=None):
+    """One AppEstimate per app of the spec.
+
+    done, if given, is a journal whose completed runs are not counted.
+    """
+    overhead = OVERHEAD.get(spec['engine'], 0) if overhead is None else overhead
+    timed = history(txts_dir, [app['name'] for app in spec['apps']], spec['exec']) if txts_dir else {}
+    estimates = []
+    for app in spec['apps']:
+        if apps is not None and app['name'] not in apps:
+            continue
+        by_app = [s for (a, _, _), durations in timed.items() if a == app['name'] for s in durations]
+        configs = [sweep.conf_label(row) + sweep.batch_label(batch) for row, batch in sweep.points(app)]
+        reps = app.get('repetitions', spec['repetitions'])
+        if done is not None:
+            pending = done.pending(sweep.expand(spec, [app['name']]))
+            configs = [c for c in configs if any(r.conf == c for r in pending)]
+            reps = max([sum(1 for r in pending if r.conf == c) for c in configs] or [0])
+        lengths, sources = [], []
+        for conf in configs:
+            durations = timed.get((app['name'], spec['exec'], conf))
+            if durations:
+                lengths.append(stats.median(durations))
+                sources.append('history')
+            elif by_app:
+                lengths.append(stats.median(by_app))
+                sources.append('app')
+            else:
+                lengths.append(default_length(spec, app))
+                sources.append('default')
+        estimates.append(AppEstimate(app['name'], configs, sweep.duplicates(app), reps, lengths, sources,
+                                     overhead))
+    return estimates
+
+
+def report(estimates, window=None):
+    """Lines of the per-app table, with each app's share of the window if one is given."""
+    header = '%-22s %7s %5s %5s %9s %-16s %9s %10s' % ('app', 'configs', 'dups', 'runs', 'per run', 'source',
+                                                        'total', 'cumulative')
+    if window:
+        header += ' %9s %5s' % ('budget', 'reps')
+    yield header
+    grand = sum(e.total for e in estimates)
+    cumulative = 0
+    for e in estimates:
+        cumulative += e.total
+        counts = {s: e.sources.count(s) for s in set(e.sources)}
+        source = ' '.join('%s %d' % (s, counts[s]) for s in ('history', 'app', 'default') if s in counts)
+        per_run = e.total / e.runs if e.runs else 0
+        line = '%-22s %7d %5d %5d %9s %-16s %9s %10s' % (e.app, len(e.configs), len(e.duplicates), e.runs,
+                                                         hms(per_run), source, hms(e.total), hms(cumulative))
+        if window:
+            # what the app may take for the sweep to fit: its share in proportion to its cost
+            budget = e.total if grand <= window else window * e.total / grand
+            reps = int(budget // e.per_repetition) if e.per_repetition else e.repetitions
+            line += ' %9s %5d' % (hms(budget), min(reps, e.repetitions))
+            if cumulative > window:
+                line += '  over'
+        yield line
+    for e in estimates:
+        for row, first in e.duplicates:
+            yield 'duplicate: %s %s runs the same config as %s' % (e.app, row, first)
+    yield 'total: %d runs, %s' % (sum(e.runs for e in estimates), hms(grand))
+    if window:
+        if grand <= window:
+            yield 'fits in %s with %s to spare' % (hms(window), hms(window - grand))
+        else:
+            per_rep = sum(e.per_repetition for e in estimates)
+            reps = int(math.floor(window / per_rep)) if per_rep else 0
+            yield ('over %s by %s; the whole sweep fits with %d repetition%s'
+                   % (hms(window), hms(grand - window), reps, '' if reps == 1 else 's'))
@@ -0,0 +1,106 @@
+"""Process table and system load lookups through /proc."""
+import os
+
+
+def cmdline(pid):
+    try:
+        with open('/proc/%d/cmdline' % pid, 'rb') as f:
+            return f.read().replace(b'\0', b' ').decode(errors='replace').strip()
+    except OSError:
+        return ''
+
+
+def find(*patterns):
+    """Return {pid: cmdline} of processes whose command line has any pattern."""
+    found = {}
+    me = os.getpid()
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit() or int(entry) == me:
+            continue
+        line = cmdline(int(entry))
+        if line and any(p in line for p in patterns):
+            found[int(entry)] = line
+    return found
+
+
+def cpu_times():
+    """(busy, iowait, total) jiffies of all CPUs from /proc/stat."""
+    with open('/proc/stat') as f:
+        fields = [int(v) for v in f.readline().split()[1:]]
+    iowait = fields[4] if len(fields) > 4 else 0
+    return sum(fields) - fields[3] - iowait, iowait, sum(fields)
+
+
+def meminfo(*keys):
+    """{key: kB} of the given /proc/meminfo lines."""
+    values = {}
+    with open('/proc/meminfo') as f:
+        for line in f:
+            name, _, rest = line.partition(':')
+            if name in keys:
+                values[name] = int(rest.split()[0])
+    return values
+
+
+def loadavg():
+    """The 1, 5 and 15 minute load averages."""
+    with open('/proc/loadavg') as f:
+        return tuple(float(v) for v in f.read().split()[:3])
+
+
+def net_bytes():
+    """(received, sent) bytes of all network interfaces but loopback from /proc/net/dev."""
+    rx = tx = 0
+    with open('/proc/net/dev') as f:
+        for line in f:
+            name, sep, rest = line.partition(':')
+            if not sep or name.strip() == 'lo':
+                continue
+            fields = rest.split()
+            rx += int(fields[0])
+            tx += int(fields[8])
+    return rx, tx
+
+
+def disk_bytes():
+    """(read, written) bytes of the whole disks in /proc/diskstats.
+
+    Partitions and device-mapper volumes are left out, their I/O being
+    counted on the disk underneath as well.
+    """
+    read = written = 0
+    with open('/proc/diskstats') as f:
+        for line in f:
+            fields = line.split()
+            name = fields[2]
+            if name.startswith(('loop', 'ram', 'dm-')) or not os.path.exists('/sys/block/' + name):
+                continue
+            # sectors are 512 bytes whatever the device's block size
+            read += int(fields[5]) * 512
+            written += int(fields[9]) * 512
+    return read, written
+
+
+def pid_ticks(pid):
+    """User plus system clock ticks a process used so far, or None once it is gone."""
+    try:
+        with open('/proc/%d/stat' % pid) as f:
+            # the command name in parentheses may contain spaces
+            fields = f.read().rpartition(')')[2].split()
+    except OSError:
+        return None
+    return int(fields[11]) + int(fields[12])
+
+
+def pid_status(pid, *keys):
+    """{key: first value as int} of the given /proc/<pid>/status lines, empty once it is gone."""
+    values = {}
+    try:
+        with open('/proc/%d/status' % pid) as f:
+            for line in f:
+                name, _, rest = line.partition(':')
+                if name in keys:
+                    values[name] = int(rest.split()[0])
+    except OSError:
+        return {}
+    return values
@@ -0,0 +1,361 @@
+"""Profiling the worker JVMs of a run and flame graphs across configs.
+
+With a Profiler passed to runner.run, every worker JVM of the engine
+(Flink TaskManagers, Spark executors, Storm workers, the threads runner)
+is profiled for duration seconds once the run reached its steady state,
+delay seconds after the job was accepted. Two tools are supported:
+
+    async  async-profiler (asprof, or profiler.sh of older releases) in
+           cpu or alloc mode, writing collapsed stacks directly
+    jfr    a JDK Flight Recorder recording started with jcmd JFR.start,
+           whose jdk.ExecutionSample (cpu) or jdk.ObjectAllocationSample
+           (alloc, weighted by bytes) events are collapsed from
+           `jfr print --json`
+
+The stacks of all workers of a run are merged into profile.collapsed in
+its run directory, one "frame;frame;...;leaf count" line per stack, with a
+profile.svg flame graph next to it. aggregate() sums the runs of each
+(engine, app, config) under <runs_dir>/profiles/ and draws, for every
+config but the lowest parallelism of its app, a differential flame graph
+against that one: frames that take a bigger share of the samples are
+red, those that take a smaller share blue. report() tells how much of the
+samples of each config are spent in frames matching given patterns.
+"""
+import html
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+import zlib
+
+from . import procs, resources, snapshots
+
+EVENTS = ('cpu', 'alloc')
+TOOLS = ('async', 'jfr')
+JFR_EVENTS = {'cpu': 'jdk.ExecutionSample', 'alloc': 'jdk.ObjectAllocationSample'}
+# roles of resources.JVMS whose JVMs run the operators
+WORKERS = {'flink': ('taskmanager',), 'spark': ('executor',), 'storm': ('worker', 'local'), 'threads': ('runner',)}
+DELAY = 30
+DURATION = 20
+COLLAPSED = 'profile.collapsed'
+FLAME_GRAPH = 'profile.svg'
+PROFILES_DIR = 'profiles'
+# width of a flame graph and height of a frame, in pixels
+WIDTH = 1200
+FRAME = 16
+
+
+def roles(engine):
+    """{role: command line pattern} of the worker JVMs of an engine."""
+    return {role: pattern for role, pattern in resources.JVMS.get(engine, {}).items()
+            if role in WORKERS.get(engine, ())}
+
+
+def load(path):
+    """{stack: samples} of a collapsed stacks file; empty if there is none."""
+    stacks = {}
+    if not os.path.exists(path):
+        return stacks
+    with open(path) as f:
+        for line in f:
+            stack, _, count = line.rstrip('\n').rpartition(' ')
+            if stack and count.isdigit():
+                stacks[stack] = stacks.get(stack, 0) + int(count)
+    return stacks
+
+
+def save(stacks, path):
+    with open(path, 'w') as f:
+        for stack, count in sorted(stacks.items()):
+            f.write('%s %d\n' % (stack, count))
+
+
+def merge(profiles):
+    stacks = {}
+    for profile in profiles:
+        for stack, count in profile.items():
+            stacks[stack] = stacks.get(stack, 0) + count
+    return stacks
+
+
+def _frame(frame):
+    method = frame.get('method') or {}
+    cls = ((method.get('type') or {}).get('name') or '').replace('/', '.')
+    return '%s.%s' % (cls, method.get('name', '?')) if cls else method.get('name', '?')
+
+
+def jfr_stacks(document, event='cpu'):
+    """{stack: samples} of the events of a `jfr print --json` document.
+
+    Allocation samples count their weight in bytes, with the allocated
+    class as the leaf frame.
+    """
+    stacks = {}
+    for entry in document.get('recording', {}).get('events', []):
+        if entry.get('type') != JFR_EVENTS[event]:
+            continue
+        values = entry.get('values', {})
+        frames = [_frame(f) for f in reversed((values.get('stackTrace') or {}).get('frames') or [])]
+        if not frames:
+            continue
+        count = 1
+        if event == 'alloc':
+            count = int(values.get('weight') or 0)
+            frames.append(((values.get('objectClass') or {}).get('name') or '?').replace('/', '.'))
+        stack = ';'.join(f.replace(';', ':') for f in frames)
+        stacks[stack] = stacks.get(stack, 0) + count
+    return stacks
+
+
+def _java_tool(name):
+    home = os.environ.get('JAVA_HOME')
+    if home and os.path.exists(os.path.join(home, 'bin', name)):
+        return os.path.join(home, 'bin', name)
+    return shutil.which(name)
+
+
+def async_profiler():
+    """The async-profiler launcher: $ASYNC_PROFILER (the binary or its install directory) or asprof on the PATH."""
+    path = os.environ.get('ASYNC_PROFILER')
+    if path and os.path.isdir(path):
+        path = next((p for p in (os.path.join(path, 'bin', 'asprof'), os.path.join(path, 'profiler.sh'))
+                     if os.path.exists(p)), None)
+    return path or shutil.which('asprof') or shutil.which('profiler.sh')
+
+
+class Profiler:
+    """Profiles the worker JVMs of one run into its run directory."""
+
+    def __init__(self, engine, directory, event='cpu', tool='async', delay=DELAY, duration=DURATION, jvms=None,
+                 scope=None):
+        if event not in EVENTS or tool not in TOOLS:
+            raise ValueError('cannot profile %s with %s' % (event, tool))
+        self.engine = engine
+        # {role: command line pattern} of the JVMs to profile, and what their command lines must also hold
+        # (see resources.Sampler)
+        self.jvms = jvms or roles(engine)
+        self.scope = scope
+        self.directory = directory
+        self.event = event
+        self.tool = tool
+        self.delay = delay
+        self.duration = duration
+
+    def _async(self, pid, out):
+        launcher = async_profiler()
+        if launcher is None:
+            raise OSError('async-profiler not found; set ASYNC_PROFILER or put asprof on the PATH')
+        subprocess.run([launcher, '-e', self.event, '-d', str(self.duration), '-o', 'collapsed', '-f', out,
+                        str(pid)], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True,
+                       timeout=self.duration + 60)
+        return load(out)
+
+    def _jfr(self, pid, out):
+        jcmd, jfr = _java_tool('jcmd'), _java_tool('jfr')
+        if jcmd is None or jfr is None:
+            raise OSError('jcmd and jfr not found; set JAVA_HOME to a JDK')
+        recording = out[:-len('.collapsed')] + '.jfr'
+        subprocess.run([jcmd, str(pid), 'JFR.start', 'name=dspbench', 'settings=profile',
+                        'duration=%ds' % self.duration, 'filename=' + recording],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True, timeout=60)
+        # the recording is written when it stops; wait until it stops growing
+        time.sleep(self.duration)
+        deadline = time.monotonic() + 60
+        size = -1
+        while not os.path.exists(recording) or os.path.getsize(recording) != size:
+            if time.monotonic() > deadline:
+                raise OSError('%s was not written' % recording)
+            size = os.path.getsize(recording) if os.path.exists(recording) else -1
+            time.sleep(1)
+        printed = subprocess.run([jfr, 'print', '--json', '--events', JFR_EVENTS[self.event], recording],
+                                 stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True, timeout=600)
+        stacks = jfr_stacks(json.loads(printed.stdout), self.event)
+        save(stacks, out)
+        return stacks
+
+    def record(self):
+        """Profile every worker JVM at once; the merged stacks go to profile.collapsed and profile.svg.
+
+        Returns what was profiled: {'event', 'tool', 'jvms': {pid: role},
+        'samples', 'errors': {pid: why}}.
+        """
+        patterns = self.jvms
+        jvms = {pid: next(r for r, p in patterns.items() if p in line)
+                for pid, line in procs.find(*patterns.values()).items()
+                if self.scope is None or self.scope in line} if patterns else {}
+        profiles, errors = {}, {}
+
+        def profile(pid):
+            out = os.path.join(self.directory, 'profile-%s-%d.collapsed' % (jvms[pid], pid))
+            try:
+                profiles[pid] = (self._async if self.tool == 'async' else self._jfr)(pid, out)
+            except (OSError, ValueError, subprocess.SubprocessError) as e:
+                stderr = getattr(e, 'stderr', None)
+                errors[pid] = (stderr.decode(errors='replace').strip() if stderr else '') or str(e)
+
+        threads = [threading.Thread(target=profile, args=(pid,), daemon=True) for pid in jvms]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stacks = merge(profiles.values())
+        if stacks:
+            save(stacks, os.path.join(self.directory, COLLAPSED))
+            with open(os.path.join(self.directory, FLAME_GRAPH), 'w') as f:
+                f.write(svg(stacks, '%s %s, %d worker JVMs' % (self.engine, self.event, len(profiles))))
+        for pid, error in sorted(errors.items()):
+            print('cannot profile %s %d: %s' % (jvms[pid], pid, error))
+        if not jvms:
+            print('no %s worker JVM to profile' % self.engine)
+        return {'event': self.event, 'tool': self.tool, 'jvms': jvms, 'samples': sum(stacks.values()),
+                'errors': errors}
+
+
+def _tree(stacks):
+    root = {'total': 0, 'children': {}}
+    for stack, count in stacks.items():
+        root['total'] += count
+        node = root
+        for frame in stack.split(';'):
+            node = node['children'].setdefault(frame, {'total': 0, 'children': {}})
+            node['total'] += count
+    return root
+
+
+def _depth(node):
+    return 1 + max((_depth(c) for c in node['children'].values()), default=0)
+
+
+def _color(name):
+    # the warm palette of flamegraph.pl, fixed per frame name so graphs compare
+    h = zlib.crc32(name.encode())
+    return 'rgb(%d,%d,%d)' % (205 + h % 50, (h >> 8) % 230, (h >> 16) % 55)
+
+
+def _diff_color(share, base):
+    change = (share - base) / max(share, base) if max(share, base) else 0.0
+    fade = int(round(210 * (1 - min(abs(change), 1.0))))
+    return 'rgb(255,%d,%d)' % (fade + 45, fade + 45) if change > 0 else 'rgb(%d,%d,255)' % (fade + 45, fade + 45)
+
+
+def svg(stacks, title, base=None):
+    """A flame graph of stacks; with base, colored by the change of each frame's share against it."""
+    root = _tree(stacks)
+    baseline = _tree(base) if base else None
+    depth = _depth(root)
+    height = depth * FRAME + 40
+    total = root['total'] or 1
+    rects = []
+
+    def draw(name, node, base_node, x, level):
+        width = node['total'] * WIDTH / total
+        if width < 0.1:
+            return
+        y = height - 10 - (level + 1) * FRAME
+        share = node['total'] / total
+        if baseline is not None:
+            base_share = base_node['total'] / (baseline['total'] or 1) if base_node else 0.0
+            color = _diff_color(share, base_share)
+            tip = '%s (%.2f%%, was %.2f%%)' % (name, 100 * share, 100 * base_share)
+        else:
+            color = _color(name)
+            tip = '%s (%d samples, %.2f%%)' % (name, node['total'], 100 * share)
+        label = name if len(name) * 7 < width else name[:max(int(width / 7) - 2, 0)] + '..'
+        rects.append('<g><title>%s</title><rect x="%.1f" y="%d" width="%.1f" height="%d" fill="%s" rx="2"/>'
+                     '%s</g>' % (html.escape(tip), x, y, width, FRAME - 1, color,
+                                 '<text x="%.1f" y="%d">%s</text>' % (x + 3, y + FRAME - 4, html.escape(label))
+                                 if width > 21 else ''))
+        for child_name, child in sorted(node['children'].items()):
+            draw(child_name, child, base_node['children'].get(child_name) if base_node else None, x, level + 1)
+            x += child['total'] * WIDTH / total
+
+    if root['total']:
+        draw('all', root, baseline, 0.0, 0)
+    return ('<?xml version="1.0" standalone="no"?>\n'
+            '<svg xmlns="http://www.w3.org/2000/svg" width="%d" height="%d" font-family="monospace" font-size="11">\n'
+            '<text x="%d" y="20" text-anchor="middle" font-size="15">%s</text>\n%s\n</svg>\n'
+            % (WIDTH, height, WIDTH // 2, html.escape(title), '\n'.join(rects)))
+
+
+def collect(runs_dir):
+    """{(engine, app, conf): {'values': parallelism, 'runs': count, 'stacks'}} of the profiled runs under runs_dir."""
+    groups = {}
+    for name in sorted(os.listdir(runs_dir)) if os.path.isdir(runs_dir) else []:
+        path = os.path.join(runs_dir, name)
+        if not all(os.path.exists(os.path.join(path, f)) for f in (COLLAPSED, snapshots.MANIFEST)):
+            continue
+        run = snapshots.load(path).run
+        group = groups.setdefault((run.engine, run.app, run.conf), {'values': run.values, 'runs': 0, 'stacks': {}})
+        group['runs'] += 1
+        group['stacks'] = merge([group['stacks'], load(os.path.join(path, COLLAPSED))])
+    return groups
+
+
+def baselines(groups):
+    """{(engine, app): conf} of the config with the lowest total parallelism of each app."""
+    lowest = {}
+    for (engine, app, conf), group in groups.items():
+        key = (sum(group['values']), conf)
+        if (engine, app) not in lowest or key < lowest[(engine, app)][0]:
+            lowest[(engine, app)] = (key, conf)
+    return {k: conf for k, (_, conf) in lowest.items()}
+
+
+def aggregate(runs_dir, out_dir=None):
+    """Write the summed stacks, flame graph and differential flame graph of every config; return collect()."""
+    groups = collect(runs_dir)
+    out_dir = out_dir or os.path.join(runs_dir, PROFILES_DIR)
+    if groups:
+        os.makedirs(out_dir, exist_ok=True)
+    bases = baselines(groups)
+    for (engine, app, conf), group in sorted(groups.items()):
+        prefix = os.path.join(out_dir, '%s-%s-%s' % (engine, app, conf))
+        save(group['stacks'], prefix + '.collapsed')
+        with open(prefix + '.svg', 'w') as f:
+            f.write(svg(group['stacks'], '%s %s %s, %d runs' % (engine, app, conf, group['runs'])))
+        base = bases[(engine, app)]
+        if base != conf:
+            with open(prefix + '-diff.svg', 'w') as f:
+                f.write(svg(group['stacks'], '%s %s %s against %s' % (engine, app, conf, base),
+                            groups[(engine, app, base)]['stacks']))
+    return groups
+
+
+def share(stacks, pattern):
+    """Share of the samples with a frame matching the regular expression pattern."""
+    total = sum(stacks.values())
+    regex = re.compile(pattern)
+    hits = sum(count for stack, count in stacks.items() if any(regex.search(f) for f in stack.split(';')))
+    return hits / total if total else 0.0
+
+
+def hottest(stacks, top=5):
+    """[(leaf frame, share of the samples)] of the frames with the most self samples."""
+    total = sum(stacks.values()) or 1
+    leaves = {}
+    for stack, count in stacks.items():
+        leaf = stack.rpartition(';')[2]
+        leaves[leaf] = leaves.get(leaf, 0) + count
+    return [(leaf, count / total) for leaf, count in sorted(leaves.items(), key=lambda l: -l[1])[:top]]
+
+
+def report(groups, patterns=(), top=3):
+    """Per app and config, the share of the samples in frames matching each pattern, or the hottest frames."""
+    apps = {}
+    for (engine, app, conf), group in groups.items():
+        apps.setdefault((engine, app), []).append((sum(group['values']), conf, group))
+    for (engine, app), configs in sorted(apps.items()):
+        yield '%s %s:' % (engine, app)
+        if patterns:
+            yield '  %-16s %10s' % ('conf', 'samples') + ''.join(' %14s' % p[:14] for p in patterns)
+        for _, conf, group in sorted(configs):
+            samples = sum(group['stacks'].values())
+            if patterns:
+                yield '  %-16s %10d' % (conf, samples) + ''.join(
+                    ' %13.1f%%' % (100 * share(group['stacks'], p)) for p in patterns)
+            else:
+                yield '  %-16s %10d  %s' % (conf, samples, ', '.join(
+                    '%s %.1f%%' % (leaf, 100 * s) for leaf, s in hottest(group['stacks'], top)))
@@ -0,0 +1,293 @@
+"""Reading and rewriting of Java .properties files.
+
+The application configs under src/main/resources/config are plain Java
+properties files. Updates keep every comment and unrelated line where it
+is and only touch the keys being overridden, so the files no longer need
+their last N lines in a fixed order.
+"""
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+
+_ESCAPES = {'t': '\t', 'n': '\n', 'r': '\r', 'f': '\f'}
+
+
+def _logical_lines(text):
+    """Yield (key, value, raw_lines) for each entry; comments have key None."""
+    lines = text.splitlines(keepends=True)
+    i = 0
+    while i < len(lines):
+        raw = [lines[i]]
+        stripped = lines[i].lstrip()
+        i += 1
+        if not stripped.strip() or stripped[0] in '#!':
+            yield None, None, raw
+            continue
+        logical = stripped.rstrip('\r\n')
+        # a line ending in an odd number of backslashes continues
+        while _continues(logical) and i < len(lines):
+            logical = logical[:-1] + lines[i].lstrip().rstrip('\r\n')
+            raw.append(lines[i])
+            i += 1
+        if _continues(logical):
+            logical = logical[:-1]
+        key, value = _split(logical)
+        yield key, value, raw
+
+
+def _continues(line):
+    count = len(line) - len(line.rstrip('\\'))
+    return count % 2 == 1
+
+
+def _split(line):
+    i = 0
+    while i < len(line):
+        c = line[i]
+        if c == '\\':
+            i += 2
+            continue
+        if c in '=: \t\f':
+            break
+        i += 1
+    key = line[:i]
+    rest = line[i:].lstrip(' \t\f')
+    if rest[:1] in ('=', ':'):
+        rest = rest[1:].lstrip(' \t\f')
+    return _unescape(key), _unescape(rest)
+
+
+def _unescape(s):
+    if '\\' not in s:
+        return s
+    out = []
+    i = 0
+    while i < len(s):
+        c = s[i]
+        if c == '\\' and i + 1 < len(s):
+            n = s[i + 1]
+            if n == 'u' and i + 6 <= len(s):
+                out.append(chr(int(s[i + 2:i + 6], 16)))
+                i += 6
+                continue
+            out.append(_ESCAPES.get(n, n))
+            i += 2
+            continue
+        out.append(c)
+        i += 1
+    return ''.join(out)
+
+
+def _escape_key(key):
+    return ''.join('\\' + c if c in '=: \t\\#!' else c for c in key)
+
+
+def loads(text):
+    """Parse properties text into a dict; later duplicates win, as in Java."""
+    props = {}
+    for key, value, _ in _logical_lines(text):
+        if key is not None:
+            props[key] = value
+    return props
+
+
+def load(path):
+    with open(path, encoding='latin-1') as f:
+        return loads(f.read())
+
+
+def render(text, overrides):
+    """Return text with overrides applied.
+
+    Existing entries are replaced in place (duplicates of an overridden key
+    are dropped) and keys that are not in the file yet are appended at the
+    end in the order they were given.
+    """
+    out = []
+    written = set()
+    # whether the file ends on an entry whose last line continues into what comes after it
+    dangling = False
+    for key, _, raw in _logical_lines(text):
+        dangling = False
+        if key is None or key not in overrides:
+            out.extend(raw)
+            dangling = key is not None and _continues(raw[-1].rstrip('\r\n'))
+            continue
+        if key in written:
+            continue
+        out.append('%s=%s\n' % (_escape_key(key), overrides[key]))
+        written.add(key)
+    missing = [k for k in overrides if k not in written]
+    if missing and out and not out[-1].endswith('\n'):
+        out[-1] += '\n'
+    if missing and dangling:
+        # an empty line ends the continuation, as in Properties.load
+        out.append('\n')
+    for key in missing:
+        out.append('%s=%s\n' % (_escape_key(key), overrides[key]))
+    return ''.join(out)
+
+
+def atomic_write(path, text):
+    """Replace path with text so readers never observe a half-written file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.')
+    try:
+        with os.fdopen(fd, 'w', encoding='latin-1') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def update(path, overrides):
+    """Apply overrides to the properties file at path in a single write."""
+    text = ''
+    if os.path.exists(path):
+        with open(path, encoding='latin-1') as f:
+            text = f.read()
+    atomic_write(path, render(text, overrides))
+
+
+def java_hash(s):
+    """String.hashCode() of s, as an unsigned 32-bit int."""
+    h = 0
+    data = s.encode('utf-16-le')
+    for i in range(0, len(data), 2):
+        h = (31 * h + (data[i] | data[i + 1] << 8)) & 0xFFFFFFFF
+    return h
+
+
+def _spread(h):
+    return h ^ (h >> 16)
+
+
+def _transfer(table):
+    """ConcurrentHashMap.transfer: split every bin into the doubled table.
+
+    Nodes after the last change of the new index bit keep their order;
+    those before it are prepended one by one, which reverses them.
+    """
+    n = len(table)
+    grown = [[] for _ in range(2 * n)]
+    for i, bin in enumerate(table):
+        if not bin:
+            continue
+        run_bit, last_run = bin[0][0] & n, 0
+        for j in range(1, len(bin)):
+            if bin[j][0] & n != run_bit:
+                run_bit, last_run = bin[j][0] & n, j
+        low, high = ([], bin[last_run:]) if run_bit else (bin[last_run:], [])
+        for node in bin[:last_run]:
+            if node[0] & n:
+                high = [node] + high
+            else:
+                low = [node] + low
+        grown[i], grown[i + n] = low, high
+    return grown
+
+
+def _hashmap_order(keys):
+    """Order of Properties.stringPropertyNames() on Java 9 and later.
+
+    Properties keeps its entries in a ConcurrentHashMap(8) filled in file
+    order; stringPropertyNames() copies them, in that map's iteration
+    order, into a default HashMap and returns its key set. Bins holding 8
+    or more colliding keys, which Java would treeify, are not modelled.
+    """
+    table = [[] for _ in range(16)]
+    count = 0
+    for key in keys:
+        h = _spread(java_hash(key)) & 0x7FFFFFFF
+        table[h & (len(table) - 1)].append((h, key))
+        count += 1
+        while count >= len(table) - (len(table) >> 2):
+            table = _transfer(table)
+    ordered = [key for bin in table for _, key in bin]
+    capacity = 16
+    while len(ordered) > capacity * 3 // 4:
+        capacity *= 2
+    # a HashMap bin keeps insertion order, also across resizes
+    return sorted(ordered, key=lambda k: _spread(java_hash(k)) & (capacity - 1))
+
+
+def _hashtable(keys):
+    """Hashtable() filled with keys in order, as a list of buckets."""
+    table = [[] for _ in range(11)]
+    count = 0
+    for key in keys:
+        if count >= int(len(table) * 0.75):
+            old = table
+            table = [[] for _ in range(2 * len(old) + 1)]
+            for bucket in reversed(old):
+                for k in bucket:
+                    table[(java_hash(k) & 0x7FFFFFFF) % len(table)].insert(0, k)
+        table[(java_hash(key) & 0x7FFFFFFF) % len(table)].insert(0, key)
+        count += 1
+    return table
+
+
+def _hashtable_order(keys):
+    """Order of Properties.stringPropertyNames() on Java 8: a Hashtable copied into another."""
+    def enumerate_keys(table):
+        return [k for bucket in reversed(table) for k in bucket]
+    return enumerate_keys(_hashtable(enumerate_keys(_hashtable(keys))))
+
+
+def java_release(java_home=None):
+    """Major version of the JVM Flink and the launchers would use, from its release file.
+
+    That is $JAVA_HOME, else the java on PATH; 11 when neither tells.
+    """
+    homes = []
+    java_home = java_home or os.environ.get('JAVA_HOME')
+    if java_home:
+        homes.append(java_home)
+    java = shutil.which('java')
+    if java:
+        bin_dir = os.path.dirname(os.path.realpath(java))
+        homes += [os.path.dirname(bin_dir), os.path.dirname(os.path.dirname(bin_dir))]
+    for home in homes:
+        try:
+            with open(os.path.join(home, 'release')) as f:
+                m = re.search(r'^JAVA_VERSION="(?:1\.)?(\d+)', f.read(), re.M)
+        except OSError:
+            continue
+        if m:
+            return int(m.group(1))
+    return 11
+
+
+_serialized = {}
+
+
+def serialize(path, java=None):
+    """The --config string the engine runners take, without starting a JVM.
+
+    Byte for byte what bin/lib/properties-serializer.jar prints: every
+    key=value in the order Properties.stringPropertyNames() returns them
+    on the given Java major version (default: java_release()), joined by
+    commas. Results are cached by the digest of the file.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    java = java or java_release()
+    key = (hashlib.sha256(data).hexdigest(), java >= 9)
+    if key not in _serialized:
+        props = loads(data.decode('latin-1'))
+        order = _hashmap_order if java >= 9 else _hashtable_order
+        _serialized[key] = ','.join('%s=%s' % (k, props[k]) for k in order(list(props)))
+    return _serialized[key]
+
+
+def serialize_with_jar(path, serializer_jar):
+    """What bin/lib/properties-serializer.jar itself prints, without the trailing newline."""
+    return subprocess.check_output(['java', '-jar', serializer_jar, path], text=True).rstrip('\r\n')
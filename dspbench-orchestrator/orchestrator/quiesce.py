@@ -0,0 +1,85 @@
+"""Waiting for the host to settle before a run, instead of a fixed sleep.
+
+A fixed pause is too short after a heavy run (executors still exiting,
+dirty pages still being written back, JVMs still shutting down) and
+wasted after a light one. A Gate samples the host once per interval and
+lets the next run start as soon as
+
+    load    the 1-minute load average per CPU
+    cpu     the share of CPU time spent busy during the interval
+    dirty   MB of page cache waiting for writeback
+
+are at or below their limits and no job process of the engine is left
+from the previous run, or once max_wait seconds have passed, in which
+case the run starts anyway and what was still busy is reported.
+"""
+import os
+import time
+
+from . import procs, storm, trace
+
+LIMITS = {'load': 0.5, 'cpu': 0.1, 'dirty': 64.0}
+MAX_WAIT = 120
+INTERVAL = 1.0
+# processes of a run that must be gone before the next one starts; the cluster daemons may stay
+LINGERING = {
+    'flink': ('org.apache.flink.client.cli.CliFrontend',),
+    'spark': ('org.apache.spark.deploy.SparkSubmit', 'CoarseGrainedExecutorBackend'),
+    'storm': (storm.RUNNER_CLASS, 'org.apache.storm.daemon.worker.Worker'),
+    'threads': ('org.dspbench.topology.impl.LocalTaskRunner',),
+}
+
+
+def parse_limits(text):
+    """{'load': 0.5, ...} from 'load=0.5,cpu=0.1,dirty=64'."""
+    limits = {}
+    for item in text.split(','):
+        name, sep, value = item.partition('=')
+        if not sep or name.strip() not in LIMITS:
+            raise ValueError('not a limit: %r (known: %s)' % (item, ', '.join(LIMITS)))
+        limits[name.strip()] = float(value)
+    return limits
+
+
+def sample(interval=INTERVAL, patterns=()):
+    """The load, CPU utilisation and dirty MB over interval seconds, and the lingering pids."""
+    busy, _, total = procs.cpu_times()
+    time.sleep(interval)
+    busy2, _, total2 = procs.cpu_times()
+    return {'load': round(procs.loadavg()[0] / (os.cpu_count() or 1), 3),
+            'cpu': round((busy2 - busy) / max(total2 - total, 1), 3),
+            'dirty': round(procs.meminfo('Dirty').get('Dirty', 0) / 1024.0, 1),
+            'processes': sorted(procs.find(*patterns)) if patterns else []}
+
+
+def over(state, limits):
+    """The measures of a sample that are above their limits."""
+    busy = [name for name, limit in sorted(limits.items()) if state[name] > limit]
+    if state['processes']:
+        busy.append('processes')
+    return busy
+
+
+class Gate:
+    def __init__(self, engine=None, limits=None, max_wait=MAX_WAIT, interval=INTERVAL):
+        self.engine = engine
+        self.limits = dict(LIMITS, **(limits or {}))
+        self.max_wait = max_wait
+        self.interval = interval
+
+    def wait(self, tracer=trace.NULL, run=None):
+        """Block until the host is quiet or max_wait passed; True if it got quiet."""
+        if self.max_wait <= 0:
+            return True
+        start = time.monotonic()
+        with tracer.span('quiesce', run) as span:
+            while True:
+                state = sample(self.interval, LINGERING.get(self.engine, ()))
+                busy = over(state, self.limits)
+                if not busy or time.monotonic() - start >= self.max_wait:
+                    break
+            span.update(state, over=busy)
+        if busy:
+            print("host still busy after %.0fs (%s), starting anyway"
+                  % (time.monotonic() - start, ', '.join('%s %s' % (b, state[b]) for b in busy)))
+        return not busy
@@ -0,0 +1,169 @@
+"""Sampling the host and the engine's JVMs once per second while a run lasts.
+
+The sink throughput says how fast a config was, not whether it was short
+of CPU, memory, network or disk. A Sampler reads /proc/stat,
+/proc/meminfo, /proc/net/dev, /proc/diskstats and the /proc/<pid>/stat
+and status of the engine's JVMs on every whole second and appends what
+changed since the previous one to two files next to the run's
+-received.csv files:
+
+    resources.csv  time,cpu,iowait,mem_available_kb,net_rx,net_tx,disk_read,disk_write
+    jvms.csv       time,role,pid,cpu,rss_kb,threads
+
+cpu and iowait are shares of all CPUs, the network and disk columns bytes
+per second, and a JVM's cpu the cores it kept busy. A row's time is the
+unix second the interval started, the key Metrics.java gives the tuples
+received during that second, so the files join the operator metrics on
+time. Only processes on this host are seen; on a cluster each host needs
+its own sampler.
+"""
+import csv
+import math
+import os
+import time
+
+from . import flink, metrics, procs, stats, storm
+
+# {role: command line pattern} of the JVMs of each engine
+JVMS = {
+    'flink': {'jobmanager': flink.JOBMANAGER_CLASS, 'taskmanager': flink.TASKMANAGER_CLASS},
+    'spark': {'driver': 'org.apache.spark.deploy.SparkSubmit',
+              'am': 'org.apache.spark.deploy.yarn.ExecutorLauncher',
+              'executor': 'CoarseGrainedExecutorBackend'},
+    'storm': {'nimbus': 'org.apache.storm.daemon.nimbus.Nimbus',
+              'supervisor': 'org.apache.storm.daemon.supervisor.Supervisor',
+              'worker': 'org.apache.storm.daemon.worker.Worker', 'local': storm.RUNNER_CLASS},
+    'threads': {'runner': 'org.dspbench.topology.impl.LocalTaskRunner'},
+}
+HOST_FILE = 'resources.csv'
+JVM_FILE = 'jvms.csv'
+HOST_COLUMNS = ('time', 'cpu', 'iowait', 'mem_available_kb', 'net_rx', 'net_tx', 'disk_read', 'disk_write')
+JVM_COLUMNS = ('time', 'role', 'pid', 'cpu', 'rss_kb', 'threads')
+# seconds between looking for JVMs that came up since; a scan reads every command line in /proc
+RESCAN = 5
+_TICKS = os.sysconf('SC_CLK_TCK')
+
+
+def _append(path, columns, rows):
+    header = not os.path.exists(path)
+    with open(path, 'a', newline='') as f:
+        writer = csv.writer(f)
+        if header:
+            writer.writerow(columns)
+        writer.writerows(rows)
+
+
+class Sampler:
+    """Appends one row per second of the host and of each JVM of roles to the files under directory.
+
+    With scope, only JVMs whose command line also holds it are sampled,
+    such as the conf dir of a private cluster or the run's metrics output
+    in a config string, to tell the JVMs of runs side by side apart.
+    """
+
+    def __init__(self, directory, roles=None, rescan=RESCAN, scope=None):
+        self.directory = directory
+        self.roles = roles or {}
+        self.scope = scope
+        self.rescan = rescan
+        self.pids = {}
+        self.scanned = None
+        self.previous = None
+
+    def delay(self):
+        """Seconds until the whole second after the nearest one, so an early wake-up does not sample twice."""
+        now = time.time()
+        return math.floor(now + 0.5) + 1 - now
+
+    def _find(self, now):
+        if not self.roles or (self.scanned is not None and now - self.scanned < self.rescan):
+            return
+        self.scanned = now
+        for pid, line in procs.find(*self.roles.values()).items():
+            if pid not in self.pids and (self.scope is None or self.scope in line):
+                self.pids[pid] = next(role for role, pattern in self.roles.items() if pattern in line)
+
+    def _counters(self):
+        return {'time': time.time(), 'cpu': procs.cpu_times(), 'net': procs.net_bytes(),
+                'disk': procs.disk_bytes(), 'ticks': {pid: procs.pid_ticks(pid) for pid in self.pids}}
+
+    def sample(self):
+        """Read the counters and append the rates since the previous sample; the first one only starts them."""
+        self._find(time.time())
+        current = self._counters()
+        previous, self.previous = self.previous, current
+        elapsed = current['time'] - previous['time'] if previous is not None else 0
+        if elapsed <= 0:
+            return
+        second = int(round(previous['time']))
+        busy, iowait, total = (c - p for c, p in zip(current['cpu'], previous['cpu']))
+        total = max(total, 1)
+        host = [second, round(busy / total, 4), round(iowait / total, 4),
+                procs.meminfo('MemAvailable').get('MemAvailable')]
+        host += [int((c - p) / elapsed) for c, p in zip(current['net'] + current['disk'],
+                                                        previous['net'] + previous['disk'])]
+        jvms = []
+        for pid, role in sorted(self.pids.items()):
+            ticks, before = current['ticks'].get(pid), previous['ticks'].get(pid)
+            if ticks is None:
+                # gone; a JVM started again under a new pid turns up with the next scan
+                del self.pids[pid]
+                continue
+            if before is None:
+                continue
+            status = procs.pid_status(pid, 'VmRSS', 'Threads')
+            jvms.append([second, role, pid, round((ticks - before) / _TICKS / elapsed, 3),
+                         status.get('VmRSS'), status.get('Threads')])
+        os.makedirs(self.directory, exist_ok=True)
+        _append(os.path.join(self.directory, HOST_FILE), HOST_COLUMNS, [host])
+        if jvms:
+            _append(os.path.join(self.directory, JVM_FILE), JVM_COLUMNS, jvms)
+
+
+def load(path):
+    """The rows of a sampler file as dicts of numbers (role stays text); empty if there is none."""
+    rows = []
+    if not os.path.exists(path):
+        return rows
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            try:
+                rows.append({k: v if k == 'role' else float(v) for k, v in row.items() if v not in ('', None)})
+            except ValueError:
+                continue
+    return rows
+
+
+def window(metrics_output):
+    """(first, last) unix second of the sink buckets the throughput is computed from, or None."""
+    return metrics.span(metrics.buckets(metrics.sink_files(metrics_output)))
+
+
+def summary(metrics_output):
+    """Means of the samples within the run's throughput window (all of them without one), or {}.
+
+    {'seconds', 'cpu', 'iowait', 'net_mb_s', 'disk_mb_s', 'jvm_cores': the
+    cores all JVMs kept busy, 'jvm_rss_mb': the most memory they held}.
+    """
+    span = window(metrics_output)
+
+    def inside(row):
+        return span is None or span[0] <= row['time'] <= span[1]
+
+    host = [r for r in load(os.path.join(metrics_output, HOST_FILE)) if inside(r)]
+    if not host:
+        return {}
+    fields = {'seconds': len(host),
+              'cpu': round(stats.mean([r['cpu'] for r in host]), 3),
+              'iowait': round(stats.mean([r['iowait'] for r in host]), 3),
+              'net_mb_s': round(stats.mean([r['net_rx'] + r['net_tx'] for r in host]) / 1e6, 2),
+              'disk_mb_s': round(stats.mean([r['disk_read'] + r['disk_write'] for r in host]) / 1e6, 2)}
+    cores, rss = {}, {}
+    for row in load(os.path.join(metrics_output, JVM_FILE)):
+        if inside(row):
+            cores[row['time']] = cores.get(row['time'], 0) + row.get('cpu', 0)
+            rss[row['time']] = rss.get(row['time'], 0) + row.get('rss_kb', 0)
+    if cores:
+        fields['jvm_cores'] = round(stats.mean(list(cores.values())), 2)
+        fields['jvm_rss_mb'] = round(max(rss.values()) / 1024, 1)
+    return fields
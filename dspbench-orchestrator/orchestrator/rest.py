@@ -0,0 +1,24 @@
+"""Minimal JSON-over-HTTP client for the engines' REST APIs."""
+import json
+import urllib.error
+import urllib.request
+
+# what a request to an endpoint that is down or restarting raises
+UNAVAILABLE = (urllib.error.URLError, ConnectionError, TimeoutError, ValueError)
+
+
+class JsonClient:
+    def __init__(self, url, timeout=2.0):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+
+    def request(self, method, path, body=None):
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(self.url + path, data=data, method=method,
+                                     headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+            payload = resp.read()
+        return json.loads(payload) if payload else {}
+
+    def get(self, path):
+        return self.request('GET', path)
@@ -0,0 +1,301 @@
+"""Supervising a launcher with asyncio.
+
+The launcher script runs as a child process in its own session. While it
+runs, its combined stdout/stderr is streamed line by line to the console
+and the run's job.log, the lines are scanned for the job's identifiers,
+the metrics output directory is tailed and system stats are sampled. All
+of it ends up in one record, saved as record.json in the run directory.
+A resources.Sampler, if given, writes its per-second samples of the host
+and the engine's JVMs next to the metrics as well, and a
+profiling.Profiler profiles the worker JVMs once the job is steady.
+
+Ctrl-C cancels the supervising task. The launcher's process group is then
+terminated and the on_cancel hook may clean up what the launcher started
+elsewhere, such as a job it submitted to a cluster. The record is written
+in every case, with state "cancelled" after an interrupt.
+
+With a probe, the watchdog aborts a run whose job failed or stays idle
+(see watchdog); it is stopped like a cancelled one and left in state
+"aborted". Every run that did not end cleanly gets a classified
+record['failure'].
+"""
+import asyncio
+import glob
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+from . import procs, watchdog
+
+INTERVAL = 5.0
+TERMINATE_GRACE = 10.0
+
+
+async def _pump(stream, log, patterns, record, echo):
+    while True:
+        raw = await stream.readline()
+        if not raw:
+            return
+        line = raw.decode(errors='replace')
+        log.write(line)
+        log.flush()
+        if echo:
+            sys.stdout.write(line)
+            sys.stdout.flush()
+        record['lines'] += 1
+        for name, pattern in patterns.items():
+            if name not in record['ids']:
+                m = pattern.search(line)
+                if m:
+                    record['ids'][name] = m.group(1)
+                    record['clock'][name] = time.monotonic()
+                    print('%s: %s' % (name, m.group(1)))
+
+
+async def _tail_metrics(path, record, interval):
+    """Follow the -received.csv files under path as they grow."""
+    offsets = {}
+    counts = {}
+    while True:
+        for csv_path in glob.glob(os.path.join(path, '*-received.csv')):
+            try:
+                with open(csv_path, 'rb') as f:
+                    f.seek(offsets.get(csv_path, 0))
+                    chunk = f.read()
+            except OSError:
+                continue
+            # leave a line that is still being written for the next round
+            complete = chunk[:chunk.rfind(b'\n') + 1]
+            offsets[csv_path] = offsets.get(csv_path, 0) + len(complete)
+            rows, tuples = counts.get(csv_path, (0, 0))
+            for line in complete.decode(errors='replace').splitlines():
+                parts = line.split(',')
+                if len(parts) >= 2 and parts[1].strip().isdigit():
+                    rows += 1
+                    tuples += int(parts[1])
+            counts[csv_path] = (rows, tuples)
+        record['metrics'].append({
+            'time': round(time.time(), 3),
+            'files': {os.path.basename(p): {'rows': r, 'tuples': t} for p, (r, t) in counts.items()},
+        })
+        await asyncio.sleep(interval)
+
+
+async def _sample_system(record, interval):
+    previous = procs.cpu_times()
+    while True:
+        await asyncio.sleep(interval)
+        busy, iowait, total = procs.cpu_times()
+        load = procs.loadavg()[0]
+        mem = procs.meminfo('MemAvailable', 'Dirty')
+        elapsed = max(total - previous[2], 1)
+        record['system'].append({
+            'time': round(time.time(), 3),
+            'cpu': round((busy - previous[0]) / elapsed, 4),
+            'iowait': round((iowait - previous[1]) / elapsed, 4),
+            'load1': load,
+            'mem_available_kb': mem.get('MemAvailable'),
+            'dirty_kb': mem.get('Dirty'),
+        })
+        previous = busy, iowait, total
+
+
+async def _sample_resources(sampler):
+    while True:
+        await asyncio.sleep(sampler.delay())
+        sampler.sample()
+
+
+async def _profile(profiler, record):
+    # the window opens delay seconds after the job was accepted, or after the launch without an id to go by
+    start = record['clock']['start']
+    while not record['ids'] and time.monotonic() - start < profiler.delay:
+        await asyncio.sleep(1)
+    accepted = [t for name, t in record['clock'].items() if name in record['ids']]
+    await asyncio.sleep(max(0.0, min(accepted or [start]) + profiler.delay - time.monotonic()))
+    record['profile'] = await _in_thread(profiler.record)
+
+
+class _Abort(Exception):
+    pass
+
+
+async def _watch(probe, record, grace, interval):
+    """Probe the job until there is a reason to abort it, and return that reason."""
+    start = time.monotonic()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            tuples, error = await _in_thread(probe, record)
+        except Exception as e:
+            # learned nothing, which the watchdog counts like a probe that found no job
+            print('probe failed: %s' % e)
+            tuples, error = None, None
+        else:
+            record['tuples'] = tuples
+        reason = watchdog.check(record, tuples, error, time.monotonic() - start, grace)
+        if reason:
+            return reason
+
+
+async def _guarded(aw, guard, timeout=None):
+    """Await aw, unless the watchdog task guard comes up with a reason to abort first."""
+    if guard is None:
+        return await asyncio.wait_for(aw, timeout)
+    task = asyncio.ensure_future(aw)
+    done, _ = await asyncio.wait([task, guard], timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    if task in done:
+        return task.result()
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    if guard in done:
+        raise _Abort(guard.result())
+    raise asyncio.TimeoutError
+
+
+def _in_thread(fn, *args):
+    """Run a blocking function in a daemon thread so an interrupt need not wait for it."""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def settle(method, value):
+        if not future.done():
+            method(value)
+
+    def target():
+        try:
+            result = fn(*args)
+        except BaseException as e:
+            outcome = (future.set_exception, e)
+        else:
+            outcome = (future.set_result, result)
+        try:
+            loop.call_soon_threadsafe(settle, *outcome)
+        except RuntimeError:
+            # the loop is gone after an interrupt
+            pass
+
+    threading.Thread(target=target, daemon=True).start()
+    return future
+
+
+async def _terminate(proc, grace=TERMINATE_GRACE):
+    if proc.returncode is not None:
+        return
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+        await asyncio.wait_for(proc.wait(), grace)
+    except asyncio.TimeoutError:
+        os.killpg(proc.pid, signal.SIGKILL)
+        await proc.wait()
+    except ProcessLookupError:
+        pass
+
+
+async def _communicate(proc, log_path, patterns, record, echo):
+    with open(log_path, 'a') as log:
+        await _pump(proc.stdout, log, patterns, record, echo)
+    return await proc.wait()
+
+
+async def supervise(cmd, record, log_path, patterns=None, metrics_output=None, after=None,
+                    on_cancel=None, timeout=None, probe=None, grace=watchdog.GRACE, interval=INTERVAL,
+                    echo=True, cwd=None, env=None, sampler=None, profiler=None):
+    """Run cmd to completion while collecting everything about it in record.
+
+    after(record), if given, is called in a thread once the launcher exited
+    successfully, for launchers that only submit the job; the run lasts
+    until it returns and its result is kept as record['after']. A launcher
+    still running after timeout seconds is terminated, on_cancel cancels the
+    job it started and the record is marked timed_out, for runs bounded by
+    a runtime and jobs that would otherwise run forever.
+
+    probe(record), if given, returns (tuples received so far, error) of
+    the job, either None while unknown; on_cancel also cleans up after an
+    abort. sampler is a resources.Sampler to run once per second,
+    profiler a profiling.Profiler to run once in the steady state; a run
+    that ends before its window has no record['profile'].
+    """
+    samplers = [asyncio.ensure_future(_sample_system(record, interval))]
+    if sampler is not None:
+        samplers.append(asyncio.ensure_future(_sample_resources(sampler)))
+    if metrics_output is not None:
+        samplers.append(asyncio.ensure_future(_tail_metrics(metrics_output, record, interval)))
+    proc = await asyncio.create_subprocess_exec(*cmd, stdout=asyncio.subprocess.PIPE,
+                                                stderr=asyncio.subprocess.STDOUT,
+                                                cwd=cwd, env=env, start_new_session=True)
+    record['pid'] = proc.pid
+    record.setdefault('clock', {})['start'] = time.monotonic()
+    guard = None
+    if probe is not None:
+        guard = asyncio.ensure_future(_watch(probe, record, grace, interval))
+        samplers.append(guard)
+    if profiler is not None:
+        samplers.append(asyncio.ensure_future(_profile(profiler, record)))
+    try:
+        try:
+            record['exit_code'] = await _guarded(
+                _communicate(proc, log_path, patterns or {}, record, echo), guard, timeout)
+        except asyncio.TimeoutError:
+            record['timed_out'] = True
+            await _terminate(proc)
+            record['exit_code'] = proc.returncode
+            # a job the launcher submitted outlives it
+            if on_cancel is not None:
+                on_cancel(record)
+        if after is not None and record['exit_code'] == 0:
+            record['after'] = await _guarded(_in_thread(after, record), guard)
+        record['state'] = 'finished'
+    except _Abort as e:
+        record['state'] = 'aborted'
+        record['abort'] = str(e)
+        print('aborting run: %s' % e)
+        await _terminate(proc)
+        if record['exit_code'] is None:
+            record['exit_code'] = proc.returncode
+        if on_cancel is not None:
+            on_cancel(record)
+    except asyncio.CancelledError:
+        record['state'] = 'cancelled'
+        await _terminate(proc)
+        if on_cancel is not None:
+            on_cancel(record)
+        raise
+    except BaseException as e:
+        record['state'] = 'failed'
+        record['error'] = str(e)
+        await _terminate(proc)
+        raise
+    finally:
+        for task in samplers:
+            task.cancel()
+        await asyncio.gather(*samplers, return_exceptions=True)
+        record['ended'] = round(time.time(), 3)
+        record['clock']['end'] = time.monotonic()
+        record['failure'] = watchdog.diagnose(record, log_path)
+    return record
+
+
+def run(cmd, log_path, record_path, live=None, **kwargs):
+    """Blocking entry point for the drivers; returns the record.
+
+    live(record), if given, gets the record before the launch, to follow
+    the run while it lasts (see exporter). KeyboardInterrupt still reaches
+    the caller, after the launcher was stopped and the record written.
+    """
+    record = {'cmd': list(cmd), 'started': round(time.time(), 3), 'state': 'running',
+              'pid': None, 'exit_code': None, 'ids': {}, 'lines': 0, 'metrics': [], 'system': [],
+              # monotonic times of the launch, of each id turning up and of the end, for tracing
+              'clock': {}}
+    if live is not None:
+        live(record)
+    try:
+        asyncio.run(supervise(cmd, record, log_path, **kwargs))
+    finally:
+        with open(record_path, 'w') as f:
+            json.dump(record, f, indent=2, default=str)
+            f.write('\n')
+    return record
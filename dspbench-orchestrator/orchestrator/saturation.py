@@ -0,0 +1,153 @@
+"""Saturation search: the highest input rate each config sustains.
+
+A normal sweep measures a config with its sources reading as fast as
+they can, which says what the config processes flat out but not at which
+input rate it starts to build backpressure. Here the sources of the app
+are swapped for the engine's rate-limited file source and every
+(app, config) is probed at controlled rates, one probe per config and
+round: the rate doubles from start_rate until a probe is not sustained,
+then the range between the highest sustained and the lowest unsustained
+rate is halved until it is narrower than precision (relative to its top).
+The highest sustained rate is the config's capacity.
+
+A probe is sustained when every operator that writes a -received.csv
+file
+
+ - kept its rate up: the second half of the run is within tolerance of
+   the first, so no queue was filling up;
+ - kept up with the offered rate: its tuples per offered tuple are within
+   tolerance of the lowest sustained probe of the config, whose rates are
+   taken as what the operators get when nothing holds them back. That
+   makes start_rate a rate the config surely sustains.
+"""
+from . import journal, metrics, sweep
+
+# the rate-limited source of each engine, reading *.source.path in a loop for *.runtime_sec
+RATE_SOURCES = {'flink': 'flink.source.InfSource'}
+TOLERANCE = 0.05
+# operators receiving less than this per offered tuple (windowed sinks) are left out of the comparison
+MIN_GAIN = 0.001
+
+
+def judge(offered, metrics_output, reference=None, tolerance=TOLERANCE):
+    """(sustained, tuples received per offered tuple by operator, why not)."""
+    gains = {}
+    lagging = []
+    for operator, path in sorted(metrics.received_files(metrics_output).items()):
+        totals = metrics.buckets([path])
+        halves = metrics.halves(totals)
+        if halves is None:
+            continue
+        first, second = halves
+        gains[operator] = metrics.throughput(totals) / offered
+        if second < (1 - tolerance) * first:
+            lagging.append('%s slowed down from %.0f to %.0f tuples/s' % (operator, first, second))
+        expected = (reference or {}).get(operator, 0)
+        if expected > MIN_GAIN and gains[operator] < (1 - tolerance) * expected:
+            lagging.append('%s got %.0f of %.0f tuples/s' % (operator, gains[operator] * offered, expected * offered))
+    if not gains:
+        return False, gains, 'no operator metrics in %s' % metrics_output
+    return not lagging, gains, '; '.join(lagging)
+
+
+class Config:
+    """The probes of one (app, parallelism) config so far."""
+
+    def __init__(self, app, values):
+        self.app = app
+        self.values = values
+        self.probes = []
+        self.low = None
+        self.high = None
+        self.reference = None
+
+    def add(self, rate, sustained, gains):
+        self.probes.append((rate, sustained))
+        if sustained:
+            if self.low is None or rate < min(r for r, s in self.probes[:-1] if s):
+                self.reference = gains
+            self.low = max(self.low or 0, rate)
+        else:
+            self.high = rate if self.high is None else min(self.high, rate)
+
+
+class Plan:
+    def __init__(self, spec, apps=None, start_rate=1000, runtime=60, precision=0.05, max_probes=12,
+                 tolerance=TOLERANCE):
+        if spec['engine'] not in RATE_SOURCES:
+            raise ValueError('%s has no rate-limited source to probe with' % spec['engine'])
+        self.spec = dict(spec, exec='saturate')
+        self.source = RATE_SOURCES[spec['engine']]
+        self.start_rate = start_rate
+        self.runtime = runtime
+        self.precision = precision
+        self.max_probes = max_probes
+        self.tolerance = tolerance
+        self.configs = {}
+        for app in spec['apps']:
+            if apps is not None and app['name'] not in apps:
+                continue
+            for values in sweep.unique_grid(app):
+                self.configs[(app['name'], sweep.conf_label(values))] = Config(app, values)
+        self.probing = {}
+
+    def next_rate(self, config):
+        """The rate to probe the config at next, or None once it is done."""
+        if len(config.probes) >= self.max_probes:
+            return None
+        if config.high is None:
+            return self.start_rate if config.low is None else config.low * 2
+        if config.low is None:
+            # not even the start rate held; halve it, down to one tuple per second
+            return config.high // 2 or None
+        if config.high - config.low <= self.precision * config.high:
+            return None
+        rate = (config.low + config.high) // 2
+        return rate if config.low < rate < config.high else None
+
+    def probe(self, config, rate):
+        run = sweep.make_run(self.spec, config.app, config.values, len(config.probes) + 1)
+        run.runtime = self.runtime
+        sources = [k[:-len('.source.class')] for k in sweep.resolved(run) if k.endswith('.source.class')]
+        for prefix in sources:
+            run.overrides[prefix + '.source.class'] = self.source
+            run.overrides[prefix + '.source.rate'] = rate
+            run.overrides[prefix + '.runtime_sec'] = self.runtime
+        run.overrides['metrics.onlySink'] = 'false'
+        self.probing[journal.key(run)] = (config, rate)
+        return run
+
+    def next_round(self):
+        """One probe of every config that is not done yet."""
+        runs = []
+        for config in self.configs.values():
+            rate = self.next_rate(config)
+            if rate is not None:
+                runs.append(self.probe(config, int(rate)))
+        return runs
+
+    def add(self, run, throughput):
+        """Judge a finished probe; throughput None means it failed, which counts as not sustained."""
+        config, rate = self.probing.pop(journal.key(run), (None, None))
+        if config is None:
+            return
+        if throughput is None:
+            sustained, gains, reason = False, {}, 'the run failed'
+        else:
+            sustained, gains, reason = judge(rate, run.metrics_output, config.reference, self.tolerance)
+        config.add(rate, sustained, gains)
+        print('%s %s at %d tuples/s: %s' % (run.app, run.conf, rate, 'sustained' if sustained else reason))
+
+    def capacities(self):
+        """{(app, conf): the highest sustained rate, or None}."""
+        return {key: config.low for key, config in self.configs.items()}
+
+    def report(self):
+        for (app, conf), config in self.configs.items():
+            if config.low is None:
+                yield '%s %s: not even %s tuples/s sustained' % (app, conf, config.high)
+            elif config.high is None:
+                yield '%s %s: capacity at least %d tuples/s, every probe was sustained' % (app, conf, config.low)
+            else:
+                yield '%s %s: capacity %d tuples/s (%d not sustained, %d probes)' % (
+                    app, conf, config.low, config.high, len(config.probes))
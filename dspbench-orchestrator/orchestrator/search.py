@@ -0,0 +1,144 @@
+"""Parallelism search by successive halving.
+
+Hand-picked grids do not scale to apps like voipstream with 13 stages.
+The search treats the *.threads key of every stage as one dimension and
+only looks at configs whose threads add up to at most a core budget.
+
+Each bracket starts with eta ** rungs candidate configs (the grid rows of
+sweep.json that fit the budget first; after that half random ones and
+half neighbours of the best config found so far) run for
+min_runtime seconds. The best 1/eta by sink throughput are run again for
+eta times as long, and so on while the runtime stays within max_runtime.
+Brackets follow each other until the next rung no longer fits in the
+time budget; the result is the best config of the longest rung reached.
+"""
+import math
+import random
+import time
+
+from . import sweep
+
+
+class Space:
+    """Parallelism configs of the given stages using at most cores threads."""
+
+    def __init__(self, stages, cores):
+        if cores < len(stages):
+            raise ValueError('a budget of %d cores cannot give each of %d stages a thread'
+                             % (cores, len(stages)))
+        self.stages = stages
+        self.cores = cores
+
+    def contains(self, values):
+        return len(values) == len(self.stages) and min(values) >= 1 and sum(values) <= self.cores
+
+    def sample(self, rng):
+        """A random config: spare cores are handed out one by one to random stages."""
+        values = [1] * len(self.stages)
+        for _ in range(rng.randint(0, self.cores - len(self.stages))):
+            values[rng.randrange(len(values))] += 1
+        return tuple(values)
+
+    def neighbour(self, values, rng):
+        """values with one thread moved to another stage, or added if the budget allows."""
+        values = list(values)
+        to = rng.randrange(len(values))
+        donors = [i for i, v in enumerate(values) if v > 1 and i != to]
+        if sum(values) < self.cores and (not donors or rng.random() < 0.5):
+            values[to] += 1
+        elif donors:
+            values[rng.choice(donors)] -= 1
+            values[to] += 1
+        return tuple(values)
+
+
+def runtime_key(app):
+    """The property bounding how long an app's source runs, e.g. wc.runtime_sec."""
+    return app.get('runtime_key', app['stages'][0].split('.')[0] + '.runtime_sec')
+
+
+class Plan:
+    def __init__(self, spec, app, cores, time_budget, min_runtime=30, max_runtime=270, eta=3, seed=None):
+        self.spec = dict(spec, exec='search')
+        self.app = app
+        self.space = Space(app['stages'], cores)
+        self.deadline = time.monotonic() + time_budget
+        self.eta = eta
+        self.runtimes = [min_runtime]
+        while self.runtimes[-1] * eta <= max_runtime:
+            self.runtimes.append(self.runtimes[-1] * eta)
+        self.rng = random.Random(seed)
+        self.seeds = [sweep.full_values(app, v) for v in sweep.unique_grid(app)]
+        self.seeds = [v for v in self.seeds if self.space.contains(v)]
+        self.results = {}
+        self.trial = 0
+        self.batch = None
+        self._new_bracket()
+
+    def _new_bracket(self):
+        n = self.eta ** (len(self.runtimes) - 1)
+        tried = {values for values, _ in self.results}
+        alive = []
+        while self.seeds and len(alive) < n:
+            values = self.seeds.pop(0)
+            if values not in tried and values not in alive:
+                alive.append(values)
+        best = self.best()
+        misses = 0
+        while len(alive) < n and misses < 100 * n:
+            if best is not None and self.rng.random() < 0.5:
+                values = self.space.neighbour(best[0], self.rng)
+            else:
+                values = self.space.sample(self.rng)
+            if values in tried or values in alive:
+                misses += 1
+                continue
+            alive.append(values)
+        self.alive = alive
+        self.rung = 0
+
+    def _promote(self):
+        runtime = self.runtimes[self.rung]
+        scored = [(self.results.get((values, runtime)), values) for values in self.alive]
+        scored = sorted([s for s in scored if s[0] is not None], reverse=True)
+        keep = max(1, math.ceil(len(self.alive) / self.eta))
+        self.alive = [values for _, values in scored[:keep]]
+        self.rung += 1
+        if self.rung == len(self.runtimes) or not self.alive:
+            self._new_bracket()
+
+    def add(self, run, throughput):
+        if throughput is not None:
+            self.results[(run.values, run.runtime)] = throughput
+
+    def next_round(self):
+        """The runs of the next rung, or nothing once the time budget is spent."""
+        if self.batch is not None:
+            self._promote()
+        runtime = self.runtimes[self.rung]
+        if not self.alive or time.monotonic() + runtime > self.deadline:
+            return []
+        self.batch = []
+        for values in self.alive:
+            self.trial += 1
+            run = sweep.make_run(self.spec, self.app, values, self.trial)
+            run.runtime = runtime
+            run.overrides[runtime_key(self.app)] = runtime
+            self.batch.append(run)
+        return self.batch
+
+    def best(self):
+        """(values, runtime, throughput) of the best config of the longest rung reached."""
+        if not self.results:
+            return None
+        (values, runtime), throughput = max(self.results.items(), key=lambda r: (r[0][1], r[1]))
+        return values, runtime, throughput
+
+    def report(self):
+        ranked = sorted(self.results.items(), key=lambda r: (r[0][1], r[1]), reverse=True)
+        for (values, runtime), throughput in ranked[:10]:
+            yield '%s %s (%d cores): %.1f tuples/s over %ds' % (
+                self.app['name'], list(values), sum(values), throughput, runtime)
+        best = self.best()
+        if best is not None:
+            yield 'best: ' + ', '.join('%s=%d' % kv for kv in zip(self.app['stages'], best[0]))
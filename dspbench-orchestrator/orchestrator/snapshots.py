@@ -0,0 +1,92 @@
+"""Per-run config snapshots.
+
+Every run gets a directory of its own, named by its run ID, holding the
+fully resolved .properties file the launcher is given and a run.json
+manifest describing the run. The snapshot is written once and made
+read-only, so the app configs in the source tree are never edited and
+any past run can be replayed from its directory alone.
+"""
+import dataclasses
+import datetime
+import json
+import os
+import stat
+import uuid
+
+from . import sweep
+
+MANIFEST = 'run.json'
+
+
+class Snapshot:
+    def __init__(self, run_id, path, run):
+        self.run_id = run_id
+        self.path = path
+        self.run = run
+
+    @property
+    def config(self):
+        return os.path.join(self.path, self.run.app + '.properties')
+
+    def file(self, name):
+        return os.path.join(self.path, name)
+
+
+def new_run_id(run):
+    stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+    return '%s-%s-%s-r%d-%s-%s' % (run.engine, run.app, run.conf, run.repetition,
+                                   stamp, uuid.uuid4().hex[:6])
+
+
+def _freeze(path):
+    mode = os.stat(path).st_mode
+    os.chmod(path, mode & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+
+
+def create(run, root):
+    """Create the run directory under root with the run's resolved config.
+
+    The run's metrics go to a folder named by the run ID under its
+    metrics_base, so a rerun never adds to the files of an earlier attempt.
+    """
+    run_id = new_run_id(run)
+    path = os.path.join(root, run_id)
+    os.makedirs(path)
+    # runs recorded before metrics_base existed wrote straight into their config's folder
+    run.metrics_base = run.metrics_base or run.metrics_output
+    run.metrics_output = os.path.join(run.metrics_base, run_id) + '/'
+    run.overrides['metrics.output'] = run.metrics_output
+    snap = Snapshot(run_id, path, run)
+    sweep.render(run, snap.config)
+    with open(snap.file(MANIFEST), 'w') as f:
+        json.dump(dict(dataclasses.asdict(run), run_id=run_id,
+                       created=datetime.datetime.now().isoformat()), f, indent=2)
+        f.write('\n')
+    _freeze(snap.config)
+    _freeze(snap.file(MANIFEST))
+    return snap
+
+
+def load(path):
+    """Reopen an existing run directory."""
+    path = os.path.abspath(path)
+    with open(os.path.join(path, MANIFEST)) as f:
+        data = json.load(f)
+    run_id = data.pop('run_id')
+    data.pop('created', None)
+    fields = {f.name for f in dataclasses.fields(sweep.Run)}
+    run = sweep.Run(**{k: v for k, v in data.items() if k in fields})
+    run.stages = tuple(run.stages)
+    run.values = tuple(run.values)
+    return Snapshot(run_id, path, run)
+
+
+def replay(path):
+    """The run recorded in a run directory, set up to reproduce its config exactly.
+
+    create() on the returned run renders the old snapshot again, which
+    already carries every override, into a new run directory.
+    """
+    snap = load(path)
+    snap.run.config_path = snap.config
+    return snap.run
@@ -0,0 +1,98 @@
+"""Spark Streaming job submission."""
+import re
+import subprocess
+
+from .rest import UNAVAILABLE, JsonClient
+
+RUNNER_CLASS = 'spark.streaming.StruturedStreamingRunner'
+UI_PORT_BASE = 4040
+DEFAULT_RM = 'http://localhost:8088'
+# logged by spark-submit when YARN accepted the application
+APP_ID = re.compile(r'\b(application_\d+_\d+)\b')
+
+FAILED_STATES = ('FAILED', 'KILLED')
+
+
+class YarnClient(JsonClient):
+    """The ResourceManager REST API, and the Spark UI of an application through its proxy."""
+
+    def __init__(self, url=DEFAULT_RM, timeout=5.0):
+        super().__init__(url, timeout)
+
+    def app(self, app_id):
+        return self.get('/ws/v1/cluster/apps/%s' % app_id).get('app', {})
+
+    def stages(self, app_id):
+        return self.get('/proxy/%s/api/v1/applications/%s/stages' % (app_id, app_id))
+
+
+def probe(yarn, record):
+    """(input records of the stages so far, error) of the application a run submitted, for the watchdog."""
+    app_id = record['ids'].get('app_id')
+    if app_id is None:
+        return None, None
+    try:
+        app = yarn.app(app_id)
+        if app.get('state') in FAILED_STATES or app.get('finalStatus') in FAILED_STATES:
+            diagnostics = (app.get('diagnostics') or '').strip()
+            return None, diagnostics.splitlines()[0] if diagnostics else 'application %s failed' % app_id
+        if app.get('state') != 'RUNNING':
+            return None, None
+        stages = yarn.stages(app_id)
+    except UNAVAILABLE:
+        return None, None
+    if not stages:
+        return None, None
+    return sum(int(s.get('inputRecords') or 0) for s in stages), None
+
+
+def local_command(jar, app, config_str, slot, java_options=None):
+    """spark-submit of the application on a local[N] master pinned to the slot's CPUs.
+
+    Each slot gets its own UI port (local_ui()) so concurrent drivers do not
+    collide. The executors run in the driver JVM, which gets java_options.
+    """
+    master = 'local[%d]' % len(slot.cpus)
+    cmd = slot.taskset() + ['spark-submit', '--class', RUNNER_CLASS, '--master', master,
+                            '--conf', 'spark.ui.port=%d' % (UI_PORT_BASE + slot.index)]
+    if java_options:
+        cmd += ['--driver-java-options', java_options]
+    return cmd + [jar, '-m', master, '-a', app, '--config', config_str]
+
+
+def local_ui(slot):
+    """The Spark UI of the local driver of a slot."""
+    return JsonClient('http://localhost:%d' % (UI_PORT_BASE + slot.index))
+
+
+def local_probe(ui, record):
+    """(input records of the stages so far, None) of a local driver, for the watchdog.
+
+    A local driver fails by exiting, so there is no error to report.
+    """
+    try:
+        apps = ui.get('/api/v1/applications')
+        if not apps:
+            return None, None
+        stages = ui.get('/api/v1/applications/%s/stages' % apps[0]['id'])
+    except UNAVAILABLE:
+        return None, None
+    if not stages:
+        return None, None
+    return sum(int(s.get('inputRecords') or 0) for s in stages), None
+
+
+def kill(app_id):
+    """Kill a YARN application; spark-submit going away in cluster mode does not."""
+    return subprocess.run(['yarn', 'application', '-kill', app_id]).returncode
+
+
+def version():
+    """The version `spark-submit --version` reports, or None without spark-submit."""
+    try:
+        out = subprocess.run(['spark-submit', '--version'], stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                             universal_newlines=True).stdout
+    except OSError:
+        return None
+    m = re.search(r'version (\d+\.\d+\S*)', out)
+    return m.group(1) if m else None
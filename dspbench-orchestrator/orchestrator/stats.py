@@ -0,0 +1,87 @@
+"""Small statistics helpers over throughput samples."""
+import math
+
+
+def mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def stdev(values):
+    """Sample standard deviation."""
+    if len(values) < 2:
+        return 0.0
+    m = mean(values)
+    return math.sqrt(sum((v - m) ** 2 for v in values) / (len(values) - 1))
+
+
+def cv(values):
+    """Coefficient of variation, infinite when the mean is zero."""
+    m = mean(values)
+    return stdev(values) / m if m > 0 else math.inf
+
+
+def rates(samples):
+    """Per-second rates from (time, counter) samples of a growing counter."""
+    out = []
+    for (t0, c0), (t1, c1) in zip(samples, samples[1:]):
+        if t1 > t0:
+            out.append((t1, (c1 - c0) / (t1 - t0)))
+    return out
+
+
+# two-sided 95% quantiles of Student's t for 1..30 degrees of freedom
+_T95 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+        2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+        2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042)
+
+
+def t95(df):
+    if df < 1:
+        return math.inf
+    return _T95[df - 1] if df <= len(_T95) else 1.960
+
+
+def ci_halfwidth(values):
+    """Half-width of the 95% confidence interval of the mean."""
+    if len(values) < 2:
+        return math.inf
+    return t95(len(values) - 1) * stdev(values) / math.sqrt(len(values))
+
+
+def relative_ci(values):
+    """CI half-width as a fraction of the mean, infinite when the mean is zero."""
+    m = mean(values)
+    return ci_halfwidth(values) / m if m > 0 else math.inf
+
+
+def median(values):
+    ordered = sorted(values)
+    n = len(ordered)
+    if n == 0:
+        return 0.0
+    mid = n // 2
+    return ordered[mid] if n % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+
+
+def percentile(values, q):
+    """Nearest-rank q-th percentile, 0.0 for no values."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[max(0, min(len(ordered), math.ceil(q / 100.0 * len(ordered))) - 1)]
+
+
+def outliers(values, threshold=3.5):
+    """Indexes of values whose modified z-score exceeds threshold.
+
+    The score is 0.6745 * (x - median) / MAD (Iglewicz and Hoaglin), which
+    unlike mean and standard deviation is not dragged along by the outlier
+    itself when there are only a handful of repetitions.
+    """
+    if len(values) < 3:
+        return []
+    m = median(values)
+    mad = median([abs(v - m) for v in values])
+    if mad == 0:
+        return []
+    return [i for i, v in enumerate(values) if 0.6745 * abs(v - m) / mad > threshold]
@@ -0,0 +1,163 @@
+"""Storm topology run control through the Storm UI REST API."""
+import re
+import subprocess
+import time
+
+from . import stats
+from .rest import UNAVAILABLE, JsonClient
+from .wait import WaitTimeout, poll
+
+DEFAULT_URL = 'http://localhost:8080'
+RUNNER_CLASS = 'org.dspbench.StormRunner'
+JVM_OPTS = ['-server', '-XX:+UseG1GC', '-Xms4g', '-Xmx6g', '-XX:+UseCompressedOops']
+
+
+class TopologyError(RuntimeError):
+    pass
+
+
+class UiClient(JsonClient):
+    def __init__(self, url=DEFAULT_URL, timeout=5.0):
+        super().__init__(url, timeout)
+
+    def topologies(self):
+        return self.get('/api/v1/topology/summary').get('topologies', [])
+
+    def topology(self, topology_id):
+        return self.get('/api/v1/topology/%s?window=:all-time' % topology_id)
+
+    def counters(self, topology_id):
+        """All-time (emitted, acked) counters of a topology."""
+        info = self.topology(topology_id)
+        for window in info.get('topologyStats', []):
+            if window.get('window') == ':all-time':
+                return int(window.get('emitted') or 0), int(window.get('acked') or 0)
+        return 0, 0
+
+    def kill(self, topology_id, wait=0):
+        return self.request('POST', '/api/v1/topology/%s/kill/%d' % (topology_id, wait))
+
+
+def topology_ids(ui):
+    try:
+        return {t['id'] for t in ui.topologies()}
+    except UNAVAILABLE as e:
+        raise TopologyError('Storm UI not reachable: %s' % e) from None
+
+
+def find_submitted(ui, name, timeout=120, interval=1.0):
+    """The topology called name, once Nimbus lists it.
+
+    Runs pass StormRunner a --topology-name of their own, so the name is
+    unique and Storm refuses a second topology under it; there is nothing
+    to guess from the launcher log or from names that merely start alike.
+    """
+    def check():
+        try:
+            found = [t for t in ui.topologies() if t['name'] == name]
+        except UNAVAILABLE as e:
+            return False, 'Storm UI not reachable: %s' % e
+        return bool(found), found
+    try:
+        return poll(check, timeout, interval, 'topology %s to be submitted' % name)[1][0]
+    except WaitTimeout as e:
+        raise TopologyError(str(e)) from None
+
+
+def watch(ui, topology_id, window=60, max_duration=300, interval=10, tolerance=0.1, stop=None):
+    """Sample the topology until a steady window is captured or the deadline hits.
+
+    Steady means the throughput over the last window seconds (acked per
+    second, or emitted per second for topologies without acking) is
+    non-zero and varies by less than tolerance around its mean. Returns
+    (reason, samples) with reason 'steady', 'deadline' or, once stop()
+    is true, 'stopped', and samples as (monotonic time, emitted, acked).
+    """
+    start = time.monotonic()
+    samples = []
+    while True:
+        if stop is not None and stop():
+            return 'stopped', samples
+        now = time.monotonic()
+        try:
+            emitted, acked = ui.counters(topology_id)
+            samples.append((now, emitted, acked))
+        except UNAVAILABLE:
+            pass
+        if steady_window(samples, window, tolerance):
+            return 'steady', samples
+        if now - start >= max_duration:
+            return 'deadline', samples
+        time.sleep(min(interval, max(0.0, start + max_duration - time.monotonic())))
+
+
+def probe(ui, record):
+    """(tuples the bolts executed, error) of the topology a run submitted, for the watchdog.
+
+    A topology does not fail as a whole; one whose components report an
+    error while no tuple got through is taken as failed.
+    """
+    topology = record.get('topology')
+    if topology is None:
+        return None, None
+    try:
+        info = ui.topology(topology['id'])
+    except UNAVAILABLE:
+        return None, None
+    executed = sum(int(b.get('executed') or 0) for b in info.get('bolts', []))
+    errors = [c['lastError'] for c in info.get('spouts', []) + info.get('bolts', []) if c.get('lastError')]
+    if errors and not executed:
+        return executed, errors[0]
+    return executed, None
+
+
+def steady_window(samples, window, tolerance):
+    if not samples or samples[-1][0] - samples[0][0] < window:
+        return False
+    use_acked = samples[-1][2] > 0
+    series = [(t, a if use_acked else e) for t, e, a in samples]
+    recent = [r for t, r in stats.rates(series) if t > samples[-1][0] - window]
+    return len(recent) >= 2 and stats.cv(recent) <= tolerance
+
+
+def kill(ui, topology, wait=0, timeout=120, interval=1.0):
+    """Kill exactly this topology and wait until Storm no longer lists it."""
+    try:
+        ui.kill(topology['id'], wait)
+    except UNAVAILABLE as e:
+        try:
+            subprocess.run(['storm', 'kill', topology['name'], '-w', str(wait)], check=True)
+        except (OSError, subprocess.CalledProcessError) as fallback:
+            raise TopologyError('cannot kill topology %s through the UI (%s) nor with storm kill (%s)'
+                                % (topology['name'], e, fallback)) from None
+
+    def check():
+        try:
+            return topology['id'] not in topology_ids(ui)
+        except TopologyError:
+            return False
+    try:
+        poll(check, timeout + wait, interval, 'topology %s to be removed' % topology['name'])
+    except WaitTimeout as e:
+        raise TopologyError(str(e)) from None
+
+
+def version():
+    """The version `storm version` reports, or None without a storm command."""
+    try:
+        out = subprocess.run(['storm', 'version'], stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                             universal_newlines=True).stdout
+    except OSError:
+        return None
+    m = re.search(r'^Storm (\S+)', out, re.M)
+    return m.group(1) if m else None
+
+
+def local_command(jar, app, config_str, slot, runtime, java_options=()):
+    """The JVM running a topology on an in-process LocalCluster pinned to the slot's CPUs.
+
+    It exits once the runtime is over.
+    """
+    return slot.taskset() + ['java'] + JVM_OPTS + list(java_options) + [
+        '-cp', jar, RUNNER_CLASS, '--app', app, '--config-str', config_str, '--mode', 'local',
+        '--runtime', str(runtime)]
@@ -0,0 +1,210 @@
+"""Declarative parallelism sweeps.
+
+A sweep spec is a JSON file with one entry per application listing the
+properties key of each stage, the grid of parallelism values to try and,
+optionally, its own repetition count::
+
+    {
+      "engine": "flink",
+      "exec": "stream",
+      "config_dir": "src/main/resources/config",
+      "metrics_dir": "/home/gmap/metrics",
+      "repetitions": 5,
+      "apps": [
+        {"name": "wordcount", "prefix": "WC",
+         "stages": ["wc.parser.threads", "wc.splitter.threads",
+                    "wc.counter.threads", "wc.sink.threads"],
+         "grid": [[1, 1, 1, 1], [1, 2, 2, 2]]}
+      ]
+    }
+
+Grid rows may be shorter than the stage list; the remaining stages run
+with a single thread. Rows that come down to the same parallelism as an
+earlier one are duplicates and only run once. Relative paths are
+resolved against the spec file.
+
+An app may also list "batches", property values to sweep together with
+the grid, such as the micro-batch settings of Spark::
+
+    "batches": [{"wc.batch.interval": 500, "wc.batch.size": 2000},
+                {"wc.batch.interval": 1000, "wc.batch.size": 2000}]
+
+Every grid row then runs once per batch point, and the values of the
+point are appended to the config label in key order (1111-500-2000).
+"""
+import json
+import os
+from dataclasses import dataclass, field
+
+from . import properties
+
+DEFAULT_PARALLELISM = 1
+
+
+class SpecError(ValueError):
+    pass
+
+
+@dataclass
+class Run:
+    engine: str
+    app: str
+    repetition: int
+    stages: tuple
+    values: tuple
+    conf: str
+    config_path: str
+    # where this attempt of the run writes its metrics, <metrics_base><run id>/ once it was snapshotted
+    metrics_output: str
+    overrides: dict = field(default_factory=dict)
+    # seconds the run should last; None lets the job run its course
+    runtime: int = None
+    # the batch point of the run, also among the overrides
+    batch: dict = field(default_factory=dict)
+    # the kind of sweep, which names the timing log of the config
+    exec: str = 'stream'
+    # the metrics folder of the run's config and repetition, holding one folder per attempt
+    metrics_base: str = None
+
+    @property
+    def parallelism(self):
+        return dict(zip(self.stages, self.values))
+
+
+def load_spec(path):
+    with open(path) as f:
+        spec = json.load(f)
+    base = os.path.dirname(os.path.abspath(path))
+    spec.setdefault('exec', 'stream')
+    spec.setdefault('repetitions', 1)
+    for key in ('engine', 'config_dir', 'metrics_dir', 'apps'):
+        if key not in spec:
+            raise SpecError('%s: missing "%s"' % (path, key))
+    spec['config_dir'] = os.path.join(base, spec['config_dir'])
+    names = set()
+    for app in spec['apps']:
+        _check_app(path, app)
+        if app['name'] in names:
+            raise SpecError('%s: app "%s" listed twice' % (path, app['name']))
+        names.add(app['name'])
+    return spec
+
+
+def _check_app(path, app):
+    for key in ('name', 'prefix', 'stages', 'grid'):
+        if key not in app:
+            raise SpecError('%s: app entry missing "%s"' % (path, key))
+    for row in app['grid']:
+        if len(row) > len(app['stages']):
+            raise SpecError('%s: %s config %s has more values than stages'
+                            % (path, app['name'], row))
+        if any(not isinstance(v, int) or v < 1 for v in row):
+            raise SpecError('%s: %s config %s must be positive integers'
+                            % (path, app['name'], row))
+    for batch in app.get('batches', []):
+        if not isinstance(batch, dict) or any(not isinstance(v, int) or v < 0 for v in batch.values()):
+            raise SpecError('%s: %s batch point %s must map keys to non-negative integers'
+                            % (path, app['name'], batch))
+
+
+def conf_label(values):
+    """The label the drivers use for a config, e.g. [1, 2, 4, 4] -> '1244'."""
+    return ''.join(str(v) for v in values)
+
+
+def batch_label(batch):
+    """The part of the config label of a batch point, e.g. {'wc.batch.size': 2000} -> '-2000'."""
+    return ''.join('-%s' % batch[key] for key in sorted(batch))
+
+
+def full_values(app, values):
+    """A grid row padded to one value per stage."""
+    return tuple(values) + (DEFAULT_PARALLELISM,) * (len(app['stages']) - len(values))
+
+
+def duplicates(app):
+    """(row, earlier row) for every grid row that runs the same config as an earlier one."""
+    seen = {}
+    found = []
+    for row in app['grid']:
+        full = full_values(app, row)
+        if full in seen:
+            found.append((row, seen[full]))
+        else:
+            seen[full] = row
+    return found
+
+
+def unique_grid(app):
+    """The grid rows of an app without duplicates, in their order."""
+    seen = set()
+    rows = []
+    for row in app['grid']:
+        full = full_values(app, row)
+        if full not in seen:
+            seen.add(full)
+            rows.append(row)
+    return rows
+
+
+def points(app):
+    """(grid row, batch point) of every config of an app, batch points varying fastest."""
+    return [(row, batch) for row in unique_grid(app) for batch in app.get('batches') or [{}]]
+
+
+def make_run(spec, app, values, repetition, batch=None):
+    stages = app['stages']
+    full = full_values(app, values)
+    batch = dict(batch or {})
+    conf = conf_label(values) + batch_label(batch)
+    metrics_output = '%s/%s/%s%s/%d/' % (spec['metrics_dir'].rstrip('/'), spec['exec'],
+                                         app['prefix'], conf, repetition)
+    overrides = dict(zip(stages, full))
+    overrides.update(app.get('properties', {}))
+    overrides.update(batch)
+    overrides['metrics.output'] = metrics_output
+    return Run(engine=spec['engine'],
+               app=app['name'],
+               repetition=repetition,
+               stages=tuple(stages),
+               values=full,
+               conf=conf,
+               config_path=os.path.join(spec['config_dir'], app.get('config', app['name'] + '.properties')),
+               metrics_output=metrics_output,
+               overrides=overrides,
+               batch=batch,
+               exec=spec['exec'],
+               metrics_base=metrics_output)
+
+
+def expand(spec, apps=None):
+    """List every run of the sweep, repetition-major like the old drivers."""
+    selected = [a for a in spec['apps'] if apps is None or a['name'] in apps]
+    top = max([a.get('repetitions', spec['repetitions']) for a in selected] or [0])
+    runs = []
+    for repetition in range(1, top + 1):
+        for app in selected:
+            if repetition > app.get('repetitions', spec['repetitions']):
+                continue
+            for values, batch in points(app):
+                runs.append(make_run(spec, app, values, repetition, batch))
+    return runs
+
+
+def rendered(run):
+    """The text of the run's resolved config."""
+    text = ''
+    if os.path.exists(run.config_path):
+        with open(run.config_path, encoding='latin-1') as f:
+            text = f.read()
+    return properties.render(text, run.overrides)
+
+
+def resolved(run):
+    """The run's resolved config as a dict."""
+    return properties.loads(rendered(run))
+
+
+def render(run, path):
+    """Write the run's resolved config to path, leaving the app config untouched."""
+    properties.atomic_write(path, rendered(run))
@@ -0,0 +1,147 @@
+"""Phase tracing of sweeps.
+
+Every phase the orchestrator goes through is appended to a per-sweep
+trace file as one JSON span with monotonic start and end times:
+
+    render         writing the run's config snapshot
+    cluster-stop   stopping the cluster, until its processes are gone
+    cluster-start  starting it again
+    ready-wait     waiting for all slots to register (or be released)
+    submit         launcher start until the engine accepted the job
+    run            the job running, until the launcher and watcher ended
+    metrics        reading the sink metrics; carries the measured seconds
+    quiesce        waiting for the host to settle before a run; carries the last sample
+    warm           touching the run's input files into the page cache; carries their residency
+    teardown       stopping the cluster at the end of the sweep
+    sweep          the whole sweep
+
+The measured seconds of a run are the span of the metric buckets its
+throughput is computed from, the only part of the wall time that ends up
+in a result. report() breaks a trace down per engine into that useful
+time and the overhead around it.
+"""
+import contextlib
+import json
+import os
+import threading
+import time
+
+from . import journal
+
+
+class Tracer:
+    """Appends spans to path; with path None it records nothing."""
+
+    def __init__(self, path=None, engine=None):
+        self.path = path
+        self.engine = engine
+        self.lock = threading.Lock()
+        if path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def add(self, phase, start, end, run=None, **attrs):
+        if self.path is None:
+            return
+        span = dict(engine=self.engine, phase=phase, run=journal.key(run) if run is not None else None,
+                    start=round(start, 6), end=round(end, 6), duration=round(end - start, 6),
+                    time=round(time.time() - (time.monotonic() - start), 3))
+        span.update(attrs)
+        with self.lock:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(span) + '\n')
+
+    @contextlib.contextmanager
+    def span(self, phase, run=None, **attrs):
+        """Trace the with block as phase; the yielded dict takes extra fields."""
+        start = time.monotonic()
+        fields = dict(attrs)
+        try:
+            yield fields
+        finally:
+            self.add(phase, start, time.monotonic(), run, **fields)
+
+    def launch(self, run, record):
+        """The submit and run spans of a launch supervised by runner.run."""
+        clock = record.get('clock', {})
+        if 'start' not in clock or 'end' not in clock:
+            return
+        accepted = [t for name, t in clock.items() if name in record['ids']]
+        if accepted:
+            self.add('submit', clock['start'], min(accepted), run)
+            self.add('run', min(accepted), clock['end'], run, state=record.get('state'))
+        else:
+            self.add('run', clock['start'], clock['end'], run, state=record.get('state'))
+
+
+NULL = Tracer()
+
+
+def load(paths):
+    spans = []
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                try:
+                    spans.append(json.loads(line))
+                except ValueError:
+                    continue
+    return spans
+
+
+def _hms(seconds):
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return '%dh%02dm' % (seconds // 3600, seconds % 3600 // 60)
+    return '%dm%02ds' % (seconds // 60, seconds % 60)
+
+
+def _label(phase):
+    # what is left of the run phase once the measured seconds are taken out
+    return 'run (warm-up)' if phase == 'run' else phase
+
+
+def breakdown(spans):
+    """{engine: {'wall', 'phases': {phase: seconds}, 'measured', 'runs'}}."""
+    engines = {}
+    for span in spans:
+        entry = engines.setdefault(span['engine'], {'wall': 0.0, 'phases': {}, 'measured': 0.0, 'runs': set(),
+                                                    'first': span['start'], 'last': span['end']})
+        entry['first'] = min(entry['first'], span['start'])
+        entry['last'] = max(entry['last'], span['end'])
+        if span['phase'] == 'sweep':
+            entry['wall'] += span['duration']
+            continue
+        entry['phases'][span['phase']] = entry['phases'].get(span['phase'], 0.0) + span['duration']
+        if span.get('run'):
+            entry['runs'].add(span['run'])
+        if span['phase'] == 'metrics' and span.get('measured'):
+            entry['measured'] += span['measured']
+    for entry in engines.values():
+        # without a sweep span (an interrupted sweep) the first to last span is the best guess
+        entry['wall'] = entry['wall'] or entry['last'] - entry['first']
+        entry['runs'] = len(entry['runs'])
+    return engines
+
+
+def report(spans, top=3):
+    """Lines of the per-engine overhead breakdown of a trace."""
+    for engine, entry in sorted(breakdown(spans).items(), key=lambda e: str(e[0])):
+        phases = dict(entry['phases'])
+        # runs in parallel slots overlap, so their phases may add up to more than the wall time
+        total = max(entry['wall'], sum(phases.values()))
+        measured = min(entry['measured'], phases.get('run', 0.0))
+        if 'run' in phases:
+            phases['run'] = phases['run'] - measured
+        untraced = total - sum(phases.values()) - measured
+        if untraced > 1:
+            phases['untraced'] = untraced
+        yield '%s: %s wall, %d runs, %s measured (%.1f%%)' % (engine, _hms(entry['wall']), entry['runs'],
+                                                            _hms(measured), 100.0 * measured / total if total else 0)
+        yield '  %-14s %9s %7s %9s' % ('phase', 'total', 'share', 'per run')
+        for phase, seconds in sorted(phases.items(), key=lambda p: -p[1]):
+            name = _label(phase)
+            yield '  %-14s %9s %6.1f%% %9s' % (name, _hms(seconds), 100.0 * seconds / total if total else 0,
+                                               _hms(seconds / entry['runs']) if entry['runs'] else '-')
+        worst = sorted(phases.items(), key=lambda p: -p[1])[:top]
+        yield '  biggest overhead: ' + ', '.join('%s %.1f%%' % (_label(p), 100.0 * s / total if total else 0)
+                                                 for p, s in worst)
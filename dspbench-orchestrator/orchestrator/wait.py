@@ -0,0 +1,29 @@
+"""Polling with a deadline, used instead of fixed sleeps."""
+import time
+
+
+class WaitTimeout(TimeoutError):
+    pass
+
+
+def poll(check, timeout, interval=0.5, what='condition'):
+    """Call check() until it returns a truthy value or timeout seconds pass.
+
+    check may return (done, state); the last state is included in the
+    timeout message so a failure says what was observed, not just that it
+    took too long.
+    """
+    deadline = time.monotonic() + timeout
+    state = None
+    while True:
+        result = check()
+        if isinstance(result, tuple):
+            done, state = result
+        else:
+            done = result
+        if done:
+            return result
+        if time.monotonic() >= deadline:
+            raise WaitTimeout('timed out after %.0fs waiting for %s (last state: %s)'
+                              % (timeout, what, state))
+        time.sleep(interval)
@@ -0,0 +1,125 @@
+"""Failing runs fast and saying why.
+
+While a run is supervised, a probe asks the engine every few seconds how
+many tuples the job received so far and whether it failed. A job the
+engine reports as failed, or one that has not received a single tuple by
+the end of the grace period, is aborted at once instead of being left to
+run out its time. So is one the engine still says nothing about, neither
+tuples nor failure, for BLIND probes in a row past the grace period: a
+job that never showed up or whose UI went away is stalled, not idle.
+
+Whatever ended a run badly, its cause is classified from the watchdog's
+reason and the job log, e.g. a missing input file or an unreachable
+Kafka, and kept in the record as {"cause": ..., "detail": ...}. The
+drivers journal such runs as failed, so they never reach the results.
+"""
+import os
+import re
+
+GRACE = 60
+# probes in a row without any progress information, past the grace period, before a run counts as stalled
+BLIND = 3
+
+# (cause, pattern) in order of precedence: the first cause found in the log wins
+CAUSES = (
+    ('missing-input', re.compile(r'FileNotFoundException|NoSuchFileException|No such file or directory')),
+    ('kafka-unreachable', re.compile(
+        r'Connection to node -?\d+ .*could not be established|Timeout expired while fetching topic metadata'
+        r'|KeeperErrorCode = ConnectionLoss|Unable to connect to zookeeper|ZkTimeoutException'
+        r'|(?i:kafka|zookeeper)\S*.*(?:Connection refused|timed out)')),
+    ('class-not-found', re.compile(r'ClassNotFoundException|NoClassDefFoundError')),
+    ('out-of-memory', re.compile(r'OutOfMemoryError|running beyond physical memory limits')),
+    ('no-resources', re.compile(r'NoResourceAvailableException|Could not acquire the minimum required resources'
+                                r'|Not enough free slots')),
+    ('config', re.compile(r'ConfigurationException|NumberFormatException|IllegalArgumentException')),
+    ('connection', re.compile(r'ConnectException|UnknownHostException|Connection refused')),
+)
+# any other exception, as the last "Caused by:" of a trace names the root cause
+EXCEPTION = re.compile(r'^(?:Caused by: |Exception in thread "[^"]*" )?[\w.$]+(?:Exception|Error)\b')
+# bytes of the end of a job log that are searched
+LOG_TAIL = 1 << 20
+DETAIL_MAX = 500
+
+
+class JobFailed(RuntimeError):
+    """A run the watchdog aborted or whose launcher failed, with its classified cause."""
+
+    def __init__(self, failure):
+        super().__init__('%s: %s' % (failure['cause'], failure['detail']))
+        self.cause = failure['cause']
+        self.detail = failure['detail']
+
+
+def _detail(line):
+    line = line.strip()
+    return line if len(line) <= DETAIL_MAX else line[:DETAIL_MAX] + '...'
+
+
+def classify(lines):
+    """(cause, detail) of the first known failure in lines, or None."""
+    lines = list(lines)
+    for cause, pattern in CAUSES:
+        for line in lines:
+            if pattern.search(line):
+                return cause, _detail(line)
+    last = None
+    for line in lines:
+        if EXCEPTION.search(line.strip()):
+            last = line
+    return ('exception', _detail(last)) if last is not None else None
+
+
+def read_tail(path, size=LOG_TAIL):
+    """The lines at the end of a log, or [] when there is no log."""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(max(0, os.path.getsize(path) - size))
+            return f.read().decode(errors='replace').splitlines()
+    except OSError:
+        return []
+
+
+def diagnose(record, log_path):
+    """{"cause", "detail"} of a run that did not end cleanly, or None if it did."""
+    abort = record.get('abort')
+    clean = (record.get('state') == 'finished' and not abort
+             and (record.get('exit_code') == 0 or record.get('timed_out')))
+    if clean:
+        return None
+    found = classify([abort]) if abort else None
+    found = found or classify(read_tail(log_path))
+    if found is None:
+        if abort:
+            if abort.startswith('no tuples'):
+                found = ('idle', abort)
+            elif abort.startswith('no progress'):
+                found = ('no-progress', abort)
+            else:
+                found = ('job-failed', abort)
+        elif record.get('state') == 'finished':
+            found = ('launcher', 'launcher exited with status %s' % record.get('exit_code'))
+        else:
+            found = (record.get('state') or 'unknown', record.get('error', ''))
+    return {'cause': found[0], 'detail': found[1]}
+
+
+def check(record, tuples, error, elapsed, grace, blind=BLIND):
+    """The reason to abort the run after a probe, or None to let it go on.
+
+    tuples is None when the probe learned nothing, e.g. the job is not
+    listed (yet) or the engine's UI does not answer.
+    """
+    if error:
+        return error
+    if tuples is None:
+        if elapsed >= grace:
+            record['blind_probes'] = record.get('blind_probes', 0) + 1
+            if record['blind_probes'] >= blind:
+                return 'no progress information for %d probes past the first %d s' % (record['blind_probes'], grace)
+        return None
+    record['blind_probes'] = 0
+    if tuples:
+        record['tuples_seen'] = True
+    if not record.get('tuples_seen') and elapsed >= grace:
+        return 'no tuples received in the first %d s' % grace
+    return None
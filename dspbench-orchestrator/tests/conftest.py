@@ -0,0 +1,51 @@
+import os
+import socket
+
+import pytest
+
+from orchestrator import fake
+
+
+@pytest.fixture
+def serve():
+    """Start a stub REST server on a free port with fake.serve_routes routes and return its URL."""
+    servers = []
+
+    def start(routes):
+        server = fake.serve_routes(0, routes)
+        servers.append(server)
+        return 'http://127.0.0.1:%d' % server.server_address[1]
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def closed_url():
+    """The URL of a port nothing listens on."""
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    return 'http://127.0.0.1:%d' % port
+
+
+@pytest.fixture
+def fake_engines(tmp_path, monkeypatch, serve):
+    """The fake engine commands on PATH, with their state, Storm UI and YARN private to the test.
+
+    Returns the (storm_ui, yarn_url) the fakes report to.
+    """
+    directory = tmp_path / 'fake'
+    fake.install(str(directory))
+    monkeypatch.setenv('PATH', '%s:%s' % (directory / 'bin', os.environ['PATH']))
+    monkeypatch.setenv('FLINK_HOME', str(directory / 'flink'))
+    monkeypatch.delenv('JAVA_HOME', raising=False)
+    monkeypatch.setenv('DSPBENCH_FAKE_STATE', str(tmp_path / 'fake-state'))
+    for knob, value in (('startup', '0.2'), ('cluster', '0.2'), ('runtime', '2'), ('seed', '1')):
+        monkeypatch.setenv('DSPBENCH_FAKE_' + knob.upper(), value)
+    storm_ui = serve(fake.storm_routes())
+    yarn_url = serve(fake.yarn_routes())
+    monkeypatch.setenv('DSPBENCH_FAKE_STORM_UI', storm_ui)
+    monkeypatch.setenv('DSPBENCH_FAKE_YARN', yarn_url)
+    return storm_ui, yarn_url
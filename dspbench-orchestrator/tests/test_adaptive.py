@@ -0,0 +1,91 @@
+"""Adaptive repetitions: the t-based confidence interval, MAD outliers and when a config stops."""
+import math
+
+import pytest
+
+from orchestrator import adaptive, stats
+
+
+def spec(tmp_path, grid=((1, 1),)):
+    return {'engine': 'flink', 'exec': 'stream', 'config_dir': str(tmp_path), 'metrics_dir': str(tmp_path / 'metrics'),
+            'repetitions': 1, 'apps': [{'name': 'wordcount', 'prefix': 'WC', 'stages': ['wc.a.threads', 'wc.b.threads'],
+                                        'grid': [list(row) for row in grid]}]}
+
+
+def sweep_until_done(plan, throughputs):
+    """Feed plan one throughput per handed-out run, in order, until it hands out none; the rounds it took."""
+    throughputs = iter(throughputs)
+    rounds = 0
+    while True:
+        runs = plan.next_round()
+        if not runs:
+            return rounds
+        rounds += 1
+        for run in runs:
+            plan.add(run, next(throughputs))
+
+
+def test_t95_follows_the_degrees_of_freedom():
+    assert stats.t95(1) == 12.706
+    assert stats.t95(4) == 2.776
+    assert stats.t95(30) == 2.042
+    assert stats.t95(100) == 1.960
+    assert stats.t95(0) == math.inf
+
+
+def test_ci_halfwidth_uses_students_t():
+    values = [98, 100, 102]
+    # stdev 2 over sqrt(3), widened by t(2) = 4.303
+    assert stats.ci_halfwidth(values) == pytest.approx(4.303 * 2 / math.sqrt(3))
+    assert stats.relative_ci(values) == pytest.approx(4.303 * 2 / math.sqrt(3) / 100)
+    assert stats.ci_halfwidth([100]) == math.inf
+    assert stats.relative_ci([0, 0]) == math.inf
+
+
+def test_outliers_by_modified_z_score():
+    assert stats.outliers([100, 101, 99, 100, 40]) == [4]
+    assert stats.outliers([100, 101, 99, 100, 95]) == []
+    # fewer than three values, or no spread at all, say nothing
+    assert stats.outliers([100, 10]) == []
+    assert stats.outliers([100, 100, 100, 10]) == []
+
+
+def test_an_outlier_is_not_counted_and_run_again(tmp_path):
+    plan = adaptive.Plan(spec(tmp_path), target=0.05, min_reps=3, max_reps=10)
+    assert sweep_until_done(plan, [1000, 1002, 100, 998, 1001]) == 4
+    [row] = plan.summary()
+    assert (row['repetitions'], row['outliers'], row['failed']) == (3, [3], [])
+    assert row['mean'] == pytest.approx(1000)
+
+
+def test_stops_at_min_reps_once_the_interval_is_narrow(tmp_path):
+    plan = adaptive.Plan(spec(tmp_path), target=0.05, min_reps=3, max_reps=10)
+    assert sweep_until_done(plan, [1000, 1001, 999]) == 3
+    [row] = plan.summary()
+    assert row['repetitions'] == 3 and row['relative_ci'] <= 0.05
+
+
+def test_never_stops_before_min_reps(tmp_path):
+    plan = adaptive.Plan(spec(tmp_path), target=0.05, min_reps=5, max_reps=10)
+    assert sweep_until_done(plan, [1000] * 10) == 5
+
+
+def test_stops_at_max_reps_when_the_interval_stays_wide(tmp_path):
+    plan = adaptive.Plan(spec(tmp_path), target=0.01, min_reps=3, max_reps=6)
+    assert sweep_until_done(plan, [500, 1500] * 10) == 6
+    [row] = plan.summary()
+    assert row['repetitions'] == 6 and row['relative_ci'] > 0.01
+
+
+def test_failed_repetitions_are_rerun_up_to_max_reruns(tmp_path):
+    plan = adaptive.Plan(spec(tmp_path), target=0.05, min_reps=3, max_reps=10, max_reruns=2)
+    assert sweep_until_done(plan, [None, 1000, None, 1000]) == 3
+    [row] = plan.summary()
+    assert (row['repetitions'], row['failed']) == (1, [1, 3])
+
+
+def test_configs_stop_independently(tmp_path):
+    plan = adaptive.Plan(spec(tmp_path, grid=((1, 1), (2, 2))), target=0.05, min_reps=3, max_reps=4)
+    # one round hands out both configs: 11 is steady, 22 swings
+    assert sweep_until_done(plan, [1000, 500, 1000, 1500, 1000, 500, 1500]) == 4
+    assert [(row['conf'], row['repetitions']) for row in plan.summary()] == [('11', 3), ('22', 4)]
@@ -0,0 +1,87 @@
+"""The content hash of a run: what changes it and what does not."""
+import os
+
+import pytest
+
+from orchestrator import cache, sweep
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """A jar, an app config and the input file it points to."""
+    (tmp_path / 'app.jar').write_bytes(b'PK\x03\x04 classes')
+    (tmp_path / 'books.dat').write_text('the quick brown fox\n')
+    config = tmp_path / 'config'
+    config.mkdir()
+    (config / 'wordcount.properties').write_text('wc.spout.path=%s\nwc.spout.threads=1\nwc.sink.threads=1\n'
+                                                 % (tmp_path / 'books.dat'))
+    return tmp_path
+
+
+def run(tree, values=(1, 1), repetition=1, **properties):
+    spec = {'engine': 'storm', 'exec': 'stream', 'config_dir': str(tree / 'config'),
+            'metrics_dir': str(tree / 'metrics'), 'repetitions': 1}
+    app = {'name': 'wordcount', 'prefix': 'WC', 'stages': ['wc.spout.threads', 'wc.sink.threads'],
+           'grid': [list(values)], 'properties': properties}
+    return sweep.make_run(spec, app, list(values), repetition)
+
+
+def key(tree, *args, version='2.4.0', **properties):
+    result_cache = cache.ResultCache(str(tree / 'cache'), str(tree / 'app.jar'), version, str(tree))
+    return result_cache.key(run(tree, *args, **properties))[0]
+
+
+def touch(path, content):
+    # a different size, so the remembered digest does not apply whatever the mtime resolution
+    path.write_bytes(content)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1000000))
+
+
+def test_same_inputs_same_key(tree):
+    first = key(tree)
+    assert first is not None and len(first) == 64
+    assert key(tree) == first
+    # where the metrics go does not change what is measured
+    assert key(tree, **{'metrics.output': str(tree / 'elsewhere') + '/'}) == first
+
+
+def test_key_follows_the_jar(tree):
+    first = key(tree)
+    touch(tree / 'app.jar', b'PK\x03\x04 other classes')
+    assert key(tree) != first
+
+
+def test_key_follows_the_config(tree):
+    first = key(tree)
+    assert key(tree, (2, 1)) != first
+    with open(tree / 'config' / 'wordcount.properties', 'a') as f:
+        f.write('wc.splitter.threads=4\n')
+    assert key(tree) != first
+
+
+def test_key_follows_the_properties(tree):
+    first = key(tree)
+    assert key(tree, **{'wc.sink.batch': '10'}) != first
+    assert key(tree, repetition=2) != first
+    assert key(tree, version='2.5.0') != first
+
+
+def test_key_follows_the_input_data(tree):
+    first = key(tree)
+    touch(tree / 'books.dat', b'jumps over the lazy dog\n')
+    assert key(tree) != first
+
+
+def test_runs_with_unresolved_inputs_are_not_cached(tree):
+    assert key(tree, **{'wc.spout.path': str(tree / 'missing.dat')}) is None
+
+
+def test_store_and_lookup(tree):
+    result_cache = cache.ResultCache(str(tree / 'cache'), str(tree / 'app.jar'), '2.4.0', str(tree))
+    assert result_cache.lookup(run(tree)) is None
+    entry = result_cache.store(run(tree), {'run_id': 'storm-wordcount-11-r1', 'throughput': 1234.5})
+    found = result_cache.lookup(run(tree))
+    assert found == entry
+    assert (found['run_id'], found['throughput']) == ('storm-wordcount-11-r1', 1234.5)
+    assert result_cache.lookup(run(tree, repetition=2)) is None
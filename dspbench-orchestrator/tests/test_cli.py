@@ -0,0 +1,168 @@
+"""cli.run_engine and the engine drivers, on the fake engines (see orchestrator.fake)."""
+import json
+import os
+
+import pytest
+
+from orchestrator import backends, cache, cli, driver, journal, parallel, sweep
+
+REPO = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+WORDCOUNT = {'flink': ['wc.source.threads', 'wc.splitter.threads', 'wc.counter.threads', 'wc.sink.threads'],
+             'spark': ['wc.parser.threads', 'wc.splitter.threads', 'wc.counter.threads', 'wc.sink.threads'],
+             'storm': ['wc.spout.threads', 'wc.splitter.threads', 'wc.counter.threads', 'wc.sink.threads']}
+
+
+def runs(tmp_path, engine, grid, repetitions=1, properties=None):
+    """The runs of wordcount on an engine, with its shipped config and metrics under tmp_path."""
+    spec = {'engine': engine, 'exec': 'stream', 'repetitions': repetitions,
+            'config_dir': os.path.join(REPO, 'dspbench-' + engine, 'src', 'main', 'resources', 'config'),
+            'metrics_dir': str(tmp_path / 'metrics'),
+            'apps': [{'name': 'wordcount', 'prefix': 'WC', 'stages': WORDCOUNT[engine], 'grid': grid,
+                      'properties': dict(properties or {})}]}
+    return sweep.expand(spec)
+
+
+def records(sweep_journal):
+    return {(r['conf'], r['repetition']): r for r in sweep_journal.records() if r['state'] != journal.STARTED}
+
+
+class Plan:
+    """Collects the results run_engine hands to a plan."""
+
+    def __init__(self):
+        self.results = []
+
+    def add(self, run, throughput):
+        self.results.append((run.conf, throughput))
+
+
+class Kill:
+    """A gate that kills the sweep once the run of conf started, as Ctrl-C or a crash would."""
+
+    def __init__(self, conf):
+        self.conf = conf
+
+    def wait(self, tracer, run):
+        if run.conf == self.conf:
+            raise KeyboardInterrupt
+
+
+def storm_sweep(tmp_path, fake_engines, max_duration=3):
+    storm_ui, _ = fake_engines
+    return backends.get('storm', repo_dir=str(tmp_path), storm_ui=storm_ui, steady_window=1,
+                        max_duration=max_duration)
+
+
+def started(path):
+    with open(path) as f:
+        return [record['conf'] for record in map(json.loads, f) if record['state'] == journal.STARTED]
+
+
+def test_parallel_is_refused_without_isolated_instances(tmp_path):
+    with pytest.raises(sweep.SpecError, match='threads runs cannot be packed'):
+        cli.run_engine(backends.get('threads'), [[]], str(tmp_path), journal.Journal(str(tmp_path / 'j.jsonl')),
+                       cpus=[0, 1])
+
+
+def test_drivers_offer_parallel_only_where_supported(capsys):
+    assert driver.parser('flink').parse_args(['--parallel', '0-3']).parallel == '0-3'
+    with pytest.raises(SystemExit):
+        driver.parser('threads').parse_args(['--parallel'])
+    assert 'unrecognized arguments: --parallel' in capsys.readouterr().err
+
+
+def test_storm_topology_is_named_after_the_run(tmp_path, fake_engines):
+    backend = storm_sweep(tmp_path, fake_engines)
+    sweep_journal = journal.Journal(str(tmp_path / 'journal.jsonl'))
+    cli.run_engine(backend, [runs(tmp_path, 'storm', [[1, 1, 1, 1]])], str(tmp_path / 'runs'), sweep_journal)
+    [record] = records(sweep_journal).values()
+    assert record['state'] == 'completed'
+    with open(os.path.join(str(tmp_path / 'runs'), record['run_id'], 'record.json')) as f:
+        assert json.load(f)['topology']['name'] == record['run_id']
+
+
+def test_parallel_runs_are_supervised(tmp_path, fake_engines):
+    backend = backends.get('storm', repo_dir=str(tmp_path), max_duration=4)
+    sweep_journal = journal.Journal(str(tmp_path / 'journal.jsonl'))
+    cli.run_engine(backend, [runs(tmp_path, 'storm', [[1, 1, 1, 1], [1, 2, 2, 1]])], str(tmp_path / 'runs'),
+                   sweep_journal, cpus=parallel.available_cpus())
+    done = records(sweep_journal)
+    assert {k: r['state'] for k, r in done.items()} == {('1111', 1): 'completed', ('1221', 1): 'completed'}
+    for record in done.values():
+        assert record['throughput'] > 0
+        # what runner.run leaves behind: the record of the launch and the host samples
+        with open(os.path.join(str(tmp_path / 'runs'), record['run_id'], 'record.json')) as f:
+            assert json.load(f)['state'] == 'finished'
+        assert os.path.exists(os.path.join(record['metrics_output'], 'resources.csv'))
+
+
+def test_hung_parallel_run_fails(tmp_path, fake_engines):
+    backend = backends.get('storm', repo_dir=str(tmp_path), max_duration=1, grace=1)
+    sweep_journal = journal.Journal(str(tmp_path / 'journal.jsonl'))
+    # a JVM still starting up long after its runtime
+    cli.run_engine(backend, [runs(tmp_path, 'storm', [[1, 1, 1, 1]], properties={'fake.startup': 60})],
+                   str(tmp_path / 'runs'), sweep_journal, cpus=parallel.available_cpus())
+    [record] = records(sweep_journal).values()
+    assert (record['state'], record['cause']) == ('failed', 'hung')
+
+
+def test_resumed_sweep_runs_only_what_is_pending(tmp_path, fake_engines):
+    backend = storm_sweep(tmp_path, fake_engines)
+    path = str(tmp_path / 'journal.jsonl')
+    grid = [[1, 1, 1, 1], [1, 2, 2, 1], [2, 2, 2, 2]]
+    with pytest.raises(KeyboardInterrupt):
+        cli.run_engine(backend, [runs(tmp_path, 'storm', grid)], str(tmp_path / 'runs'), journal.Journal(path),
+                       gate=Kill('1221'))
+    first = journal.Journal(path)
+    assert {k: r['state'] for k, r in records(first).items()} == {('1111', 1): 'completed'}
+    assert first.state(runs(tmp_path, 'storm', grid)[1]) == journal.STARTED
+
+    # the driver started again on the same journal
+    pending = first.pending(runs(tmp_path, 'storm', grid))
+    assert [run.conf for run in pending] == ['1221', '2222']
+    cli.run_engine(backend, [pending], str(tmp_path / 'runs'), first)
+    assert {k: r['state'] for k, r in records(journal.Journal(path)).items()} == {
+        ('1111', 1): 'completed', ('1221', 1): 'completed', ('2222', 1): 'completed'}
+    assert started(path) == ['1111', '1221', '1221', '2222']
+
+
+def test_failed_runs_are_journaled_failed(tmp_path, fake_engines):
+    # long enough for the watchdog's first probe to see the topology's error
+    backend = storm_sweep(tmp_path, fake_engines, max_duration=30)
+    sweep_journal = journal.Journal(str(tmp_path / 'journal.jsonl'))
+    plan = Plan()
+    # every fake job dies on a missing input file
+    cli.run_engine(backend, [runs(tmp_path, 'storm', [[1, 1, 1, 1]], properties={'fake.fail': 1})],
+                   str(tmp_path / 'runs'), sweep_journal, plan=plan)
+    [record] = records(sweep_journal).values()
+    assert (record['state'], record['cause']) == ('failed', 'missing-input')
+    assert 'throughput' not in record
+    assert plan.results == [('1111', None)]
+    assert sweep_journal.pending(runs(tmp_path, 'storm', [[1, 1, 1, 1]]))
+
+
+def test_cache_hits_are_not_run_again(tmp_path, fake_engines):
+    backend = storm_sweep(tmp_path, fake_engines)
+    books = tmp_path / 'books.dat'
+    books.write_text('the quick brown fox\n')
+    result_cache = cache.ResultCache(str(tmp_path / 'cache'), backend.jar, backend.version(), backend.home)
+
+    def sweep_once(name, force=False):
+        path = str(tmp_path / name)
+        plan = Plan()
+        cli.run_engine(backend, [runs(tmp_path, 'storm', [[1, 1, 1, 1]], properties={'wc.spout.path': str(books)})],
+                       str(tmp_path / 'runs'), journal.Journal(path), result_cache, force=force, plan=plan)
+        [record] = records(journal.Journal(path)).values()
+        return record, started(path), plan.results
+
+    measured, launched, _ = sweep_once('first.jsonl')
+    assert measured['state'] == 'completed' and launched == ['1111']
+    record, launched, results = sweep_once('second.jsonl')
+    assert launched == []
+    assert (record['state'], record['run_id'], record['throughput']) == ('completed', measured['run_id'],
+                                                                          measured['throughput'])
+    assert record['cached']
+    assert results == [('1111', measured['throughput'])]
+    # --force measures it again
+    _, launched, _ = sweep_once('forced.jsonl', force=True)
+    assert launched == ['1111']
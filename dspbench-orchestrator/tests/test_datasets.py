@@ -0,0 +1,92 @@
+"""A run's input files, warming them into the page cache and telling I/O-bound runs apart."""
+import json
+import mmap
+
+import pytest
+
+from orchestrator import datasets, sweep, trace
+
+
+def run(tmp_path, **properties):
+    config = tmp_path / 'config'
+    config.mkdir(exist_ok=True)
+    (config / 'wordcount.properties').write_text('wc.source.threads=1\nwc.source.path=data/books.dat\n')
+    spec = {'engine': 'flink', 'exec': 'stream', 'config_dir': str(config), 'metrics_dir': str(tmp_path / 'metrics'),
+            'repetitions': 1}
+    app = {'name': 'wordcount', 'prefix': 'WC', 'stages': ['wc.source.threads'], 'grid': [[1]],
+           'properties': properties}
+    return sweep.make_run(spec, app, [1], 1)
+
+
+@pytest.fixture
+def module(tmp_path):
+    """An engine module directory with the dataset the config points to."""
+    data = tmp_path / 'module' / 'data'
+    data.mkdir(parents=True)
+    (data / 'books.dat').write_bytes(b'the quick brown fox\n' * 1000)
+    return tmp_path / 'module'
+
+
+def test_input_files_are_taken_from_the_module_dir(tmp_path, module):
+    assert datasets.input_files(run(tmp_path), str(module)) == [str(module / 'data' / 'books.dat')]
+    assert datasets.unresolved(run(tmp_path), str(module)) == []
+
+
+def test_input_directories_are_walked(tmp_path, module):
+    (module / 'data' / 'more').mkdir()
+    (module / 'data' / 'more' / 'part-0').write_text('x\n')
+    found = datasets.input_files(run(tmp_path, **{'wc.source.path': str(module / 'data')}), str(tmp_path))
+    assert found == [str(module / 'data' / 'books.dat'), str(module / 'data' / 'more' / 'part-0')]
+
+
+def test_unresolved_inputs(tmp_path, module):
+    missing = run(tmp_path, **{'wc.source.path': '/nonexistent/books.dat'})
+    assert datasets.input_files(missing, str(module)) == []
+    assert datasets.unresolved(missing, str(module)) == ['/nonexistent/books.dat']
+    # an empty path is no input at all
+    assert datasets.unresolved(run(tmp_path, **{'wc.source.path': ''}), str(module)) == []
+
+
+def test_touched_files_are_resident(module):
+    path = str(module / 'data' / 'books.dat')
+    datasets.touch(path)
+    found = datasets.residency(path)
+    if found is None:
+        pytest.skip('no mincore(2) on this host')
+    assert found[1] == -(-20000 // mmap.PAGESIZE)
+    assert found[0] == found[1]
+    empty = module / 'empty'
+    empty.write_bytes(b'')
+    datasets.touch(str(empty))
+    assert datasets.residency(str(empty)) == (0, 0)
+
+
+def test_warm_reports_and_traces_the_inputs(tmp_path, module, capsys):
+    tracer = trace.Tracer(str(tmp_path / 'sweep.jsonl'), 'flink')
+    inputs = datasets.warm(run(tmp_path), str(module), tracer)
+    assert inputs['files'] == [str(module / 'data' / 'books.dat')]
+    assert inputs['bytes'] == 20000
+    assert inputs['resident'] in (None, 1.0)
+    assert 'inputs: 1 files, 0.0 MB' in capsys.readouterr().out
+    with open(tmp_path / 'sweep.jsonl') as f:
+        [span] = [json.loads(line) for line in f]
+    assert (span['phase'], span['bytes'], 'files' in span) == ('warm', 20000, False)
+
+
+def test_warm_without_inputs_says_nothing(tmp_path, capsys):
+    inputs = datasets.warm(run(tmp_path), str(tmp_path / 'nowhere'))
+    assert (inputs['files'], inputs['bytes'], inputs['cached']) == ([], 0, None)
+    assert capsys.readouterr().out == ''
+
+
+def test_bound():
+    warm = {'files': ['books.dat'], 'resident': 1.0}
+    assert datasets.bound(None) is None
+    assert datasets.bound({'files': [], 'resident': None}) is None
+    # inputs that did not fit in the page cache are read from disk during the run
+    assert datasets.bound(dict(warm, resident=0.5)) == 'io'
+    assert datasets.bound(warm) == 'cpu'
+    assert datasets.bound(warm, {'system': [{'cpu': 0.8, 'iowait': 0.01}] * 3}) == 'cpu'
+    assert datasets.bound(warm, {'system': [{'cpu': 0.5, 'iowait': 0.2}] * 3}) == 'io'
+    # without mincore only the iowait tells
+    assert datasets.bound(dict(warm, resident=None), {'system': [{'cpu': 0.5, 'iowait': 0.2}]}) == 'io'
@@ -0,0 +1,146 @@
+"""Operator rates from metrics files, and the sweep progress rendered and served in both formats."""
+import re
+import urllib.error
+import urllib.request
+
+import pytest
+
+from orchestrator import exporter, journal, sweep
+
+T0 = 1700000000
+
+
+def run(tmp_path, conf, repetition=1):
+    return sweep.Run(engine='flink', app='wordcount', repetition=repetition, stages=(), values=(), conf=conf,
+                     config_path='', metrics_output=str(tmp_path / conf) + '/', overrides={}, batch={})
+
+
+def write(path, rows):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(''.join('%d,%d\n' % row for row in rows))
+
+
+def test_rates_leave_the_newest_second_out(tmp_path):
+    # two instances of an operator, 100 tuples/s each; the last second is still filling up
+    for instance in (1, 2):
+        write(tmp_path / ('Splitter-%d-received.csv' % instance), [(T0 + i, 100) for i in range(9)] + [(T0 + 9, 10)])
+    paths = [str(tmp_path / 'Splitter-1-received.csv'), str(tmp_path / 'Splitter-2-received.csv')]
+    assert exporter.rates(paths) == (200.0, 1820, T0 + 9)
+    assert exporter.rates(paths, window=20) == (200.0, 1820, T0 + 9)
+    # millisecond buckets count by their second
+    write(tmp_path / 'Sink-received.csv', [(T0 * 1000 + 500 * i, 50) for i in range(6)])
+    assert exporter.rates([str(tmp_path / 'Sink-received.csv')]) == (100.0, 300, T0 + 2)
+    write(tmp_path / 'Single-received.csv', [(T0, 5)])
+    assert exporter.rates([str(tmp_path / 'Single-received.csv')]) == (None, 5, T0)
+    assert exporter.rates([]) is None
+
+
+def test_counter_rates_span_the_last_window(tmp_path):
+    path = tmp_path / 'splitter.tuples-received.csv'
+    write(path, [(T0 + i, 100 * i) for i in range(11)])
+    with open(path, 'a') as f:
+        f.write('%d,cut\n' % (T0 + 11))
+    assert exporter.counter_rates(str(path)) == (100.0, 1000, T0 + 10)
+    write(path, [(T0, 40)])
+    assert exporter.counter_rates(str(path)) == (None, 40, T0)
+    path.write_text('')
+    assert exporter.counter_rates(str(path)) is None
+
+
+def test_operators_read_bucket_and_counter_files(tmp_path):
+    write(tmp_path / 'Splitter-received.csv', [(T0 + i, 100) for i in range(4)])
+    write(tmp_path / 'Splitter-emitted.csv', [(T0 + i, 1000) for i in range(4)])
+    # the threads engine's cumulative counters, not an operator called "sink.tuples"
+    write(tmp_path / 'sink.tuples-received.csv', [(T0, 0), (T0 + 2, 500)])
+    write(tmp_path / 'Empty-received.csv', [])
+    assert exporter.operators(str(tmp_path)) == {('Splitter', 'received'): (100.0, 400, T0 + 3),
+                                                 ('Splitter', 'emitted'): (1000.0, 4000, T0 + 3),
+                                                 ('sink', 'received'): (250.0, 500, T0 + 2)}
+
+
+@pytest.fixture
+def progress(tmp_path):
+    """An exporter following a sweep of 3 runs: one completed, one cached and one in flight."""
+    sweep_journal = journal.Journal(str(tmp_path / 'journal.jsonl'))
+    progress = exporter.Exporter(sweep_journal, 0)
+    progress.plan(3)
+    done, cached, running = run(tmp_path, '11'), run(tmp_path, '12'), run(tmp_path, '14')
+    sweep_journal.started(done, 'job-1')
+    sweep_journal.completed(done, throughput=100.0)
+    sweep_journal.completed(cached, cached=True)
+    sweep_journal.started(running, 'job "3"')
+    progress.follow(running)({'tuples': 1234})
+    write(tmp_path / '14' / 'Splitter-received.csv', [(T0 + i, 100) for i in range(4)])
+    yield progress
+    if progress.server:
+        progress.server.shutdown()
+        progress.server.server_close()
+
+
+def sample(text, name):
+    """{labels: value} of the samples of name in an exposition."""
+    return {labels: float(value) for labels, value in re.findall(r'^%s(\{[^}]*\})? (\S+)$' % re.escape(name),
+                                                                     text, re.M)}
+
+
+RUN = 'engine="flink",app="wordcount",conf="14",repetition="1"'
+OPERATOR = '{%s,operator="Splitter"}' % RUN
+
+
+def test_render_the_text_format(progress):
+    text = progress.render(openmetrics=False)
+    assert '# EOF' not in text
+    # counters are named by their samples, info families are gauges
+    assert '# TYPE dspbench_sweep_runs_total counter' in text
+    assert '# TYPE dspbench_run_info gauge' in text
+    assert sample(text, 'dspbench_sweep_runs_total') == {'{engine="flink",state="cached"}': 1,
+                                                         '{engine="flink",state="completed"}': 1}
+    assert sample(text, 'dspbench_sweep_runs_planned') == {'': 3}
+    assert sample(text, 'dspbench_sweep_remaining_seconds')[''] >= 0
+    assert sample(text, 'dspbench_run_info') == {'{%s,run_id="job \\"3\\""}' % RUN: 1}
+    assert sample(text, 'dspbench_run_elapsed_seconds')['{%s}' % RUN] >= 0
+    assert sample(text, 'dspbench_job_received_tuples_total') == {'{%s}' % RUN: 1234}
+    assert sample(text, 'dspbench_operator_received_tuples_per_second') == {OPERATOR: 100.0}
+    assert sample(text, 'dspbench_operator_received_tuples_total') == {OPERATOR: 400}
+    assert sample(text, 'dspbench_operator_last_report_timestamp_seconds') == {OPERATOR: T0 + 3}
+    # nothing was emitted, so the family is left out altogether
+    assert 'dspbench_operator_emitted' not in text
+
+
+def test_render_openmetrics(progress):
+    text = progress.render()
+    assert text.endswith('\n# EOF\n')
+    # counters and info families are named without the suffix their samples carry
+    assert '# TYPE dspbench_sweep_runs counter' in text
+    assert '# TYPE dspbench_run info' in text
+    assert '# TYPE dspbench_job_received_tuples counter' in text
+    assert sample(text, 'dspbench_sweep_runs_total')['{engine="flink",state="completed"}'] == 1
+    assert sample(text, 'dspbench_run_info') == {'{%s,run_id="job \\"3\\""}' % RUN: 1}
+
+
+def test_finished_runs_leave_the_exposition(tmp_path):
+    sweep_journal = journal.Journal(str(tmp_path / 'journal.jsonl'))
+    progress = exporter.Exporter(sweep_journal, 0)
+    # unknown plan, nothing measured: no estimate
+    assert 'dspbench_sweep_remaining_seconds' not in progress.render()
+    assert 'dspbench_sweep_runs_planned' not in progress.render()
+    sweep_journal.started(run(tmp_path, '11'), 'job-1')
+    assert 'dspbench_run_info' in progress.render()
+    sweep_journal.failed(run(tmp_path, '11'), 'boom')
+    text = progress.render()
+    assert 'dspbench_run_info' not in text
+    assert sample(text, 'dspbench_sweep_runs_total') == {'{engine="flink",state="failed"}': 1}
+
+
+def test_served_in_the_format_asked_for(progress):
+    port = progress.start().server.server_address[1]
+    url = 'http://127.0.0.1:%d/metrics' % port
+    with urllib.request.urlopen(urllib.request.Request(url, headers={'Accept': exporter.OPENMETRICS})) as response:
+        assert response.headers['Content-Type'] == exporter.OPENMETRICS
+        assert response.read().decode().endswith('# EOF\n')
+    with urllib.request.urlopen(url) as response:
+        assert response.headers['Content-Type'] == exporter.TEXT
+        assert '# TYPE dspbench_sweep_runs_total counter' in response.read().decode()
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen('http://127.0.0.1:%d/other' % port)
+    assert error.value.code == 404
@@ -0,0 +1,192 @@
+"""Waiting on a Flink cluster through a stub JobManager REST API.
+
+The cluster daemons are stood in for by sleeping processes whose command
+lines carry the daemon's class and --configDir, which is all
+cluster_processes() looks at.
+"""
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from orchestrator import flink
+
+
+def overview(taskmanagers, available, total=4):
+    return {'taskmanagers': taskmanagers, 'slots-total': total, 'slots-available': available}
+
+
+def daemon(cls, conf_dir):
+    return subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)', cls, '--configDir', conf_dir])
+
+
+@pytest.fixture
+def daemons():
+    started = []
+
+    def start(cls, conf_dir):
+        proc = daemon(cls, str(conf_dir))
+        started.append(proc)
+        return proc
+    yield start
+    for proc in started:
+        proc.kill()
+        proc.wait()
+
+
+def test_wait_until_ready_once_slots_register(serve):
+    polls = []
+
+    def handle(m, q):
+        polls.append(1)
+        if len(polls) < 3:
+            return 503, {'errors': ['starting']}
+        if len(polls) < 5:
+            return 200, overview(0, 0)
+        return 200, overview(1, 4)
+    client = flink.RestClient(serve([('GET', '/overview', handle)]))
+    flink.wait_until_ready(client, 4, timeout=10, interval=0.01, check_processes=False)
+    assert len(polls) == 5
+
+
+def test_wait_until_ready_times_out_short_of_slots(serve):
+    client = flink.RestClient(serve([('GET', '/overview', lambda m, q: (200, overview(1, 2)))]))
+    with pytest.raises(flink.ClusterError, match="4 free slots.*'slots-available': 2"):
+        flink.wait_until_ready(client, 4, timeout=0.2, interval=0.01, check_processes=False)
+
+
+def test_wait_until_ready_times_out_without_rest(closed_url):
+    with pytest.raises(flink.ClusterError, match='not answering'):
+        flink.wait_until_ready(flink.RestClient(closed_url), 1, timeout=0.2, interval=0.01, check_processes=False)
+
+
+def test_wait_until_ready_fails_when_a_daemon_dies(serve, daemons, tmp_path):
+    daemons(flink.JOBMANAGER_CLASS, tmp_path)
+    tm = daemons(flink.TASKMANAGER_CLASS, tmp_path)
+    polls = []
+
+    def handle(m, q):
+        polls.append(1)
+        if len(polls) == 2:
+            tm.kill()
+            tm.wait()
+        return 200, overview(0, 0)
+    client = flink.RestClient(serve([('GET', '/overview', handle)]))
+    with pytest.raises(flink.ClusterError, match='TaskManager process exited'):
+        flink.wait_until_ready(client, 1, timeout=10, interval=0.01, conf_dir=str(tmp_path))
+
+
+def test_wait_until_ready_ignores_other_clusters(serve, daemons, tmp_path):
+    other = daemons(flink.TASKMANAGER_CLASS, tmp_path / 'other')
+    daemons(flink.JOBMANAGER_CLASS, tmp_path)
+    daemons(flink.TASKMANAGER_CLASS, tmp_path)
+    polls = []
+
+    def handle(m, q):
+        polls.append(1)
+        if len(polls) == 2:
+            other.kill()
+            other.wait()
+        return 200, overview(1, 1 if len(polls) > 3 else 0)
+    client = flink.RestClient(serve([('GET', '/overview', handle)]))
+    flink.wait_until_ready(client, 1, timeout=10, interval=0.01, conf_dir=str(tmp_path))
+
+
+def test_wait_until_stopped_once_rest_goes_down(serve):
+    polls = []
+
+    def handle(m, q):
+        polls.append(1)
+        return (200, overview(1, 4)) if len(polls) < 3 else (503, {'errors': ['shutting down']})
+    client = flink.RestClient(serve([('GET', '/overview', handle)]))
+    flink.wait_until_stopped(client, timeout=10, interval=0.01, check_processes=False)
+    assert len(polls) == 3
+
+
+def test_wait_until_stopped_waits_for_daemons(daemons, closed_url, tmp_path):
+    jm = daemons(flink.JOBMANAGER_CLASS, tmp_path)
+    timer = threading.Timer(0.3, jm.kill)
+    timer.start()
+    try:
+        flink.wait_until_stopped(flink.RestClient(closed_url), timeout=10, interval=0.01, conf_dir=str(tmp_path))
+    finally:
+        timer.cancel()
+    assert jm.wait() is not None
+
+
+def test_wait_until_stopped_times_out(serve, daemons, tmp_path):
+    daemons(flink.TASKMANAGER_CLASS, tmp_path)
+    client = flink.RestClient(serve([('GET', '/overview', lambda m, q: (200, overview(1, 4)))]))
+    with pytest.raises(flink.ClusterError, match="Flink cluster to stop.*'rest_up': True"):
+        flink.wait_until_stopped(client, timeout=0.2, interval=0.01, conf_dir=str(tmp_path))
+
+
+class JobManager:
+    """Jobs and slots of a stub JobManager; a cancelled job is CANCELED on the next listing."""
+
+    def __init__(self, jobs, slots=4):
+        self.jobs = dict(jobs)
+        self.slots = slots
+        self.cancels = []
+        self.fail_jobs = 0
+        self.fail_cancels = 0
+
+    def routes(self):
+        return [('GET', '/jobs/overview', self.list), ('PATCH', '/jobs/([0-9a-f]+)', self.cancel),
+                ('GET', '/overview', self.overview)]
+
+    def list(self, m, q):
+        if self.fail_jobs:
+            self.fail_jobs -= 1
+            return 500, {'errors': ['job vanished while listing']}
+        for jid, state in self.jobs.items():
+            if state == 'CANCELLING':
+                self.jobs[jid] = 'CANCELED'
+        return 200, {'jobs': [{'jid': jid, 'state': state} for jid, state in self.jobs.items()]}
+
+    def cancel(self, m, q):
+        self.cancels.append(m.group(1))
+        if self.fail_cancels:
+            self.fail_cancels -= 1
+            return 500, {'errors': ['cannot cancel yet']}
+        self.jobs[m.group(1)] = 'CANCELLING'
+        return 202, {}
+
+    def overview(self, m, q):
+        busy = sum(1 for state in self.jobs.values() if state not in flink.TERMINAL_STATES)
+        return 200, overview(1, self.slots - busy, self.slots)
+
+
+def test_release_cancels_leftover_jobs(serve):
+    jm = JobManager({'a' * 32: 'RUNNING', 'b' * 32: 'FINISHED'})
+    flink.release(flink.RestClient(serve(jm.routes())), 4, timeout=10, interval=0.01)
+    assert jm.cancels == ['a' * 32]
+
+
+def test_release_retries_failed_listing(serve):
+    jm = JobManager({'a' * 32: 'RUNNING'})
+    jm.fail_jobs = 2
+    flink.release(flink.RestClient(serve(jm.routes())), 4, timeout=10, interval=0.01)
+    assert jm.cancels == ['a' * 32]
+
+
+def test_release_retries_failed_cancel(serve, capsys):
+    jm = JobManager({'a' * 32: 'RUNNING'})
+    jm.fail_cancels = 1
+    flink.release(flink.RestClient(serve(jm.routes())), 4, timeout=10, interval=0.01)
+    assert jm.cancels == ['a' * 32] * 2
+    assert 'cannot cancel job %s yet' % ('a' * 32) in capsys.readouterr().out
+
+
+def test_release_times_out_on_a_stuck_job(serve):
+    jm = JobManager({'a' * 32: 'RUNNING'})
+    routes = jm.routes()
+    routes[1] = ('PATCH', '/jobs/([0-9a-f]+)', lambda m, q: (202, {}))
+    with pytest.raises(flink.ClusterError, match='jobs to finish and 4 slots'):
+        flink.release(flink.RestClient(serve(routes)), 4, timeout=0.2, interval=0.01)
+
+
+def test_release_fails_fast_without_jobmanager(closed_url):
+    with pytest.raises(flink.ClusterError, match='not reachable'):
+        flink.release(flink.RestClient(closed_url), 4, timeout=10, interval=0.01)
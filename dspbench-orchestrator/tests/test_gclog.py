@@ -0,0 +1,113 @@
+"""Parsing -Xlog:gc lines, cutting them per run and lining them up with the sink throughput."""
+import os
+
+import pytest
+
+from orchestrator import gclog
+
+T0 = 1700000000
+
+
+def line(ms, gc, pause, before='24M', after='4M', heap='256M', kind='Pause Young (Normal) (G1 Evacuation Pause)'):
+    # what -Xlog:gc:<file>:timemillis writes for a pause
+    return '[%dms] GC(%d) %s %s->%s(%s) %.3fms\n' % (T0 * 1000 + ms, gc, kind, before, after, heap, pause)
+
+
+def write_log(directory, pid, *lines):
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, 'gc-%d.log' % pid), 'w') as f:
+        f.writelines(lines)
+
+
+def sinks(metrics_output, counts):
+    os.makedirs(metrics_output, exist_ok=True)
+    with open(os.path.join(metrics_output, 'Sink-received.csv'), 'w') as f:
+        f.writelines('%d,%d\n' % (T0 + i, n) for i, n in enumerate(counts))
+
+
+def test_option_and_properties(tmp_path):
+    option = gclog.option(str(tmp_path / 'gc'))
+    assert option == '-Xlog:gc:%s/gc-%%p.log:timemillis' % (tmp_path / 'gc')
+    # passed on unquoted in config strings
+    assert not set(' ,=') & set(option)
+    assert gclog.properties('spark', str(tmp_path)) == {'spark.executor.extraJavaOptions': gclog.option(str(tmp_path))}
+    assert gclog.properties('storm', str(tmp_path)) == {'topology.worker.childopts': gclog.option(str(tmp_path))}
+    assert gclog.properties('flink', str(tmp_path)) == {}
+
+
+def test_flink_env_keeps_the_configured_options(tmp_path):
+    (tmp_path / 'conf').mkdir()
+    (tmp_path / 'conf' / 'flink-conf.yaml').write_text('env.java.opts.taskmanager: "-XX:+UseG1GC"\n')
+    assert gclog.flink_env(str(tmp_path), '/gc') == {'FLINK_ENV_JAVA_OPTS_TM': '-XX:+UseG1GC ' + gclog.option('/gc')}
+
+
+def test_parse_pause_lines():
+    lines = ['[%dms] Using G1\n' % (T0 * 1000),
+             line(1500, 0, 3.456),
+             line(2250, 1, 120.5, before='1G', after='512M', heap='2G', kind='Pause Full (System.gc())'),
+             line(2300, 2, 0.8, before='2048K', after='1024K', kind='Pause Remark'),
+             '[%dms] GC(3) Concurrent Mark Cycle 12.345ms\n' % (T0 * 1000 + 2400),
+             'GC(4) Pause Young (Normal) 24M->4M(256M) 3.456ms\n']
+    assert gclog.parse(lines) == [
+        {'time': T0 + 1.5, 'gc': 0, 'kind': 'Pause Young (Normal) (G1 Evacuation Pause)', 'before': 24.0,
+         'after': 4.0, 'heap': 256.0, 'pause': 3.456},
+        {'time': T0 + 2.25, 'gc': 1, 'kind': 'Pause Full (System.gc())', 'before': 1024.0, 'after': 512.0,
+         'heap': 2048.0, 'pause': 120.5},
+        {'time': T0 + 2.3, 'gc': 2, 'kind': 'Pause Remark', 'before': 2.0, 'after': 1.0, 'heap': 256.0,
+         'pause': 0.8}]
+
+
+def test_series_spreads_allocation_between_collections():
+    pauses = {'1': [{'time': T0 + 0.5, 'before': 100.0, 'after': 10.0, 'pause': 5.0},
+                    {'time': T0 + 2.5, 'before': 210.0, 'after': 20.0, 'pause': 7.0}],
+              '2': [{'time': T0 + 1.2, 'before': 50.0, 'after': 30.0, 'pause': 2.0}]}
+    # pid 1 allocated 200 MB over the 2 s between its collections, 50 MB/s in the halves at either end
+    assert gclog.series(pauses) == [
+        (T0, 1, 5.0, 5.0, 50.0, 10.0),
+        (T0 + 1, 1, 2.0, 2.0, 100.0, 40.0),
+        (T0 + 2, 1, 7.0, 7.0, 50.0, 50.0)]
+    assert gclog.series({}) == []
+
+
+def test_histogram():
+    assert dict(gclog.histogram([0.5, 3, 4.9, 150, 2500])) == {
+        1: 1, 2: 0, 5: 2, 10: 0, 20: 0, 50: 0, 100: 0, 200: 1, 500: 0, 1000: 0, None: 1}
+
+
+def test_collect_cuts_the_run_out_of_the_logs(tmp_path, capsys):
+    gc_dir = str(tmp_path / 'gc')
+    write_log(gc_dir, 101, line(-5000, 0, 9.0), line(1500, 1, 3.0), line(2500, 2, 300.0), line(9000, 3, 9.0))
+    write_log(gc_dir, 102, line(2100, 0, 1.0))
+    metrics_output = str(tmp_path / 'run')
+    sinks(metrics_output, [1000] * 6)
+    pauses = gclog.collect(gc_dir, {'started': T0 - 1, 'ended': T0 + 5}, metrics_output)
+    assert {pid: [p['gc'] for p in ps] for pid, ps in pauses.items()} == {'101': [1, 2], '102': [0]}
+    with open(os.path.join(metrics_output, 'gc.log')) as f:
+        assert f.readline() == '101 ' + line(1500, 1, 3.0)
+    with open(os.path.join(metrics_output, 'gc.csv')) as f:
+        assert f.read().splitlines() == ['time,pauses,pause_ms,max_pause_ms,alloc_mb_s,heap_after_mb',
+                                         '%d,1,3.000,3.000,10.0,4.0' % (T0 + 1),
+                                         '%d,2,301.000,300.000,10.0,8.0' % (T0 + 2)]
+    assert capsys.readouterr().out.startswith('gc: 3 pauses, 304 ms paused')
+
+
+def test_collect_without_a_run_window_or_logs(tmp_path):
+    assert gclog.collect(str(tmp_path), {'started': T0}, str(tmp_path / 'run')) == {}
+    assert gclog.collect(str(tmp_path / 'none'), {'started': T0, 'ended': T0 + 5}, str(tmp_path / 'run')) == {}
+    assert not os.path.exists(tmp_path / 'run')
+
+
+def test_summary_and_dips_within_the_throughput_window(tmp_path):
+    gc_dir = str(tmp_path / 'gc')
+    # a long pause in second 3 while the sinks only got a third of their usual tuples
+    write_log(gc_dir, 101, line(0, 0, 50.0), line(1500, 1, 2.0), line(3200, 2, 400.0), line(6500, 3, 5.0))
+    metrics_output = str(tmp_path / 'run')
+    sinks(metrics_output, [500, 1000, 1000, 300, 1000, 1000, 200])
+    gclog.collect(gc_dir, {'started': T0 - 1, 'ended': T0 + 10}, metrics_output)
+    assert gclog.dips(metrics_output) == [(T0 + 3, 300, 1000, 400.0)]
+    fields = gclog.summary(metrics_output)
+    # the window is seconds 1..5; the pauses at 0 and 6 are start-up and shutdown
+    assert (fields['gc_pauses'], fields['gc_ms'], fields['gc_max_ms'], fields['gc_dips']) == (2, 402.0, 400.0, 1)
+    assert fields['gc_share'] == pytest.approx(0.402 / 5)
+    assert fields['gc_histogram'] == {'<5ms': 1, '<500ms': 1}
+    assert gclog.summary(str(tmp_path / 'none')) == {}
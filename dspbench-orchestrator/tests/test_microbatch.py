@@ -0,0 +1,67 @@
+"""Micro-batch points: their journal fields, stability and the per-parallelism table."""
+from orchestrator import microbatch, sweep
+
+POINT = {'wc.batch.interval': 500, 'wc.batch.size': 2000}
+
+
+def run(tmp_path, batch=POINT):
+    return sweep.Run(engine='spark', app='wordcount', repetition=1, stages=(), values=(),
+                     conf='1111' + sweep.batch_label(batch), config_path='', metrics_output=str(tmp_path) + '/',
+                     overrides={}, batch=dict(batch))
+
+
+def record(batch, batch_ms, throughput=1000.0, conf='1111', state='completed', app='wordcount'):
+    return {'engine': 'spark', 'app': app, 'conf': conf + sweep.batch_label(batch), 'state': state,
+            'batch': batch, 'batch_ms': batch_ms, 'throughput': throughput}
+
+
+def test_interval_and_size_of_a_point():
+    assert (microbatch.interval(POINT), microbatch.size(POINT)) == (500, 2000)
+    assert (microbatch.interval({}), microbatch.size({})) == (None, None)
+
+
+def test_summary_reads_the_batches_of_a_run(tmp_path):
+    # query,batch,time,rows,duration; batch 0 also planned the query
+    lines = ['wc,0,1700000000000,2000,4000'] + ['wc,%d,1700000000%03d,2000,%d' % (i, i, 100 + i) for i in range(1, 21)]
+    (tmp_path / 'batches.csv').write_text('\n'.join(lines) + '\nwc,cut\n')
+    assert microbatch.summary(run(tmp_path)) == {'batch': POINT, 'batches': 20, 'batch_ms': 119}
+    assert microbatch.summary(run(tmp_path / 'elsewhere')) == {'batch': POINT, 'batches': 0}
+    # a cached run reads the metrics the run it stands in for left
+    assert microbatch.summary(run(tmp_path / 'elsewhere'), str(tmp_path))['batches'] == 20
+
+
+def test_a_point_is_stable_while_batches_finish_within_the_interval():
+    assert microbatch.stable(record(POINT, 499))
+    assert not microbatch.stable(record(POINT, 500))
+    assert not microbatch.stable(record(POINT, None))
+    # as fast as it can has no interval to keep
+    assert not microbatch.stable(record({'wc.batch.interval': 0, 'wc.batch.size': 2000}, 10))
+
+
+def test_table_groups_points_by_parallelism():
+    fast = {'wc.batch.interval': 250, 'wc.batch.size': 2000}
+    rows = microbatch.table([
+        record(POINT, 300, 1000.0), record(POINT, 450, 1200.0),
+        record(fast, 200, 900.0), record(fast, 300, 700.0),
+        record(POINT, 100, conf='2222'),
+        # neither failed runs nor runs without a batch point count
+        record(POINT, 9000, state='failed'),
+        {'engine': 'spark', 'app': 'wordcount', 'conf': '1111', 'state': 'completed', 'batch': {}, 'throughput': 5.0}])
+    assert sorted(rows) == [('spark', 'wordcount', '1111'), ('spark', 'wordcount', '2222')]
+    assert rows[('spark', 'wordcount', '1111')] == [
+        {'batch': fast, 'throughput': 800.0, 'batch_ms': 300, 'stable': False},
+        {'batch': POINT, 'throughput': 1100.0, 'batch_ms': 450, 'stable': True}]
+
+
+def test_report_names_the_smallest_stable_interval():
+    fast = {'wc.batch.interval': 250, 'wc.batch.size': 2000}
+    lines = list(microbatch.report([record(POINT, 300, 1100.0), record(fast, 300, 800.0),
+                                    record(POINT, 600, conf='2222')]))
+    assert lines == [
+        'spark wordcount 1111:',
+        '  interval    250 ms, size    2000:      800.0 tuples/s, p95 batch 300 ms',
+        '  interval    500 ms, size    2000:     1100.0 tuples/s, p95 batch 300 ms, stable',
+        '  smallest stable interval: 500 ms (size 2000, 1100.0 tuples/s)',
+        'spark wordcount 2222:',
+        '  interval    500 ms, size    2000:     1000.0 tuples/s, p95 batch 600 ms',
+        '  no stable batch interval']
@@ -0,0 +1,137 @@
+"""Sweep wall-time estimates from the timing logs in txts/."""
+import datetime
+
+import pytest
+
+from orchestrator import journal, planner, sweep
+
+T0 = datetime.datetime(2024, 1, 1, 12, 0, 0)
+
+
+def spec(tmp_path, apps, engine='spark', repetitions=2):
+    return {'engine': engine, 'exec': 'stream', 'config_dir': str(tmp_path), 'metrics_dir': str(tmp_path / 'metrics'),
+            'repetitions': repetitions, 'apps': apps}
+
+
+def app(name, grid, batches=None, **extra):
+    entry = dict({'name': name, 'prefix': name[:2].upper(), 'stages': ['%s.stage%d.threads' % (name[:2], i)
+                                                                     for i in range(len(grid[0]))],
+                  'grid': grid}, **extra)
+    if batches:
+        entry['batches'] = batches
+    return entry
+
+
+def log(txts, app_name, conf, *seconds, exec='stream'):
+    run = sweep.Run(engine='spark', app=app_name, repetition=1, stages=(), values=(), conf=conf, config_path='',
+                    metrics_output='', overrides={}, exec=exec)
+    for s in seconds:
+        planner.log_time(str(txts), run, T0, T0 + datetime.timedelta(seconds=s))
+
+
+def test_history_reads_batch_labels(tmp_path):
+    log(tmp_path, 'wordcount', '1111-500-2000', 40, 50)
+    log(tmp_path, 'wordcount', '1111', 70)
+    assert planner.history(str(tmp_path), ['wordcount'], 'stream') == {
+        ('wordcount', 'stream', '1111-500-2000'): [40.0, 50.0],
+        ('wordcount', 'stream', '1111'): [70.0]}
+
+
+def test_history_reads_dashed_app_names(tmp_path):
+    log(tmp_path, 'spike-detection', '1244-1000', 30)
+    log(tmp_path, 'spike', '12', 90)
+    timed = planner.history(str(tmp_path), ['spike-detection', 'spike'], 'stream')
+    assert timed == {('spike-detection', 'stream', '1244-1000'): [30.0], ('spike', 'stream', '12'): [90.0]}
+
+
+def test_history_skips_other_execs_and_apps(tmp_path):
+    log(tmp_path, 'wordcount', '1111', 40, exec='batch')
+    log(tmp_path, 'other', '1111', 40)
+    assert planner.history(str(tmp_path), ['wordcount'], 'stream') == {}
+
+
+def test_estimate_uses_the_history_of_batch_configs(tmp_path):
+    batches = [{'wc.batch.interval': 500, 'wc.batch.size': 2000}, {'wc.batch.interval': 1000, 'wc.batch.size': 2000}]
+    s = spec(tmp_path, [app('wordcount', [[1, 1, 1, 1]], batches)])
+    log(tmp_path, 'wordcount', '1111-500-2000', 40, 60)
+    [estimate] = planner.estimate(s, txts_dir=str(tmp_path), overhead=0)
+    assert estimate.configs == ['1111-500-2000', '1111-1000-2000']
+    # the config without history of its own is estimated from the app's
+    assert estimate.lengths == [50, 50]
+    assert estimate.sources == ['history', 'app']
+
+
+def test_parse_duration():
+    assert planner.parse_duration('8h') == 8 * 3600
+    assert planner.parse_duration('90m') == 5400
+    assert planner.parse_duration(' 600s ') == 600
+    # a bare number is hours
+    assert planner.parse_duration('1.5') == 5400
+    with pytest.raises(ValueError, match="not a duration: '8 hours'"):
+        planner.parse_duration('8 hours')
+
+
+def test_hms():
+    assert planner.hms(59.6) == '1m00s'
+    assert planner.hms(3599) == '59m59s'
+    assert planner.hms(3600 + 25 * 60) == '1h25m'
+
+
+def test_history_skips_unreadable_lines(tmp_path):
+    log(tmp_path, 'wordcount', '1111', 40)
+    with open(tmp_path / 'wordcount-stream-1111.txt', 'a') as f:
+        f.write('garbage\n2024-01-01 12:00:00 - yesterday\n2024-01-01 12:00:00 - 2024-01-01 11:00:00\n')
+    # and files whose rest is no conf label, such as another app's called wordcount-stream-...
+    (tmp_path / 'wordcount-stream-notes.txt').write_text('%s - %s\n' % (T0, T0 + datetime.timedelta(seconds=5)))
+    assert planner.history(str(tmp_path), ['wordcount'], 'stream') == {('wordcount', 'stream', '1111'): [40.0]}
+
+
+def test_default_length(tmp_path):
+    (tmp_path / 'wordcount.properties').write_text('wo.runtime_sec=120\n')
+    assert planner.default_length(spec(tmp_path, [], engine='storm'), app('wordcount', [[1]])) == 300
+    assert planner.default_length(spec(tmp_path, []), app('wordcount', [[1]])) == 120
+    # the sweep's properties win over the app's config file
+    assert planner.default_length(spec(tmp_path, []), app('wordcount', [[1]],
+                                                          properties={'wo.runtime_sec': '45'})) == 45
+    assert planner.default_length(spec(tmp_path, []), app('spikes', [[1]])) == planner.DEFAULT_RUNTIME
+
+
+def test_estimate_falls_back_from_history_to_app_to_default(tmp_path):
+    s = spec(tmp_path, [app('wordcount', [[1, 1], [2, 2]]), app('spikes', [[1, 1]])])
+    log(tmp_path, 'wordcount', '11', 30, 50, 100)
+    wordcount, spikes = planner.estimate(s, txts_dir=str(tmp_path))
+    assert (wordcount.lengths, wordcount.sources) == ([50, 50], ['history', 'app'])
+    assert (spikes.lengths, spikes.sources) == ([planner.DEFAULT_RUNTIME], ['default'])
+    # every run pays the engine's overhead on top, twice per config
+    assert wordcount.runs == 4
+    assert wordcount.total == 2 * (50 + 50 + 2 * planner.OVERHEAD['spark'])
+
+
+def test_estimate_leaves_out_completed_runs(tmp_path):
+    s = spec(tmp_path, [app('wordcount', [[1, 1], [2, 2]])], repetitions=3)
+    done = journal.Journal(str(tmp_path / 'journal.jsonl'))
+    for run in sweep.expand(s):
+        if run.conf == '11' or run.repetition == 1:
+            done.completed(run, throughput=1.0)
+    [estimate] = planner.estimate(s, txts_dir=str(tmp_path), overhead=0, done=done)
+    assert (estimate.configs, estimate.repetitions) == (['22'], 2)
+
+
+def test_report_fits_a_window(tmp_path):
+    s = spec(tmp_path, [app('wordcount', [[1, 1], [2, 2], [1, 1]])])
+    log(tmp_path, 'wordcount', '11', 60)
+    lines = list(planner.report(planner.estimate(s, txts_dir=str(tmp_path), overhead=0), window=3600))
+    assert lines[0].split() == ['app', 'configs', 'dups', 'runs', 'per', 'run', 'source', 'total', 'cumulative',
+                                'budget', 'reps']
+    assert lines[1].split() == ['wordcount', '2', '1', '4', '1m00s', 'history', '1', 'app', '1', '4m00s', '4m00s',
+                                '4m00s', '2']
+    assert lines[2] == 'duplicate: wordcount [1, 1] runs the same config as [1, 1]'
+    assert lines[-2:] == ['total: 4 runs, 4m00s', 'fits in 1h00m with 56m00s to spare']
+
+
+def test_report_over_the_window_says_how_many_repetitions_fit(tmp_path):
+    s = spec(tmp_path, [app('wordcount', [[1, 1], [2, 2]])], repetitions=5)
+    log(tmp_path, 'wordcount', '11', 60)
+    lines = list(planner.report(planner.estimate(s, txts_dir=str(tmp_path), overhead=0), window=300))
+    assert lines[1].endswith(' 5m00s     2  over')
+    assert lines[-1] == 'over 5m00s by 5m00s; the whole sweep fits with 2 repetitions'
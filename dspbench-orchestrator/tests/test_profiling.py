@@ -0,0 +1,154 @@
+"""Collapsed stacks, flame graphs and their aggregation across configs."""
+import os
+import re
+import stat
+import subprocess
+import sys
+
+import pytest
+
+from orchestrator import profiling, snapshots, sweep
+
+STACKS = {'Thread.run;Task.invoke;Splitter.flatMap;String.split': 60,
+          'Thread.run;Task.invoke;Counter.map;HashMap.get': 30,
+          'Thread.run;Task.invoke;Sink.invoke': 10}
+
+
+def frames(*names):
+    # the frames of a `jfr print --json` stack trace, leaf first
+    return {'frames': [{'method': {'type': {'name': cls.replace('.', '/')}, 'name': method}}
+                       for cls, _, method in (name.rpartition('.') for name in names)]}
+
+
+def rects(document):
+    """{frame: width} of the rectangles of a flame graph."""
+    return {html_title.split(' (')[0]: float(width)
+            for html_title, width in re.findall(r'<title>([^<]*)</title><rect x="[\d.]+" y="\d+" width="([\d.]+)"',
+                                                document)}
+
+
+def test_save_and_load_collapsed_stacks(tmp_path):
+    path = str(tmp_path / profiling.COLLAPSED)
+    profiling.save(STACKS, path)
+    with open(path, 'a') as f:
+        # a thread name with spaces, and a line cut short
+        f.write('pool worker 1;Task.invoke 5\nThread.run;Task.in\n')
+    assert profiling.load(path) == dict(STACKS, **{'pool worker 1;Task.invoke': 5})
+    assert profiling.load(str(tmp_path / 'none.collapsed')) == {}
+    assert profiling.merge([{'a;b': 1}, {'a;b': 2, 'a': 1}]) == {'a;b': 3, 'a': 1}
+
+
+def test_jfr_cpu_samples_are_collapsed_root_first():
+    document = {'recording': {'events': [
+        {'type': 'jdk.ExecutionSample', 'values': {'stackTrace': frames('java.lang.String.split', 'Splitter.flatMap',
+                                                                        'java.lang.Thread.run')}},
+        {'type': 'jdk.ExecutionSample', 'values': {'stackTrace': frames('java.lang.String.split', 'Splitter.flatMap',
+                                                                        'java.lang.Thread.run')}},
+        {'type': 'jdk.ExecutionSample', 'values': {'stackTrace': None}},
+        {'type': 'jdk.GCPhasePause', 'values': {}}]}}
+    assert profiling.jfr_stacks(document) == {'java.lang.Thread.run;Splitter.flatMap;java.lang.String.split': 2}
+
+
+def test_jfr_allocation_samples_weigh_bytes_with_the_class_as_leaf():
+    document = {'recording': {'events': [
+        {'type': 'jdk.ObjectAllocationSample', 'values': {'stackTrace': frames('Splitter.flatMap'), 'weight': 4096,
+                                                          'objectClass': {'name': 'java/lang/String'}}},
+        {'type': 'jdk.ExecutionSample', 'values': {'stackTrace': frames('Splitter.flatMap')}}]}}
+    assert profiling.jfr_stacks(document, 'alloc') == {'Splitter.flatMap;java.lang.String': 4096}
+
+
+def test_flame_graph_widths_follow_the_samples():
+    document = profiling.svg(STACKS, 'flink cpu, 2 worker JVMs <test>')
+    assert document.startswith('<?xml') and document.rstrip().endswith('</svg>')
+    assert 'flink cpu, 2 worker JVMs &lt;test&gt;' in document
+    widths = rects(document)
+    assert widths['all'] == profiling.WIDTH
+    assert widths['Splitter.flatMap'] == pytest.approx(0.6 * profiling.WIDTH)
+    assert widths['Sink.invoke'] == pytest.approx(0.1 * profiling.WIDTH)
+    # one level per frame plus the root
+    assert 'height="%d"' % (5 * profiling.FRAME + 40) in document
+    assert rects(profiling.svg({}, 'nothing')) == {}
+
+
+def test_differential_flame_graph_colors_the_change():
+    base = {'Thread.run;Splitter.flatMap': 50, 'Thread.run;Counter.map': 50}
+    document = profiling.svg({'Thread.run;Splitter.flatMap': 80, 'Thread.run;Counter.map': 20}, 'diff', base)
+    grew = re.search(r'<title>Splitter.flatMap \(80.00%, was 50.00%\)</title><rect [^>]*fill="rgb\(255,', document)
+    shrank = re.search(r'<title>Counter.map \(20.00%, was 50.00%\)</title><rect [^>]*fill="rgb\(\d+,\d+,255\)',
+                       document)
+    assert grew and shrank
+
+
+def test_share_hottest_and_report():
+    assert profiling.share(STACKS, r'^Splitter\.|^Counter\.') == pytest.approx(0.9)
+    assert profiling.share({}, 'x') == 0.0
+    assert profiling.hottest(STACKS, 2) == [('String.split', 0.6), ('HashMap.get', 0.3)]
+    groups = {('flink', 'wordcount', '1111'): {'values': (1, 1, 1, 1), 'runs': 1, 'stacks': STACKS},
+              ('flink', 'wordcount', '1244'): {'values': (1, 2, 4, 4), 'runs': 2,
+                                               'stacks': {'Thread.run;HashMap.get': 100}}}
+    assert list(profiling.report(groups, [r'HashMap'])) == [
+        'flink wordcount:', '  conf                samples        HashMap',
+        '  1111                    100          30.0%', '  1244                    100         100.0%']
+    assert list(profiling.report(groups))[1] == ('  1111                    100  '
+                                                 'String.split 60.0%, HashMap.get 30.0%, Sink.invoke 10.0%')
+
+
+def profiled_run(tmp_path, values, stacks):
+    config = tmp_path / 'config'
+    config.mkdir(exist_ok=True)
+    (config / 'wordcount.properties').write_text('wc.splitter.threads=1\n')
+    spec = {'engine': 'flink', 'exec': 'stream', 'config_dir': str(config), 'metrics_dir': str(tmp_path / 'metrics')}
+    app = {'name': 'wordcount', 'prefix': 'WC', 'stages': ['wc.splitter.threads', 'wc.counter.threads']}
+    snap = snapshots.create(sweep.make_run(spec, app, list(values), 1), str(tmp_path / 'runs'))
+    profiling.save(stacks, snap.file(profiling.COLLAPSED))
+
+
+def test_aggregate_sums_runs_and_diffs_against_the_lowest_parallelism(tmp_path):
+    profiled_run(tmp_path, (1, 1), {'Thread.run;Splitter.flatMap': 10})
+    profiled_run(tmp_path, (2, 4), {'Thread.run;Splitter.flatMap': 10, 'Thread.run;Counter.map': 10})
+    profiled_run(tmp_path, (2, 4), {'Thread.run;Counter.map': 5})
+    groups = profiling.aggregate(str(tmp_path / 'runs'))
+    assert groups[('flink', 'wordcount', '24')] == {'values': (2, 4), 'runs': 2, 'stacks': {
+        'Thread.run;Splitter.flatMap': 10, 'Thread.run;Counter.map': 15}}
+    assert profiling.baselines(groups) == {('flink', 'wordcount'): '11'}
+    out = tmp_path / 'runs' / profiling.PROFILES_DIR
+    assert sorted(os.listdir(out)) == ['flink-wordcount-11.collapsed', 'flink-wordcount-11.svg',
+                                       'flink-wordcount-24-diff.svg', 'flink-wordcount-24.collapsed',
+                                       'flink-wordcount-24.svg']
+    assert profiling.load(str(out / 'flink-wordcount-24.collapsed')) == groups[('flink', 'wordcount', '24')]['stacks']
+
+
+# an async-profiler stand-in: writes one stack naming the pid it was pointed at
+ASPROF = '''#!%s
+import sys
+args = sys.argv[1:]
+with open(args[args.index('-f') + 1], 'w') as f:
+    f.write('Thread.run;Worker%%s.run %%s\\n' %% (args[-1], 7))
+'''
+
+
+def test_record_profiles_the_workers_of_its_run(tmp_path, monkeypatch):
+    asprof = tmp_path / 'asprof'
+    asprof.write_text(ASPROF % sys.executable)
+    asprof.chmod(asprof.stat().st_mode | stat.S_IXUSR)
+    monkeypatch.setenv('ASYNC_PROFILER', str(asprof))
+    marker = 'dspbench-profiling-%d' % os.getpid()
+    sleep = [sys.executable, '-c', 'import time; time.sleep(30)', marker, '--conf']
+    mine, other = (subprocess.Popen(sleep + [str(tmp_path / name)]) for name in ('mine', 'other'))
+    try:
+        profiler = profiling.Profiler('flink', str(tmp_path), duration=1, jvms={'taskmanager': marker},
+                                      scope=str(tmp_path / 'mine'))
+        profile = profiler.record()
+    finally:
+        for proc in (mine, other):
+            proc.kill()
+            proc.wait()
+    assert profile == {'event': 'cpu', 'tool': 'async', 'jvms': {mine.pid: 'taskmanager'}, 'samples': 7,
+                       'errors': {}}
+    assert profiling.load(str(tmp_path / profiling.COLLAPSED)) == {'Thread.run;Worker%d.run' % mine.pid: 7}
+    assert 'flink cpu, 1 worker JVMs' in (tmp_path / profiling.FLAME_GRAPH).read_text()
+
+
+def test_unknown_event_or_tool_is_refused(tmp_path):
+    with pytest.raises(ValueError, match='cannot profile wall with async'):
+        profiling.Profiler('flink', str(tmp_path), event='wall')
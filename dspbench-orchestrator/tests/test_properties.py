@@ -0,0 +1,135 @@
+"""properties.serialize against what properties-serializer.jar prints, and render().
+
+data/serialized.json holds the expected strings of every shipped config
+and of data/escapes.properties, by path from the repository root:
+
+    jar-java11       what the jar printed on Java 11, the order of _hashmap_order
+    derived-java8    not jar output: no Java 8 JVM was at hand. Java 11's
+                     java.util.Hashtable, filled in file order and its keys
+                     copied into a new Hashtable as Java 8's
+                     Properties.stringPropertyNames() does, printed this.
+                     It checks _hashtable_order against the JDK's Hashtable
+                     rather than against Java 8 itself.
+
+A new config needs its entries in both.
+"""
+import json
+import os
+
+import pytest
+
+from orchestrator import properties
+
+DATA = os.path.join(os.path.dirname(__file__), 'data')
+REPO = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+with open(os.path.join(DATA, 'serialized.json')) as f:
+    EXPECTED = json.load(f)
+JAR_JAVA11 = EXPECTED['jar-java11']
+DERIVED_JAVA8 = EXPECTED['derived-java8']
+
+
+@pytest.mark.parametrize('path', sorted(JAR_JAVA11))
+def test_serialize_matches_jar_on_java11(path):
+    assert properties.serialize(os.path.join(REPO, path), 11) == JAR_JAVA11[path]
+
+
+@pytest.mark.parametrize('path', sorted(DERIVED_JAVA8))
+def test_serialize_matches_derived_java8_order(path):
+    assert properties.serialize(os.path.join(REPO, path), 8) == DERIVED_JAVA8[path]
+
+
+def test_expected_strings_cover_shipped_configs():
+    shipped = set()
+    for module in os.listdir(REPO):
+        config_dir = os.path.join(REPO, module, 'src', 'main', 'resources', 'config')
+        if module.startswith('dspbench-') and os.path.isdir(config_dir):
+            shipped.update(os.path.join(module, 'src', 'main', 'resources', 'config', name)
+                           for name in os.listdir(config_dir) if name.endswith('.properties'))
+    assert shipped <= set(JAR_JAVA11)
+    assert shipped <= set(DERIVED_JAVA8)
+
+
+def test_orders_differ_by_java_version():
+    # the shipped configs are big enough for the two tables to resize differently
+    assert any(DERIVED_JAVA8[path] != JAR_JAVA11[path] for path in JAR_JAVA11)
+
+
+def test_loads_unescapes_and_joins_continuations():
+    props = properties.load(os.path.join(DATA, 'escapes.properties'))
+    assert props['escaped=key:name'] == 'with=equals'
+    assert props['escaped space'] == 'x'
+    assert props['unicode'] == 'café A'
+    assert props['tabs'] == 'a\tb'
+    assert props['continued'] == 'first,second,third'
+    assert props['even.backslashes'] == 'ends with \\'
+    assert props['indented.key'] == 'padded value   '
+    assert props['space'] == 'separated value'
+    assert props['colon'] == 'separated'
+    assert props['key.only'] == ''
+    assert props['duplicate'] == 'second'
+    assert props['trailing.continuation'] == 'done'
+    assert not any(key.startswith(('#', '!')) for key in props)
+
+
+def test_render_replaces_in_place():
+    text = '# comment\na=1\nb=2\nc=3\n'
+    assert properties.render(text, {'b': '20'}) == '# comment\na=1\nb=20\nc=3\n'
+
+
+def test_render_keeps_untouched_entries_verbatim():
+    text = '! bang\nkey : spaced\n  indented=x\n'
+    assert properties.render(text, {}) == text
+    assert properties.render(text, {'other': 'y'}) == text + 'other=y\n'
+
+
+def test_render_replaces_continuation_whole():
+    text = 'a=1\nlist=x,\\\n     y,\\\n     z\nb=2\n'
+    rendered = properties.render(text, {'list': 'w'})
+    assert rendered == 'a=1\nlist=w\nb=2\n'
+    assert properties.loads(rendered) == {'a': '1', 'list': 'w', 'b': '2'}
+
+
+def test_render_escapes_keys():
+    rendered = properties.render('', {'odd key=name:x': 'v'})
+    assert rendered == 'odd\\ key\\=name\\:x=v\n'
+    assert properties.loads(rendered) == {'odd key=name:x': 'v'}
+
+
+def test_render_matches_escaped_keys():
+    text = 'escaped\\=key\\:name=old\n'
+    assert properties.render(text, {'escaped=key:name': 'new'}) == 'escaped\\=key\\:name=new\n'
+
+
+def test_render_drops_duplicates_of_overridden_key():
+    text = 'a=1\nb=2\na=3\nc=4\na=5\n'
+    rendered = properties.render(text, {'a': '9'})
+    assert rendered == 'a=9\nb=2\nc=4\n'
+    # a duplicate that is not overridden stays, and the last one still wins
+    assert properties.render(text, {'b': '7'}) == 'a=1\nb=7\na=3\nc=4\na=5\n'
+    assert properties.loads(properties.render(text, {'b': '7'}))['a'] == '5'
+
+
+def test_render_appends_missing_keys_in_order():
+    text = 'a=1\n'
+    assert properties.render(text, {'z': '26', 'a': '2', 'm': '13'}) == 'a=2\nz=26\nm=13\n'
+
+
+def test_render_appends_after_missing_final_newline():
+    assert properties.render('a=1', {'b': '2'}) == 'a=1\nb=2\n'
+    assert properties.render('a=1\n# last', {'b': '2'}) == 'a=1\n# last\nb=2\n'
+    assert properties.render('', {'b': '2'}) == 'b=2\n'
+
+
+def test_render_ends_a_dangling_continuation():
+    rendered = properties.render('a=1\\\n', {'b': '2'})
+    assert properties.loads(rendered) == {'a': '1', 'b': '2'}
+
+
+def test_render_round_trips_escapes():
+    path = os.path.join(DATA, 'escapes.properties')
+    with open(path, encoding='latin-1') as f:
+        text = f.read()
+    overrides = {'continued': 'one', 'duplicate': 'third', 'new.key': 'v'}
+    expected = dict(properties.loads(text), **overrides)
+    assert properties.loads(properties.render(text, overrides)) == expected
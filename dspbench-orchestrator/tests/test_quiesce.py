@@ -0,0 +1,84 @@
+"""The quiesce gate: its limits, and waiting on a host that settles or does not."""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from orchestrator import quiesce, sweep, trace
+
+QUIET = {'load': 0.1, 'cpu': 0.02, 'dirty': 1.0, 'processes': []}
+
+
+def run():
+    return sweep.Run(engine='spark', app='wordcount', repetition=1, stages=(), values=(), conf='1111', config_path='',
+                     metrics_output='', overrides={})
+
+
+@pytest.fixture
+def samples(monkeypatch):
+    """Replays the given host states to the gate, one per sample, and keeps the patterns it looked for."""
+    looked_for = []
+
+    def replay(*states):
+        states = list(states)
+
+        def sample(interval, patterns):
+            looked_for.append(patterns)
+            return states.pop(0) if len(states) > 1 else states[0]
+        monkeypatch.setattr(quiesce, 'sample', sample)
+        return looked_for
+    return replay
+
+
+def test_parse_limits():
+    assert quiesce.parse_limits('load=0.8, cpu=0.2') == {'load': 0.8, 'cpu': 0.2}
+    with pytest.raises(ValueError, match="not a limit: 'swap=1'"):
+        quiesce.parse_limits('load=1,swap=1')
+    with pytest.raises(ValueError, match="not a limit: 'dirty'"):
+        quiesce.parse_limits('dirty')
+
+
+def test_over_names_what_is_busy():
+    assert quiesce.over(QUIET, quiesce.LIMITS) == []
+    assert quiesce.over(dict(QUIET, cpu=0.9, dirty=500.0, processes=[42]), quiesce.LIMITS) == [
+        'cpu', 'dirty', 'processes']
+    # a limit is inclusive
+    assert quiesce.over(dict(QUIET, load=0.5), quiesce.LIMITS) == []
+
+
+def test_gate_waits_until_the_host_is_quiet(samples, tmp_path):
+    looked_for = samples(dict(QUIET, cpu=0.8), dict(QUIET, processes=[1234]), QUIET)
+    tracer = trace.Tracer(str(tmp_path / 'sweep.jsonl'), 'spark')
+    assert quiesce.Gate('spark', max_wait=60, interval=0).wait(tracer, run())
+    # the executors of the previous run are what it waits for, not the cluster's daemons
+    assert looked_for == [quiesce.LINGERING['spark']] * 3
+    with open(tmp_path / 'sweep.jsonl') as f:
+        [span] = [json.loads(line) for line in f]
+    assert (span['phase'], span['run'], span['over'], span['cpu']) == ('quiesce', 'spark/wordcount/1111/1', [], 0.02)
+
+
+def test_gate_gives_up_at_max_wait(samples, capsys):
+    samples(dict(QUIET, load=3.0))
+    assert not quiesce.Gate('flink', limits={'load': 2.0}, max_wait=0.05, interval=0).wait()
+    assert 'host still busy after 0s (load 3.0), starting anyway' in capsys.readouterr().out
+
+
+def test_gate_with_no_wait_does_not_sample(samples):
+    looked_for = samples(dict(QUIET, load=3.0))
+    assert quiesce.Gate('flink', max_wait=0).wait()
+    assert looked_for == []
+
+
+def test_sample_reads_the_host_and_finds_lingering_processes():
+    marker = 'dspbench-quiesce-test-%d' % os.getpid()
+    proc = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)', marker])
+    try:
+        state = quiesce.sample(0.05, (marker,))
+    finally:
+        proc.kill()
+        proc.wait()
+    assert state['processes'] == [proc.pid]
+    assert 0 <= state['cpu'] <= 1 and state['load'] >= 0 and state['dirty'] >= 0
+    assert quiesce.sample(0.01)['processes'] == []
@@ -0,0 +1,103 @@
+"""/proc readings of the resource sampler, on processes started by the test."""
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from orchestrator import procs, resources
+
+T0 = 1700000000
+
+# renames itself to a command name with spaces and parentheses, as a JVM thread may be called, then spins
+SPINNER = '''
+import sys, time
+with open('/proc/self/comm', 'w') as f:
+    f.write(sys.argv[1])
+print('ready', flush=True)
+end = time.time() + 30
+while time.time() < end:
+    pass
+'''
+
+
+@pytest.fixture
+def spinner():
+    started = []
+
+    def start(marker, comm='java (C2) 1'):
+        proc = subprocess.Popen([sys.executable, '-c', SPINNER, comm, marker], stdout=subprocess.PIPE)
+        proc.stdout.readline()
+        started.append(proc)
+        return proc
+    yield start
+    for proc in started:
+        proc.kill()
+        proc.wait()
+
+
+def test_pid_ticks_reads_past_a_command_name_with_spaces_and_parentheses(spinner):
+    proc = spinner('dspbench-resources-%d' % os.getpid())
+    with open('/proc/%d/stat' % proc.pid) as f:
+        assert '(java (C2) 1)' in f.read()
+    first = procs.pid_ticks(proc.pid)
+    time.sleep(0.3)
+    assert procs.pid_ticks(proc.pid) > first >= 0
+    assert procs.pid_status(proc.pid, 'VmRSS', 'Threads')['Threads'] == 1
+
+
+def test_gone_processes_read_as_none(spinner):
+    proc = spinner('dspbench-resources-%d' % os.getpid())
+    proc.kill()
+    proc.wait()
+    assert procs.pid_ticks(proc.pid) is None
+    assert procs.pid_status(proc.pid, 'VmRSS') == {}
+
+
+def test_host_counters():
+    busy, iowait, total = procs.cpu_times()
+    assert 0 <= busy <= total and 0 <= iowait <= total
+    assert procs.meminfo('MemAvailable', 'MemTotal')['MemTotal'] > 0
+    assert all(v >= 0 for v in procs.net_bytes() + procs.disk_bytes())
+
+
+def test_sampler_writes_the_host_and_its_jvms(tmp_path, spinner):
+    marker = 'dspbench-resources-%d' % os.getpid()
+    mine = spinner(marker + ' --conf ' + str(tmp_path / 'mine'))
+    # another run's JVM of the same role, which the scope leaves out
+    spinner(marker + ' --conf ' + str(tmp_path / 'other'))
+    sampler = resources.Sampler(str(tmp_path / 'metrics'), {'worker': marker}, scope=str(tmp_path / 'mine'))
+    for _ in range(3):
+        sampler.sample()
+        time.sleep(0.3)
+    host = resources.load(str(tmp_path / 'metrics' / resources.HOST_FILE))
+    jvms = resources.load(str(tmp_path / 'metrics' / resources.JVM_FILE))
+    # the first sample only starts the counters
+    assert len(host) == 2
+    assert set(host[0]) == set(resources.HOST_COLUMNS)
+    assert {(row['role'], row['pid']) for row in jvms} == {('worker', mine.pid)}
+    assert all(row['cpu'] > 0 and row['threads'] == 1 for row in jvms)
+
+
+def test_summary_averages_over_the_throughput_window(tmp_path):
+    metrics_output = tmp_path / 'run'
+    metrics_output.mkdir()
+    (metrics_output / 'Sink-received.csv').write_text(''.join('%d,100\n' % (T0 + i) for i in range(6)))
+    with open(metrics_output / resources.HOST_FILE, 'w') as f:
+        f.write(','.join(resources.HOST_COLUMNS) + '\n')
+        for i in range(6):
+            # the samples outside 1..4 are start-up and shutdown
+            cpu = 0.5 if 1 <= i <= 4 else 0.0
+            f.write('%d,%s,0.01,1000,1000000,1000000,3000000,0\n' % (T0 + i, cpu))
+    with open(metrics_output / resources.JVM_FILE, 'w') as f:
+        f.write(','.join(resources.JVM_COLUMNS) + '\n')
+        for i in range(1, 5):
+            f.write('%d,worker,1,2.0,%d,40\n%d,worker,2,1.0,1024,40\n' % (T0 + i, 1024 * i, T0 + i))
+    assert resources.window(str(metrics_output)) == (T0 + 1, T0 + 4)
+    assert resources.summary(str(metrics_output)) == {'seconds': 4, 'cpu': 0.5, 'iowait': 0.01, 'net_mb_s': 2.0,
+                                                      'disk_mb_s': 3.0, 'jvm_cores': 3.0, 'jvm_rss_mb': 5.0}
+
+
+def test_summary_of_a_run_without_samples(tmp_path):
+    assert resources.summary(str(tmp_path)) == {}
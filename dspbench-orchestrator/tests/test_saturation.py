@@ -0,0 +1,120 @@
+"""Saturation search: judging a probe from its operator metrics, and bisecting the rate."""
+import os
+
+import pytest
+
+from orchestrator import saturation
+
+T0 = 1700000000
+
+
+def write(metrics_output, operator, counts):
+    os.makedirs(metrics_output, exist_ok=True)
+    with open(os.path.join(metrics_output, operator + '-received.csv'), 'a') as f:
+        f.writelines('%d,%d\n' % (T0 + i, n) for i, n in enumerate(counts))
+
+
+def engine(run, rate, capacity, seconds=12):
+    """Write the metrics of a probe at rate of a config that processes capacity tuples/s."""
+    if not capacity:
+        # stuck: its operators never get to report anything
+        return
+    if rate <= capacity:
+        received = [rate] * seconds
+    else:
+        # queues fill up and backpressure slows everything down over the run
+        received = [capacity] * (seconds // 2) + [capacity * 0.7] * (seconds - seconds // 2)
+    write(run.metrics_output, 'Splitter', [int(n) for n in received])
+    write(run.metrics_output, 'Sink', [int(n * 10) for n in received])
+
+
+def spec(tmp_path, grid):
+    config = tmp_path / 'config'
+    config.mkdir()
+    (config / 'wordcount.properties').write_text('wc.source.class=flink.source.FileSource\nwc.source.threads=1\n')
+    return {'engine': 'flink', 'exec': 'stream', 'config_dir': str(config), 'metrics_dir': str(tmp_path / 'metrics'),
+            'repetitions': 1, 'apps': [{'name': 'wordcount', 'prefix': 'WC', 'grid': grid,
+                                        'stages': ['wc.source.threads', 'wc.splitter.threads']}]}
+
+
+def search(plan, capacities):
+    """Run the search to the end against configs of the given capacity; the rates probed per config."""
+    probed = {}
+    while True:
+        runs = plan.next_round()
+        if not runs:
+            return probed
+        for run in runs:
+            rate = run.overrides['wc.source.rate']
+            probed.setdefault(run.conf, []).append(rate)
+            engine(run, rate, capacities[run.conf])
+            plan.add(run, float(rate))
+
+
+def test_judge_a_sustained_probe(tmp_path):
+    write(str(tmp_path), 'Splitter', [1000] * 12)
+    write(str(tmp_path), 'Sink', [10000] * 12)
+    sustained, gains, reason = saturation.judge(1000, str(tmp_path))
+    assert (sustained, reason) == (True, '')
+    assert gains == {'Sink': 10.0, 'Splitter': 1.0}
+
+
+def test_judge_a_probe_that_slowed_down(tmp_path):
+    write(str(tmp_path), 'Splitter', [1000] * 6 + [600] * 6)
+    sustained, _, reason = saturation.judge(1000, str(tmp_path))
+    assert not sustained
+    assert reason == 'Splitter slowed down from 1000 to 600 tuples/s'
+
+
+def test_judge_a_probe_that_fell_behind_the_offered_rate(tmp_path):
+    # steady, but the splitter only gets half of what it got at a rate it surely kept up with
+    write(str(tmp_path), 'Splitter', [1000] * 12)
+    sustained, _, reason = saturation.judge(2000, str(tmp_path), reference={'Splitter': 1.0})
+    assert not sustained
+    assert reason == 'Splitter got 1000 of 2000 tuples/s'
+
+
+def test_judge_without_metrics(tmp_path):
+    assert saturation.judge(1000, str(tmp_path)) == (False, {}, 'no operator metrics in %s' % tmp_path)
+
+
+def test_the_rate_doubles_then_bisects(tmp_path):
+    plan = saturation.Plan(spec(tmp_path, [[1, 1], [1, 4]]), start_rate=1000, precision=0.05)
+    probed = search(plan, {'11': 2500, '14': 9000})
+    # doubling until a probe fails, then halving the range between the last good rate and the first bad one
+    assert probed['11'] == [1000, 2000, 4000, 3000, 2500, 2750, 2625]
+    assert probed['14'][:5] == [1000, 2000, 4000, 8000, 16000]
+    capacities = plan.capacities()
+    assert capacities[('wordcount', '11')] == 2500
+    assert 9000 * 0.95 <= capacities[('wordcount', '14')] <= 9000
+    assert list(plan.report())[0] == 'wordcount 11: capacity 2500 tuples/s (2625 not sustained, 7 probes)'
+
+
+def test_a_config_that_holds_nothing(tmp_path):
+    plan = saturation.Plan(spec(tmp_path, [[1, 1]]), start_rate=1000)
+    probed = search(plan, {'11': 0})
+    assert probed['11'] == [1000, 500, 250, 125, 62, 31, 15, 7, 3, 1]
+    assert plan.capacities() == {('wordcount', '11'): None}
+    assert list(plan.report()) == ['wordcount 11: not even 1 tuples/s sustained']
+
+
+def test_max_probes_ends_the_search(tmp_path):
+    plan = saturation.Plan(spec(tmp_path, [[1, 1]]), start_rate=1000, max_probes=3)
+    assert search(plan, {'11': 10 ** 9})['11'] == [1000, 2000, 4000]
+    assert list(plan.report()) == ['wordcount 11: capacity at least 4000 tuples/s, every probe was sustained']
+
+
+def test_probes_use_the_rate_limited_source(tmp_path):
+    plan = saturation.Plan(spec(tmp_path, [[1, 1]]), runtime=30)
+    [run] = plan.next_round()
+    assert run.overrides['wc.source.class'] == saturation.RATE_SOURCES['flink']
+    assert (run.overrides['wc.source.rate'], run.overrides['wc.runtime_sec'], run.runtime) == (1000, 30, 30)
+    assert run.exec == 'saturate'
+    # a failed probe counts as not sustained
+    plan.add(run, None)
+    assert plan.next_round()[0].overrides['wc.source.rate'] == 500
+
+
+def test_engines_without_a_rate_limited_source_are_refused(tmp_path):
+    with pytest.raises(ValueError, match='storm has no rate-limited source'):
+        saturation.Plan(dict(spec(tmp_path, [[1, 1]]), engine='storm'))
@@ -0,0 +1,116 @@
+"""Successive halving over the parallelism space, on a clock that only moves as runs take their runtime."""
+import random
+
+import pytest
+
+from orchestrator import search
+
+STAGES = ['wc.source.threads', 'wc.splitter.threads', 'wc.counter.threads', 'wc.sink.threads']
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(search, 'time', clock)
+    return clock
+
+
+def spec(tmp_path):
+    return {'engine': 'flink', 'exec': 'stream', 'config_dir': str(tmp_path), 'metrics_dir': str(tmp_path / 'metrics'),
+            'repetitions': 1, 'apps': []}
+
+
+def app(grid=None):
+    return {'name': 'wordcount', 'prefix': 'WC', 'stages': STAGES, 'grid': grid or []}
+
+
+def throughput(values):
+    # the counter stage is the bottleneck, the others barely matter
+    return 1000.0 * values[2] + sum(values)
+
+
+def rounds(plan, clock, until=None):
+    """Run rounds like the driver, one runtime each, and return the (runtime, configs) of every round."""
+    done = []
+    while until is None or len(done) < until:
+        runs = plan.next_round()
+        if not runs:
+            break
+        assert len({run.runtime for run in runs}) == 1
+        done.append((runs[0].runtime, [run.values for run in runs]))
+        clock.now += runs[0].runtime
+        for run in runs:
+            plan.add(run, throughput(run.values))
+    return done
+
+
+def test_space_needs_a_thread_per_stage():
+    with pytest.raises(ValueError, match='budget of 3 cores cannot give each of 4 stages a thread'):
+        search.Space(STAGES, 3)
+
+
+def test_space_stays_within_the_budget():
+    space = search.Space(STAGES, 8)
+    rng = random.Random(1)
+    for _ in range(200):
+        values = space.sample(rng)
+        assert space.contains(values)
+        assert space.contains(space.neighbour(values, rng))
+
+
+def test_rungs_cut_the_candidates_by_eta(tmp_path, clock):
+    plan = search.Plan(spec(tmp_path), app(), cores=12, time_budget=1000, min_runtime=1, max_runtime=9, eta=3, seed=1)
+    assert plan.runtimes == [1, 3, 9]
+    bracket = rounds(plan, clock, until=3)
+    assert [(runtime, len(configs)) for runtime, configs in bracket] == [(1, 9), (3, 3), (9, 1)]
+    first, second, third = (configs for _, configs in bracket)
+    assert sorted(second) == sorted(sorted(first, key=throughput, reverse=True)[:3])
+    assert third == [max(second, key=throughput)]
+    assert all(sum(values) <= 12 for values in first)
+
+
+def test_grid_rows_that_fit_are_tried_first(tmp_path, clock):
+    grid = [[1, 1, 1, 1], [2, 2, 2, 2], [4, 4, 4, 4]]
+    plan = search.Plan(spec(tmp_path), app(grid), cores=12, time_budget=1000, min_runtime=1, max_runtime=9, eta=3,
+                       seed=1)
+    [(_, first)] = rounds(plan, clock, until=1)
+    # 4444 needs 16 cores
+    assert first[:2] == [(1, 1, 1, 1), (2, 2, 2, 2)]
+    assert (4, 4, 4, 4) not in first
+
+
+def test_time_budget_is_respected(tmp_path, clock):
+    plan = search.Plan(spec(tmp_path), app(), cores=12, time_budget=30, min_runtime=1, max_runtime=9, eta=3, seed=1)
+    done = rounds(plan, clock)
+    # two brackets of 1 + 3 + 9 s and two rungs of a third; its 9 s rung would end at 39 s
+    assert [runtime for runtime, _ in done] == [1, 3, 9, 1, 3, 9, 1, 3]
+    assert clock.now == 30
+    assert plan.next_round() == []
+
+
+def test_the_winner_is_the_best_of_the_longest_rung(tmp_path, clock):
+    plan = search.Plan(spec(tmp_path), app(), cores=12, time_budget=1000, min_runtime=1, max_runtime=9, eta=3, seed=1)
+    bracket = rounds(plan, clock, until=3)
+    values, runtime, found = plan.best()
+    assert (values, runtime) == (bracket[-1][1][0], 9)
+    assert found == throughput(values)
+    assert next(plan.report()).startswith('wordcount %s (%d cores)' % (list(values), sum(values)))
+    assert list(plan.report())[-1] == 'best: ' + ', '.join('%s=%d' % kv for kv in zip(STAGES, values))
+
+
+def test_failed_candidates_are_not_promoted(tmp_path, clock):
+    plan = search.Plan(spec(tmp_path), app(), cores=12, time_budget=1000, min_runtime=1, max_runtime=9, eta=3, seed=1)
+    runs = plan.next_round()
+    for run in runs[:2]:
+        plan.add(run, throughput(run.values))
+    # the other seven failed and left no throughput
+    second = plan.next_round()
+    assert sorted(run.values for run in second) == sorted(run.values for run in runs[:2])
@@ -0,0 +1,113 @@
+"""storm.find_submitted, storm.watch and storm.kill against a stub Storm UI."""
+import time
+
+import pytest
+
+from orchestrator import storm
+
+TOPOLOGY = 'wordcount-1-1700000000'
+
+
+def stats(emitted, acked):
+    return 200, {'topologyStats': [{'window': '600', 'emitted': 1, 'acked': 1},
+                                   {'window': ':all-time', 'emitted': emitted, 'acked': acked}]}
+
+
+def topology_route(counters):
+    return [('GET', '/api/v1/topology/([^/]+)', lambda m, q: counters(m.group(1)))]
+
+
+def test_watch_captures_a_steady_window(serve):
+    start = time.monotonic()
+
+    def counters(topology_id):
+        assert topology_id == TOPOLOGY
+        elapsed = time.monotonic() - start
+        return stats(int(2e6 * elapsed), int(1e6 * elapsed))
+    ui = storm.UiClient(serve(topology_route(counters)))
+    reason, samples = storm.watch(ui, TOPOLOGY, window=0.5, max_duration=10, interval=0.05)
+    assert reason == 'steady'
+    assert samples[-1][0] - samples[0][0] < 5
+    assert all(acked > 0 for _, _, acked in samples[1:])
+
+
+def test_watch_uses_emitted_without_acking(serve):
+    start = time.monotonic()
+    ui = storm.UiClient(serve(topology_route(lambda t: stats(int(1e6 * (time.monotonic() - start)), 0))))
+    reason, _ = storm.watch(ui, TOPOLOGY, window=0.5, max_duration=10, interval=0.05)
+    assert reason == 'steady'
+
+
+def test_watch_stops_at_the_deadline_when_throughput_swings(serve):
+    calls = []
+
+    def counters(topology_id):
+        calls.append(1)
+        # the rate alternates between fast and stalled
+        emitted = sum(1000 if i % 2 else 0 for i in range(len(calls)))
+        return stats(emitted, emitted)
+    ui = storm.UiClient(serve(topology_route(counters)))
+    start = time.monotonic()
+    reason, samples = storm.watch(ui, TOPOLOGY, window=0.2, max_duration=0.6, interval=0.05)
+    assert reason == 'deadline'
+    assert 0.6 <= time.monotonic() - start < 5
+    assert len(samples) == len(calls)
+
+
+def test_watch_stops_at_the_deadline_without_ui(closed_url):
+    reason, samples = storm.watch(storm.UiClient(closed_url), TOPOLOGY, window=0.1, max_duration=0.3,
+                                  interval=0.05)
+    assert (reason, samples) == ('deadline', [])
+
+
+def test_watch_stops_when_asked(serve):
+    ui = storm.UiClient(serve(topology_route(lambda t: stats(0, 0))))
+    checks = []
+
+    def stop():
+        checks.append(1)
+        return len(checks) > 3
+    reason, samples = storm.watch(ui, TOPOLOGY, window=10, max_duration=10, interval=0.01, stop=stop)
+    assert reason == 'stopped'
+    assert len(samples) == 3
+
+
+def test_kill_waits_until_the_topology_is_gone(serve):
+    listed = [{'id': TOPOLOGY, 'name': 'wordcount'}, {'id': 'other-2-1700000000', 'name': 'other'}]
+    killed = []
+
+    def kill(m, q):
+        killed.append(m.group(1))
+        return 200, {'status': 'success'}
+
+    def summary(m, q):
+        if killed and len(listed) == 2:
+            listed.pop(0)
+        return 200, {'topologies': listed}
+    ui = storm.UiClient(serve([('POST', '/api/v1/topology/([^/]+)/kill/0', kill),
+                               ('GET', '/api/v1/topology/summary', summary)]))
+    storm.kill(ui, {'id': TOPOLOGY, 'name': 'wordcount'}, timeout=10, interval=0.01)
+    assert killed == [TOPOLOGY]
+    assert storm.topology_ids(ui) == {'other-2-1700000000'}
+
+
+def test_topology_ids_without_ui(closed_url):
+    with pytest.raises(storm.TopologyError, match='Storm UI not reachable'):
+        storm.topology_ids(storm.UiClient(closed_url))
+
+
+
+def summary_route(*names):
+    topologies = [{'id': '%s-1-1700000000' % name, 'name': name} for name in names]
+    return [('GET', '/api/v1/topology/summary', lambda m, q: (200, {'topologies': topologies}))]
+
+
+def test_find_submitted_takes_exactly_the_name(serve):
+    ui = storm.UiClient(serve(summary_route('storm-wordcount-1111-r1', 'storm-wordcount-1111-r1-x', 'wordcount')))
+    assert storm.find_submitted(ui, 'storm-wordcount-1111-r1')['id'] == 'storm-wordcount-1111-r1-1-1700000000'
+
+
+def test_find_submitted_ignores_names_that_only_start_alike(serve):
+    ui = storm.UiClient(serve(summary_route('wordcount-123', 'wordcount-run')))
+    with pytest.raises(storm.TopologyError, match='topology wordcount to be submitted'):
+        storm.find_submitted(ui, 'wordcount', timeout=0.2, interval=0.05)
@@ -0,0 +1,79 @@
+"""Phase spans of a sweep and the overhead breakdown read back from them."""
+import json
+
+from orchestrator import sweep, trace
+
+
+def run(conf='1111'):
+    return sweep.Run(engine='flink', app='wordcount', repetition=1, stages=(), values=(), conf=conf, config_path='',
+                     metrics_output='', overrides={})
+
+
+def spans(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def span(phase, start, end, run=None, engine='flink', **attrs):
+    return dict(engine=engine, phase=phase, run=run, start=start, end=end, duration=end - start, **attrs)
+
+
+def test_null_tracer_records_nothing(tmp_path):
+    with trace.NULL.span('render', run()) as fields:
+        fields['x'] = 1
+    trace.NULL.add('run', 0, 1)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_span_appends_one_line_with_its_fields(tmp_path):
+    path = tmp_path / 'traces' / 'sweep.jsonl'
+    tracer = trace.Tracer(str(path), 'flink')
+    with tracer.span('metrics', run()) as fields:
+        fields['measured'] = 42
+    with tracer.span('sweep'):
+        pass
+    metrics, whole = spans(path)
+    assert (metrics['engine'], metrics['phase'], metrics['run'], metrics['measured']) == (
+        'flink', 'metrics', 'flink/wordcount/1111/1', 42)
+    assert metrics['end'] >= metrics['start'] and metrics['duration'] >= 0
+    assert (whole['phase'], whole['run']) == ('sweep', None)
+
+
+def test_launch_splits_submit_from_run(tmp_path):
+    tracer = trace.Tracer(str(tmp_path / 'sweep.jsonl'), 'flink')
+    # the job id turned up 3 s into the launch
+    tracer.launch(run(), {'clock': {'start': 100.0, 'job_id': 103.0, 'end': 160.0}, 'ids': {'job_id': 'abc'},
+                          'state': 'finished'})
+    # a launcher without ids is all run
+    tracer.launch(run('2222'), {'clock': {'start': 200.0, 'end': 230.0}, 'ids': {}, 'state': 'aborted'})
+    # nor is anything traced of a launch that never ended
+    tracer.launch(run('4444'), {'clock': {'start': 300.0}, 'ids': {}})
+    assert [(s['phase'], s['start'], s['end'], s.get('state')) for s in spans(tmp_path / 'sweep.jsonl')] == [
+        ('submit', 100.0, 103.0, None), ('run', 103.0, 160.0, 'finished'), ('run', 200.0, 230.0, 'aborted')]
+
+
+def test_load_skips_cut_lines(tmp_path):
+    path = tmp_path / 'sweep.jsonl'
+    path.write_text(json.dumps(span('render', 0, 1)) + '\n{"engine": "fl\n')
+    assert [s['phase'] for s in trace.load([str(path)])] == ['render']
+
+
+def test_breakdown_per_engine():
+    found = trace.breakdown([span('sweep', 0, 100), span('render', 1, 2, 'a'), span('run', 2, 52, 'a'),
+                             span('metrics', 52, 53, 'a', measured=40), span('render', 53, 54, 'b'),
+                             span('run', 0, 10, 'x', engine='storm')])
+    assert found['flink'] == {'wall': 100, 'phases': {'render': 2, 'run': 50, 'metrics': 1}, 'measured': 40,
+                              'runs': 2, 'first': 0, 'last': 100}
+    # without a sweep span the wall time runs from the first span to the last
+    assert found['storm']['wall'] == 10
+
+
+def test_report_takes_the_measured_seconds_out_of_the_run():
+    lines = list(trace.report([span('sweep', 0, 100), span('cluster-start', 0, 20, 'a'), span('run', 20, 90, 'a'),
+                               span('metrics', 90, 91, 'a', measured=60)]))
+    assert lines[0] == 'flink: 1m40s wall, 1 runs, 1m00s measured (60.0%)'
+    rows = {line.split()[0]: line.split() for line in lines[2:-1]}
+    assert rows['cluster-start'][1:3] == ['0m20s', '20.0%']
+    assert rows['run'][1:4] == ['(warm-up)', '0m10s', '10.0%']
+    assert rows['untraced'][1:3] == ['0m09s', '9.0%']
+    assert lines[-1] == '  biggest overhead: cluster-start 20.0%, run (warm-up) 10.0%, untraced 9.0%'
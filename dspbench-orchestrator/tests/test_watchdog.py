@@ -0,0 +1,64 @@
+"""watchdog.check after each probe and watchdog.diagnose of the ended run."""
+from orchestrator import watchdog
+
+
+def probes(*results, grace=10, step=5):
+    """The first reason check() gives over the (tuples, error) results of probes step seconds apart."""
+    record = {}
+    for i, (tuples, error) in enumerate(results):
+        reason = watchdog.check(record, tuples, error, (i + 1) * step, grace)
+        if reason:
+            return i, reason
+    return None
+
+
+def test_a_failed_job_is_aborted_at_once():
+    assert probes((None, 'job 1 failed')) == (0, 'job 1 failed')
+
+
+def test_a_job_without_tuples_past_the_grace_period_is_idle():
+    assert probes((0, None), (0, None), (0, None)) == (1, 'no tuples received in the first 10 s')
+
+
+def test_a_job_that_received_tuples_is_left_alone():
+    assert probes((0, None), (5, None), (5, None), (5, None)) is None
+
+
+def test_no_progress_information_past_startup_is_a_stall():
+    found = probes(*[(None, None)] * 6)
+    # probes at 10, 15 and 20 s are past the 10 s grace period
+    assert found[0] == watchdog.BLIND
+    assert found[1].startswith('no progress information for %d probes' % watchdog.BLIND)
+
+
+def test_blind_probes_count_only_in_a_row():
+    assert probes((None, None), (None, None), (None, None), (7, None), (None, None), (None, None)) is None
+    # nor before the grace period, however many there are
+    assert probes(*[(None, None)] * 10, grace=100) is None
+
+
+def test_diagnose_a_clean_run():
+    assert watchdog.diagnose({'state': 'finished', 'exit_code': 0}, '/nonexistent') is None
+    assert watchdog.diagnose({'state': 'finished', 'exit_code': 143, 'timed_out': True}, '/nonexistent') is None
+
+
+def test_diagnose_names_the_abort(tmp_path):
+    def cause(abort):
+        return watchdog.diagnose({'state': 'aborted', 'abort': abort}, str(tmp_path / 'job.log'))['cause']
+    assert cause('no tuples received in the first 60 s') == 'idle'
+    assert cause('no progress information for 3 probes past the first 60 s') == 'no-progress'
+    assert cause('job 1 failed') == 'job-failed'
+
+
+def test_diagnose_prefers_the_job_log(tmp_path):
+    log = tmp_path / 'job.log'
+    log.write_text('INFO starting\nCaused by: java.io.FileNotFoundException: /data/books.dat\n')
+    failure = watchdog.diagnose({'state': 'aborted', 'abort': 'no progress information for 3 probes past the '
+                                                             'first 60 s'}, str(log))
+    assert failure == {'cause': 'missing-input',
+                       'detail': 'Caused by: java.io.FileNotFoundException: /data/books.dat'}
+
+
+def test_diagnose_a_failed_launcher(tmp_path):
+    failure = watchdog.diagnose({'state': 'finished', 'exit_code': 1}, str(tmp_path / 'job.log'))
+    assert failure == {'cause': 'launcher', 'detail': 'launcher exited with status 1'}
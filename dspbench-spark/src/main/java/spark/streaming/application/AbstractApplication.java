@@ -9,8 +9,10 @@ import org.apache.spark.sql.SparkSession;
 import org.apache.spark.sql.streaming.DataStreamWriter;
 import org.apache.spark.sql.streaming.StreamingQuery;
 import org.apache.spark.sql.streaming.StreamingQueryException;
+import org.apache.spark.sql.streaming.Trigger;
 import org.slf4j.Logger;
 import spark.streaming.constants.BaseConstants.BaseConfig;
+import spark.streaming.metrics.BatchListener;
 import spark.streaming.sink.BaseSink;
 import spark.streaming.source.BaseSource;
 import spark.streaming.util.ClassLoaderUtils;
@@ -33,6 +35,10 @@ public abstract class AbstractApplication implements Serializable {
                 .getOrCreate();
 
         this.session.sparkContext().setLogLevel("WARN");
+
+        if (config.getBoolean(Configuration.METRICS_ENABLED, false)) {
+            this.session.streams().addListener(new BatchListener(config));
+        }
     }
 
     public abstract void initialize();
@@ -58,7 +64,7 @@ public abstract class AbstractApplication implements Serializable {
         String sinkClass = config.get(getConfigKey(BaseConfig.SINK_CLASS), "spark.streaming.sink.ConsoleSink");
         BaseSink source = (BaseSink) ClassLoaderUtils.newInstance(sinkClass, "sink", getLogger());
         source.initialize(config, session);
-        return source.sinkStream(dt); //config
+        return trigger(source.sinkStream(dt)); //config
     }
 
     protected DataStreamWriter<Row> createSink() {
@@ -69,12 +75,27 @@ public abstract class AbstractApplication implements Serializable {
         BaseSink source = (BaseSink) ClassLoaderUtils.newInstance(sinkClass, "sink", getLogger());
         source.initialize(config, session, name);
         try {
-            return source.sinkStream(dt).start(); //config
+            return trigger(source.sinkStream(dt)).start(); //config
         } catch (TimeoutException e) {
             throw new RuntimeException(e);
         }
     }
 
+    /**
+     * Starts a micro-batch every batch.interval milliseconds when that is set,
+     * instead of the sink's own trigger.
+     *
+     * @param writer The sink's stream writer
+     * @return The stream writer
+     */
+    protected DataStreamWriter<Row> trigger(DataStreamWriter<Row> writer) {
+        long interval = config.getLong(getConfigKey(BaseConfig.BATCH_INTERVAL), 0);
+        if (interval > 0) {
+            writer.trigger(Trigger.ProcessingTime(interval));
+        }
+        return writer;
+    }
+
     /**
      * Utility method to parse a configuration key with the application prefix and
      * component prefix.
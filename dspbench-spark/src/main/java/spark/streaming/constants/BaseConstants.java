@@ -12,6 +12,7 @@ public interface BaseConstants {
     interface BaseConfig {
         String OUTPUT_MODE         = "spark.output.mode";
         String BATCH_SIZE         = "%s.batch.size";
+        String BATCH_INTERVAL     = "%s.batch.interval";
         String CHECKPOINT_PATH    = "%s.checkpoint.path";
         
         String SOURCE_THREADS     = "%s.source.threads";
@@ -0,0 +1,60 @@
+package spark.streaming.metrics;
+
+import java.io.File;
+import java.io.FileWriter;
+import java.io.IOException;
+import java.io.PrintWriter;
+import java.nio.file.Paths;
+import org.apache.spark.sql.streaming.StreamingQueryListener;
+import org.apache.spark.sql.streaming.StreamingQueryProgress;
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+import spark.streaming.util.Configuration;
+
+/**
+ * Appends one line per finished micro-batch to batches.csv under metrics.output:
+ * the query, the batch id, its start in epoch milliseconds, the rows it read and
+ * the milliseconds it took to process.
+ */
+public class BatchListener extends StreamingQueryListener {
+    private static final Logger LOG = LoggerFactory.getLogger(BatchListener.class);
+    private static final String HEADER = "query,batch,time,rows,duration";
+
+    private final File file;
+
+    public BatchListener(Configuration config) {
+        File dir = Paths.get(config.get(Configuration.METRICS_OUTPUT, "/tmp")).toFile();
+        dir.mkdirs();
+        file = new File(dir, "batches.csv");
+    }
+
+    @Override
+    public void onQueryStarted(QueryStartedEvent event) {
+    }
+
+    @Override
+    public void onQueryProgress(QueryProgressEvent event) {
+        StreamingQueryProgress progress = event.progress();
+        Long duration = progress.durationMs().get("triggerExecution");
+        if (duration == null) {
+            return;
+        }
+        long start = java.time.Instant.parse(progress.timestamp()).toEpochMilli();
+        synchronized (this) {
+            boolean header = !file.exists();
+            try (PrintWriter out = new PrintWriter(new FileWriter(file, true))) {
+                if (header) {
+                    out.println(HEADER);
+                }
+                out.printf("%s,%d,%d,%d,%d%n", progress.id(), progress.batchId(), start,
+                        progress.numInputRows(), duration);
+            } catch (IOException e) {
+                LOG.error("Unable to write " + file, e);
+            }
+        }
+    }
+
+    @Override
+    public void onQueryTerminated(QueryTerminatedEvent event) {
+    }
+}